@@ -5,6 +5,7 @@ import pendulum
 from django.conf import settings
 from django.contrib.auth import get_user_model
 from django.contrib.auth.base_user import AbstractBaseUser
+from django.core.cache import cache
 from django.db.backends.base.base import BaseDatabaseWrapper
 from django.http import HttpResponse
 from django.test import TestCase, override_settings
@@ -44,6 +45,8 @@ class BaseTestCase(TestCase):
         return datetime.strftime(self.get_current_time(), "%Y-%m-%d %H:%M:%S")
 
     def setUp(self) -> None:
+        # cached catalog and stats outlive the rolled back test transaction
+        cache.clear()
         self.employee = EmployeeFactory.create()
         self.organization = self.employee.emp_profile.organization
         self.department = self.employee.emp_profile.department
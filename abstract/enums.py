@@ -1,3 +1,10 @@
 from django.db import models
 
 # class FileSourceTypes(models.TextChoices):
+
+
+class OutboundEmailStatus(models.TextChoices):
+    PENDING = "pending", "Pending"
+    SENDING = "sending", "Sending"
+    SENT = "sent", "Sent"
+    FAILED = "failed", "Failed"
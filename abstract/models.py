@@ -2,7 +2,9 @@ import uuid
 from datetime import timezone
 
 from django.db import models
+from django.utils import timezone as django_timezone
 
+from abstract.enums import OutboundEmailStatus
 from abstract.utils import S3Client
 
 
@@ -57,3 +59,28 @@ class BaseFile(BaseModel):
     #         s3 = S3Client()
     #         self.path = s3.get_presigned_url(self.id)
     #     return super().save(*args, **kwargs)
+
+
+class OutboundEmail(BaseModel):
+    """Transactional email waiting in the outbox to be delivered"""
+
+    subject = models.CharField(max_length=255)
+    body = models.TextField()
+    to = models.JSONField(default=list)
+    headers = models.JSONField(default=dict, blank=True)
+    status = models.CharField(
+        max_length=10,
+        choices=OutboundEmailStatus.choices,
+        default=OutboundEmailStatus.PENDING,
+    )
+    attempts = models.PositiveSmallIntegerField(default=0)
+    last_error = models.TextField(blank=True, default="")
+    next_attempt_at = models.DateTimeField(default=django_timezone.now)
+    sent_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ["next_attempt_at"]
+        indexes = [models.Index(fields=["status", "next_attempt_at"])]
+
+    def __str__(self):
+        return f"{self.subject} -> {', '.join(self.to)} ({self.status})"
@@ -1,19 +1,43 @@
+import uuid
 from email.mime.image import MIMEImage
 
 from celery import shared_task
-from django.core.mail import EmailMessage, EmailMultiAlternatives
 
 
 @shared_task(name="Task to send Emails")
 def send_email(email_subject, email_body, to_email, headers=None):
-    msg = EmailMessage(
-        subject=email_subject,
-        body=email_body,
-        to=to_email if isinstance(to_email, list) else [to_email],
-        headers=headers,
-    )
-    msg.content_subtype = "html"
-    msg.send()
+    """Queue the email in the outbox, a separate drain task delivers it"""
+    from abstract.toolboxes.mailer import EmailOutboxToolbox
+
+    EmailOutboxToolbox.enqueue(email_subject, email_body, to_email, headers)
+    EmailOutboxToolbox.schedule_drain()
+
+
+@shared_task(name="Drain email outbox")
+def drain_email_outbox():
+    """Send pending emails and retry failed ones whose backoff has elapsed"""
+    from django.core.cache import cache
+
+    from abstract.toolboxes.mailer import EmailOutboxToolbox
+
+    # emails enqueued from now on need another drain
+    cache.delete(EmailOutboxToolbox.drain_scheduled_key)
+    return EmailOutboxToolbox.drain()
+
+
+@shared_task(name="Expire user tokens")
+def expire_user_tokens(tokens: dict):
+    """Rotate the tokens of {user_id: token} that have not been replaced since"""
+    from users.models import User
+
+    users = [
+        user
+        for user in User.objects.filter(id__in=list(tokens)).only("id", "token")
+        if user.token == tokens[str(user.id)]
+    ]
+    for user in users:
+        user.token = uuid.uuid4().hex
+    User.objects.bulk_update(users, ["token"])
 
 
 @shared_task(name="Background update model field")
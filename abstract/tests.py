@@ -1,3 +1,148 @@
-from django.test import TestCase
+from datetime import timedelta
+from unittest.mock import patch
 
-# Create your tests here.
+from django.core import mail
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from abstract.enums import OutboundEmailStatus
+from abstract.models import OutboundEmail
+from abstract.tasks import drain_email_outbox, expire_user_tokens, send_email
+from abstract.toolboxes import EmployeeInviteToolbox
+from abstract.toolboxes.mailer import EmailConnectionPool, EmailOutboxToolbox
+from users.factory import EmployeeFactory
+from users.models import Employee
+
+
+@override_settings(EMAIL_OUTBOX_BACKEND="django.core.mail.backends.locmem.EmailBackend")
+class EmailOutboxTestCase(TestCase):
+    def tearDown(self) -> None:
+        EmailConnectionPool.discard()
+
+    def setUp(self) -> None:
+        cache.clear()
+
+    def test_send_email_is_delivered_through_outbox(self):
+        with patch.object(drain_email_outbox, "delay") as delay:
+            send_email("Subject", "<p>Body</p>", "employee@test.com")
+            send_email("Subject", "<p>Body</p>", "other@test.com")
+
+        # one drain for both emails, nothing is sent by the enqueueing task
+        delay.assert_called_once()
+        self.assertEqual(len(mail.outbox), 0)
+        drain_email_outbox()
+
+        email = OutboundEmail.objects.get(to=["employee@test.com"])
+        self.assertEqual(email.status, OutboundEmailStatus.SENT)
+        self.assertEqual(email.attempts, 1)
+        self.assertEqual(
+            sorted(message.to[0] for message in mail.outbox),
+            ["employee@test.com", "other@test.com"],
+        )
+        self.assertEqual(mail.outbox[0].content_subtype, "html")
+
+    def test_drain_sends_in_batches_over_one_connection(self):
+        for i in range(5):
+            EmailOutboxToolbox.enqueue("Subject", "Body", f"employee{i}@test.com")
+
+        with patch(
+            "abstract.toolboxes.mailer.get_connection", wraps=mail.get_connection
+        ) as get_connection:
+            processed = EmailOutboxToolbox.drain(batch_size=2)
+
+        self.assertEqual(processed, 5)
+        self.assertEqual(get_connection.call_count, 1)
+        self.assertEqual(len(mail.outbox), 5)
+        self.assertFalse(
+            OutboundEmail.objects.exclude(status=OutboundEmailStatus.SENT).exists()
+        )
+
+    @override_settings(EMAIL_OUTBOX_MAX_ATTEMPTS=2)
+    def test_failed_email_is_retried_with_backoff_then_marked_failed(self):
+        email = EmailOutboxToolbox.enqueue("Subject", "Body", "employee@test.com")
+
+        with patch(
+            "django.core.mail.backends.locmem.EmailBackend.send_messages",
+            side_effect=ConnectionError("connection reset"),
+        ):
+            EmailOutboxToolbox.drain()
+            email.refresh_from_db()
+            self.assertEqual(email.status, OutboundEmailStatus.PENDING)
+            self.assertGreater(email.next_attempt_at, timezone.now())
+            self.assertIn("connection reset", email.last_error)
+
+            # backoff not elapsed yet
+            self.assertEqual(EmailOutboxToolbox.drain(), 0)
+
+            OutboundEmail.objects.update(
+                next_attempt_at=timezone.now() - timedelta(seconds=1)
+            )
+            EmailOutboxToolbox.drain()
+
+        email.refresh_from_db()
+        self.assertEqual(email.status, OutboundEmailStatus.FAILED)
+        self.assertEqual(email.attempts, 2)
+        self.assertEqual(len(mail.outbox), 0)
+
+    @override_settings(EMAIL_OUTBOX_MAX_ATTEMPTS=2)
+    def test_expired_lease_of_the_last_attempt_fails_the_email(self):
+        email = EmailOutboxToolbox.enqueue("Subject", "Body", "employee@test.com")
+        expired = timezone.now() - timedelta(seconds=1)
+        OutboundEmail.objects.update(
+            status=OutboundEmailStatus.SENDING, attempts=2, next_attempt_at=expired
+        )
+
+        self.assertEqual(EmailOutboxToolbox.drain(), 0)
+
+        email.refresh_from_db()
+        self.assertEqual(email.status, OutboundEmailStatus.FAILED)
+        self.assertEqual(email.attempts, 2)
+
+
+class EmployeeInviteToolboxTestCase(TestCase):
+    def setUp(self) -> None:
+        cache.clear()
+
+    def test_invites_are_queued_with_one_token_update(self):
+        employees = [EmployeeFactory.create() for _ in range(3)]
+        employees = list(
+            Employee.objects.filter(
+                id__in=[employee.id for employee in employees]
+            ).select_related("emp_profile__organization__org_profile")
+        )
+
+        with patch.object(
+            expire_user_tokens, "apply_async"
+        ) as apply_async, patch.object(
+            drain_email_outbox, "delay"
+        ) as drain, patch.object(
+            EmployeeInviteToolbox, "chunk_size", 2
+        ):
+            invited = EmployeeInviteToolbox(employees).send()
+
+        self.assertEqual(invited, 3)
+        # one drain for all the chunks
+        drain.assert_called_once()
+        tokens = apply_async.call_args.kwargs["args"][0]
+        self.assertEqual(len(set(tokens.values())), 3)
+        for employee in Employee.objects.filter(id__in=tokens):
+            self.assertEqual(employee.token, tokens[str(employee.id)])
+            self.assertIsNone(employee.token_expiration_task_id)
+            self.assertIn(
+                f"employee-invite/{employee.token}",
+                OutboundEmail.objects.get(to=[employee.email]).body,
+            )
+
+    def test_expire_user_tokens_skips_replaced_tokens(self):
+        expired, replaced = EmployeeFactory.create(), EmployeeFactory.create()
+        expired.token, replaced.token = "issued", "replaced"
+        expired.save()
+        replaced.save()
+
+        expire_user_tokens({str(expired.id): "issued", str(replaced.id): "issued"})
+
+        expired.refresh_from_db()
+        replaced.refresh_from_db()
+        self.assertNotEqual(expired.token, "issued")
+        self.assertEqual(replaced.token, "replaced")
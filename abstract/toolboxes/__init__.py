@@ -1,4 +1,10 @@
-from .email import UserEmailToolbox
+from .email import EmployeeInviteToolbox, UserEmailToolbox
+from .mailer import EmailOutboxToolbox
 from .pendulum import PendulumToolbox
 
-__all__ = ["UserEmailToolbox", "PendulumToolbox"]
+__all__ = [
+    "EmployeeInviteToolbox",
+    "UserEmailToolbox",
+    "EmailOutboxToolbox",
+    "PendulumToolbox",
+]
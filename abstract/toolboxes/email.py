@@ -1,11 +1,12 @@
+import uuid
 from abc import ABC, abstractmethod
 from functools import cached_property
 
 from django.conf import settings
 from django.core.mail import EmailMessage
-from django.template.loader import render_to_string
+from django.template.loader import get_template, render_to_string
 
-from ..tasks import send_email
+from ..tasks import expire_user_tokens, send_email
 
 
 class Email(ABC):
@@ -184,3 +185,67 @@ class UserEmailToolbox:
             email_body=email_instance.html_body,
             to_email=email_instance.to_email,
         )
+
+
+class EmployeeInviteToolbox:
+    """Invite many employees at once: one token update, one compiled template
+    and the emails queued in the outbox in chunks.
+    """
+
+    chunk_size = 500
+
+    def __init__(self, employees: list):
+        self.employees = employees
+
+    def set_tokens(self) -> dict:
+        from users.models import User
+
+        for employee in self.employees:
+            employee.token = uuid.uuid4().hex
+            # expired by the batch task below, there is no task of its own to revoke
+            employee.token_expiration_task_id = None
+        User.objects.bulk_update(
+            self.employees, ["token", "token_expiration_task_id"], batch_size=1000
+        )
+        tokens = {str(employee.id): employee.token for employee in self.employees}
+        expire_user_tokens.apply_async(
+            args=[tokens], countdown=settings.USER_TOKEN_EXPIRY
+        )
+        return tokens
+
+    def emails(self):
+        template = get_template("emails/users/employee_invite.html")
+        organization_names = {}
+        for employee in self.employees:
+            profile = employee.emp_profile
+            if profile.organization_id not in organization_names:
+                organization_names[profile.organization_id] = (
+                    profile.organization.org_profile.name.title()
+                )
+            context = {
+                "name": (profile.first_name or "").title(),
+                "organization": organization_names[profile.organization_id],
+                "invite_link": f"{settings.FRONTEND_URL}employee-invite/{employee.token}",
+            }
+            yield {
+                "email_subject": "You have been invited to join Castellum",
+                "email_body": template.render(context),
+                "to_email": [employee.email],
+            }
+
+    def send(self) -> int:
+        from .mailer import EmailOutboxToolbox
+
+        if not self.employees:
+            return 0
+        self.set_tokens()
+        emails = []
+        for email in self.emails():
+            emails.append(email)
+            if len(emails) == self.chunk_size:
+                EmailOutboxToolbox.enqueue_many(emails)
+                emails = []
+        if emails:
+            EmailOutboxToolbox.enqueue_many(emails)
+        EmailOutboxToolbox.schedule_drain()
+        return len(self.employees)
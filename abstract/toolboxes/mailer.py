@@ -0,0 +1,196 @@
+import smtplib
+import time
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.mail import EmailMessage, get_connection
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+
+from abstract.enums import OutboundEmailStatus
+from abstract.models import OutboundEmail
+
+
+class EmailConnectionPool:
+    """Keep one open mail connection per worker process and reuse it across batches"""
+
+    _connection = None
+    _opened_at = None
+    _messages_sent = 0
+
+    @classmethod
+    def _is_stale(cls) -> bool:
+        return (
+            time.monotonic() - cls._opened_at > settings.EMAIL_OUTBOX_CONNECTION_MAX_AGE
+            or cls._messages_sent >= settings.EMAIL_OUTBOX_CONNECTION_MAX_MESSAGES
+        )
+
+    @classmethod
+    def get(cls):
+        if cls._connection is not None and cls._is_stale():
+            cls.discard()
+        if cls._connection is None:
+            connection = get_connection(
+                backend=settings.EMAIL_OUTBOX_BACKEND, fail_silently=False
+            )
+            connection.open()
+            cls._connection = connection
+            cls._opened_at = time.monotonic()
+            cls._messages_sent = 0
+        return cls._connection
+
+    @classmethod
+    def mark_sent(cls):
+        cls._messages_sent += 1
+
+    @classmethod
+    def discard(cls):
+        if cls._connection is not None:
+            try:
+                cls._connection.close()
+            except Exception:
+                pass
+        cls._connection = None
+        cls._opened_at = None
+        cls._messages_sent = 0
+
+
+class EmailOutboxToolbox:
+    """Queue transactional emails and deliver them in batches over a pooled connection"""
+
+    drain_scheduled_key = "email-outbox:drain-scheduled"
+
+    @classmethod
+    def schedule_drain(cls):
+        """Queue a single drain for every email enqueued until it starts"""
+        from abstract.tasks import drain_email_outbox
+
+        if cache.add(cls.drain_scheduled_key, 1, settings.EMAIL_OUTBOX_LEASE_SECONDS):
+            drain_email_outbox.delay()
+
+    @staticmethod
+    def enqueue(email_subject, email_body, to_email, headers=None) -> OutboundEmail:
+        return OutboundEmail.objects.create(
+            subject=email_subject,
+            body=email_body,
+            to=to_email if isinstance(to_email, list) else [to_email],
+            headers=headers or {},
+        )
+
+    @staticmethod
+    def enqueue_many(emails: list[dict]) -> list[OutboundEmail]:
+        """Queue many emails with one insert, each item takes the arguments of enqueue"""
+        return OutboundEmail.objects.bulk_create(
+            [
+                OutboundEmail(
+                    subject=email["email_subject"],
+                    body=email["email_body"],
+                    to=(
+                        email["to_email"]
+                        if isinstance(email["to_email"], list)
+                        else [email["to_email"]]
+                    ),
+                    headers=email.get("headers") or {},
+                )
+                for email in emails
+            ]
+        )
+
+    @staticmethod
+    def claim_batch(batch_size: int) -> list[OutboundEmail]:
+        """Lock a batch of due emails so concurrent workers never send the same row.
+        Claimed rows are leased, a crashed worker's rows become due again once the lease expires.
+        """
+        now = timezone.now()
+        with transaction.atomic():
+            # the worker died while sending their last attempt, stop retrying them
+            OutboundEmail.objects.filter(
+                status=OutboundEmailStatus.SENDING,
+                next_attempt_at__lte=now,
+                attempts__gte=settings.EMAIL_OUTBOX_MAX_ATTEMPTS,
+            ).update(
+                status=OutboundEmailStatus.FAILED,
+                last_error="The lease of the last attempt expired",
+            )
+            ids = list(
+                OutboundEmail.objects.select_for_update(skip_locked=True)
+                .filter(
+                    status__in=[
+                        OutboundEmailStatus.PENDING,
+                        OutboundEmailStatus.SENDING,
+                    ],
+                    next_attempt_at__lte=now,
+                )
+                .order_by("next_attempt_at")
+                .values_list("id", flat=True)[:batch_size]
+            )
+            OutboundEmail.objects.filter(id__in=ids).update(
+                status=OutboundEmailStatus.SENDING,
+                attempts=F("attempts") + 1,
+                next_attempt_at=now
+                + timedelta(seconds=settings.EMAIL_OUTBOX_LEASE_SECONDS),
+            )
+        return list(OutboundEmail.objects.filter(id__in=ids))
+
+    @staticmethod
+    def build_message(email: OutboundEmail, connection) -> EmailMessage:
+        msg = EmailMessage(
+            subject=email.subject,
+            body=email.body,
+            to=email.to,
+            headers=email.headers or None,
+            connection=connection,
+        )
+        msg.content_subtype = "html"
+        return msg
+
+    @staticmethod
+    def mark_failed(email: OutboundEmail, error: Exception):
+        email.last_error = repr(error)
+        if email.attempts >= settings.EMAIL_OUTBOX_MAX_ATTEMPTS:
+            email.status = OutboundEmailStatus.FAILED
+            return
+        email.status = OutboundEmailStatus.PENDING
+        email.next_attempt_at = timezone.now() + timedelta(
+            seconds=settings.EMAIL_OUTBOX_RETRY_BACKOFF * 2 ** (email.attempts - 1)
+        )
+
+    @classmethod
+    def send_batch(cls, emails: list[OutboundEmail]):
+        for email in emails:
+            try:
+                cls.build_message(email, EmailConnectionPool.get()).send()
+            except (
+                smtplib.SMTPServerDisconnected,
+                ConnectionError,
+                TimeoutError,
+            ) as error:
+                # the pooled connection is unusable, reconnect for the next message
+                EmailConnectionPool.discard()
+                cls.mark_failed(email, error)
+            except Exception as error:
+                cls.mark_failed(email, error)
+            else:
+                EmailConnectionPool.mark_sent()
+                email.status = OutboundEmailStatus.SENT
+                email.sent_at = timezone.now()
+                email.last_error = ""
+        OutboundEmail.objects.bulk_update(
+            emails, ["status", "sent_at", "last_error", "next_attempt_at"]
+        )
+
+    @classmethod
+    def drain(cls, batch_size: int = None, max_batches: int = None) -> int:
+        """Send due emails batch by batch, returns the number of emails processed"""
+        batch_size = batch_size or settings.EMAIL_OUTBOX_BATCH_SIZE
+        max_batches = max_batches or settings.EMAIL_OUTBOX_MAX_BATCHES_PER_RUN
+        processed = 0
+        for _ in range(max_batches):
+            emails = cls.claim_batch(batch_size)
+            if not emails:
+                break
+            cls.send_batch(emails)
+            processed += len(emails)
+        return processed
@@ -0,0 +1,19 @@
+# Generated by Django 4.1.7 on 2026-10-19 13:28
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("campaign", "0004_remove_campaign_departments"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="campaign",
+            index=models.Index(
+                fields=["status", "end_date"], name="campaign_ca_status_2dabab_idx"
+            ),
+        ),
+    ]
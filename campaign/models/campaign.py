@@ -36,6 +36,9 @@ class Campaign(BaseModel):
 
     background_task_ids = models.JSONField(default=list, null=True, blank=True)
 
+    class Meta(BaseModel.Meta):
+        indexes = [models.Index(fields=["status", "end_date"])]
+
     def __str__(self):
         return f"{self.name}"
 
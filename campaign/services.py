@@ -0,0 +1,289 @@
+from datetime import date, datetime, time, timedelta
+from zoneinfo import ZoneInfo
+
+from django.db import transaction
+from django.db.models import Count, Q
+from django.db.models.functions import TruncDay, TruncMonth, TruncWeek
+from django.utils import timezone
+
+from .enums import CampaignStatus, CampaignTypes
+from .models import Campaign
+
+
+class CampaignLifecycleManager:
+    """Move every due campaign through its lifecycle with set based updates"""
+
+    chunk_size = 500
+
+    def __init__(self, now=None, *args, **kwargs):
+        self.now = now or timezone.now()
+
+    @staticmethod
+    def invalidate_dashboards(organization_ids):
+        # update() sends no post_save, bump the changed organizations' dashboards
+        from users.services import OrganizationDashboard
+
+        for organization_id in set(organization_ids):
+            OrganizationDashboard.bump(organization_id)
+
+    def start_due_campaigns(self) -> list:
+        with transaction.atomic():
+            due_campaigns = list(
+                Campaign.objects.select_for_update(skip_locked=True)
+                .filter(status=CampaignStatus.SCHEDULED, start_date__lte=self.now)
+                .values_list("id", "organization_id")
+            )
+            campaign_ids = [campaign_id for campaign_id, _ in due_campaigns]
+            Campaign.objects.filter(
+                id__in=campaign_ids, status=CampaignStatus.SCHEDULED
+            ).update(status=CampaignStatus.ACTIVE)
+        self.invalidate_dashboards(
+            organization_id for _, organization_id in due_campaigns
+        )
+        return campaign_ids
+
+    def complete_due_campaigns(self) -> int:
+        campaigns = Campaign.objects.filter(
+            status=CampaignStatus.ACTIVE, end_date__lte=self.now
+        )
+        organization_ids = list(campaigns.values_list("organization_id", flat=True))
+        completed = campaigns.update(status=CampaignStatus.COMPLETED)
+        self.invalidate_dashboards(organization_ids)
+        return completed
+
+    def expire_due_learners(self) -> int:
+        from courses.models import EmployeeCourseCampaign
+
+        return EmployeeCourseCampaign.objects.filter(
+            is_completed=False,
+            is_expired=False,
+            course_campaign__campaign__end_date__lte=self.now,
+        ).update(is_expired=True)
+
+    def notify_campaigns_started(self, campaign_ids: list):
+        """Queue the campaign started emails of every started course campaign at once"""
+        from abstract.toolboxes import EmailOutboxToolbox
+        from courses.models import EmployeeCourseCampaign
+
+        employee_records = EmployeeCourseCampaign.objects.filter(
+            course_campaign__campaign__id__in=campaign_ids,
+            course_campaign__campaign__end_date__gt=self.now,
+        ).select_related("employee__emp_profile", "course_campaign__campaign")
+        notified, emails = 0, []
+        for employee_record in employee_records.iterator(chunk_size=self.chunk_size):
+            emails.append(employee_record.campaign_started_email())
+            if len(emails) == self.chunk_size:
+                EmailOutboxToolbox.enqueue_many(emails)
+                notified, emails = notified + len(emails), []
+        if emails:
+            EmailOutboxToolbox.enqueue_many(emails)
+            notified += len(emails)
+        if notified:
+            EmailOutboxToolbox.schedule_drain()
+        return notified
+
+    def handle(self) -> dict:
+        started_campaign_ids = self.start_due_campaigns()
+        notified = (
+            self.notify_campaigns_started(started_campaign_ids)
+            if started_campaign_ids
+            else 0
+        )
+        return {
+            "started": len(started_campaign_ids),
+            "notified": notified,
+            "completed": self.complete_due_campaigns(),
+            "expired": self.expire_due_learners(),
+        }
+
+
+class CampaignAutoEnrollmentManager:
+    """Enroll new employees in every course campaign of their organization that
+    automatically enrolls employees, one insert per campaign for the whole batch.
+    """
+
+    chunk_size = 500
+
+    def __init__(self, organization_id, employee_ids: list, *args, **kwargs):
+        self.organization_id = organization_id
+        self.employee_ids = set(str(employee_id) for employee_id in employee_ids)
+
+    @classmethod
+    def campaigns(cls, organization_id):
+        from courses.models import CourseCampaign
+
+        return (
+            CourseCampaign.objects.filter(
+                campaign__organization_id=organization_id,
+                campaign__automatically_enroll_employees=True,
+            )
+            .exclude(
+                campaign__type=CampaignTypes.PHISHING,
+                campaign__status__in=[CampaignStatus.ACTIVE, CampaignStatus.SCHEDULED],
+            )
+            .select_related("campaign")
+        )
+
+    @classmethod
+    def schedule(cls, organization_id, employee_ids: list):
+        """Enroll the employees in the background once the current transaction commits"""
+        from .tasks import auto_enroll_employees_task
+
+        if not employee_ids or not cls.campaigns(organization_id).exists():
+            return
+        transaction.on_commit(
+            lambda: auto_enroll_employees_task.delay(
+                str(organization_id), [str(employee_id) for employee_id in employee_ids]
+            )
+        )
+
+    def enroll(self) -> list:
+        """Insert the missing enrollments, returns the ids of the new ones"""
+        from courses.models import EmployeeCourseCampaign
+        from courses.services import CourseCampaignProgress
+
+        enrolled_ids = []
+        for course_campaign in self.campaigns(self.organization_id):
+            already_enrolled = set(
+                str(employee_id)
+                for employee_id in course_campaign.employee_records.filter(
+                    employee_id__in=self.employee_ids
+                ).values_list("employee_id", flat=True)
+            )
+            employee_records = EmployeeCourseCampaign.objects.bulk_create(
+                [
+                    EmployeeCourseCampaign(
+                        employee_id=employee_id, course_campaign=course_campaign
+                    )
+                    for employee_id in self.employee_ids - already_enrolled
+                ],
+                ignore_conflicts=True,
+            )
+            enrolled_ids += [employee_record.id for employee_record in employee_records]
+            if employee_records:
+                # new learners start at 0 and lower the training completion rate
+                CourseCampaignProgress.schedule(
+                    course_campaign.id,
+                    [
+                        employee_record.employee_id
+                        for employee_record in employee_records
+                    ],
+                )
+        return enrolled_ids
+
+    def notify(self, enrolled_ids: list) -> int:
+        """Queue the enrolled and started emails of the new enrollments at once"""
+        from abstract.toolboxes import EmailOutboxToolbox
+        from courses.models import EmployeeCourseCampaign
+
+        employee_records = EmployeeCourseCampaign.objects.filter(
+            id__in=enrolled_ids
+        ).select_related("employee__emp_profile", "course_campaign__campaign")
+        notified, emails = 0, []
+        for employee_record in employee_records.iterator(chunk_size=self.chunk_size):
+            emails += [
+                employee_record.campaign_enrolled_email(),
+                employee_record.campaign_started_email(),
+            ]
+            if len(emails) >= self.chunk_size:
+                EmailOutboxToolbox.enqueue_many(emails)
+                notified, emails = notified + len(emails), []
+        if emails:
+            EmailOutboxToolbox.enqueue_many(emails)
+            notified += len(emails)
+        if notified:
+            EmailOutboxToolbox.schedule_drain()
+        return notified
+
+    def handle(self) -> dict:
+        enrolled_ids = self.enroll()
+        return {
+            "enrolled": len(enrolled_ids),
+            "notified": self.notify(enrolled_ids) if enrolled_ids else 0,
+        }
+
+
+class CampaignActivityChart:
+    """Learning and phishing campaigns started per day, week or month of a date range,
+    counted in one query. The range is widened to whole buckets, which follow the
+    organization's timezone, and empty buckets are filled with zeros.
+    """
+
+    truncs = {"day": TruncDay, "week": TruncWeek, "month": TruncMonth}
+
+    def __init__(
+        self,
+        organization,
+        start: date,
+        end: date,
+        resolution: str = "day",
+        tz: str = None,
+        *args,
+        **kwargs,
+    ):
+        self.organization = organization
+        self.resolution = resolution
+        self.tz = ZoneInfo(tz or organization.org_profile.timezone)
+        self.start = self.bucket_start(start)
+        self.end = end
+
+    def bucket_start(self, day: date) -> date:
+        match self.resolution:
+            case "week":
+                return day - timedelta(days=day.weekday())
+            case "month":
+                return day.replace(day=1)
+        return day
+
+    def next_bucket(self, bucket: date) -> date:
+        match self.resolution:
+            case "week":
+                return bucket + timedelta(weeks=1)
+            case "month":
+                return (bucket + timedelta(days=32)).replace(day=1)
+        return bucket + timedelta(days=1)
+
+    def bucket_dates(self) -> list[date]:
+        buckets, bucket = [], self.start
+        while bucket <= self.end:
+            buckets.append(bucket)
+            bucket = self.next_bucket(bucket)
+        return buckets
+
+    def counts(self) -> dict:
+        phishing = Q(type=CampaignTypes.PHISHING)
+        campaigns = (
+            Campaign.objects.filter(
+                organization_id=self.organization.id,
+                start_date__gte=datetime.combine(self.start, time.min, self.tz),
+                start_date__lt=datetime.combine(
+                    self.next_bucket(self.bucket_start(self.end)), time.min, self.tz
+                ),
+            )
+            .annotate(bucket=self.truncs[self.resolution]("start_date", tzinfo=self.tz))
+            .order_by()
+            .values("bucket")
+            .annotate(
+                learning_campaigns=Count("id", filter=~phishing),
+                phishing_campaigns=Count("id", filter=phishing),
+            )
+        )
+        return {
+            row["bucket"].date(): {
+                "learning_campaigns": row["learning_campaigns"],
+                "phishing_campaigns": row["phishing_campaigns"],
+            }
+            for row in campaigns
+        }
+
+    def buckets(self) -> list[dict]:
+        counts = self.counts()
+        return [
+            {
+                "date": bucket,
+                **counts.get(
+                    bucket, {"learning_campaigns": 0, "phishing_campaigns": 0}
+                ),
+            }
+            for bucket in self.bucket_dates()
+        ]
@@ -24,3 +24,17 @@ def start_campaign(campaign_id: str):
     elif campaign.is_course_campaign:
         course_campaign = campaign.course_campaign
         course_campaign.start()
+
+
+@shared_task(name="Sweep campaigns lifecycle")
+def sweep_campaigns_lifecycle_task():
+    from .services import CampaignLifecycleManager
+
+    return CampaignLifecycleManager().handle()
+
+
+@shared_task(name="Automatically enroll employees in campaigns")
+def auto_enroll_employees_task(organization_id: str, employee_ids: list[str]):
+    from .services import CampaignAutoEnrollmentManager
+
+    return CampaignAutoEnrollmentManager(organization_id, employee_ids).handle()
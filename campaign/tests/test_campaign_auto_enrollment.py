@@ -0,0 +1,103 @@
+from datetime import timedelta
+from unittest.mock import patch
+
+from django.core import mail
+from django.test import override_settings
+from django.utils import timezone
+
+from abstract.base_test import BaseTestCase
+from abstract.tasks import drain_email_outbox
+from abstract.toolboxes.mailer import EmailConnectionPool
+from campaign.enums import CampaignStatus, CampaignTypes
+from campaign.models import Campaign
+from campaign.services import CampaignAutoEnrollmentManager
+from campaign.tasks import auto_enroll_employees_task
+from courses.models import CourseCampaign, EmployeeCourseCampaign
+from users.models import Employee
+from users.services import UserImport
+
+
+@override_settings(EMAIL_OUTBOX_BACKEND="django.core.mail.backends.locmem.EmailBackend")
+class TestCampaignAutoEnrollment(BaseTestCase):
+    def create_course_campaign(self, automatically_enroll_employees) -> CourseCampaign:
+        now = timezone.now()
+        campaign = Campaign.objects.create(
+            organization=self.organization,
+            name="Onboarding",
+            type=CampaignTypes.GENERAL,
+            status=CampaignStatus.ACTIVE,
+            start_date=now,
+            end_date=now + timedelta(days=7),
+            automatically_enroll_employees=automatically_enroll_employees,
+        )
+        return CourseCampaign.objects.create(campaign=campaign)
+
+    def import_employees(self, count) -> list:
+        records = [
+            {
+                "email": f"imported{index}@example.com",
+                "first_name": "Imported",
+                "last_name": f"Employee {index}",
+                "department": "engineering",
+            }
+            for index in range(count)
+        ]
+        UserImport(records=records, organization=self.organization).create_records()
+        return list(
+            Employee.objects.filter(
+                email__in=[record["email"] for record in records]
+            ).values_list("id", flat=True)
+        )
+
+    def tearDown(self) -> None:
+        EmailConnectionPool.discard()
+
+    def test_import_schedules_one_enrollment(self):
+        self.create_course_campaign(automatically_enroll_employees=True)
+
+        with patch.object(
+            auto_enroll_employees_task, "delay"
+        ) as delay, self.captureOnCommitCallbacks(execute=True):
+            employee_ids = self.import_employees(3)
+
+        delay.assert_called_once()
+        organization_id, scheduled_ids = delay.call_args.args
+        self.assertEqual(organization_id, str(self.organization.id))
+        self.assertCountEqual(scheduled_ids, [str(id) for id in employee_ids])
+        self.assertFalse(EmployeeCourseCampaign.objects.exists())
+
+    def test_nothing_is_scheduled_without_auto_enrolling_campaigns(self):
+        self.create_course_campaign(automatically_enroll_employees=False)
+
+        with patch.object(
+            auto_enroll_employees_task, "delay"
+        ) as delay, self.captureOnCommitCallbacks(execute=True):
+            self.import_employees(2)
+
+        delay.assert_not_called()
+
+    def test_employees_are_enrolled_and_notified_once(self):
+        enrolling = self.create_course_campaign(automatically_enroll_employees=True)
+        self.create_course_campaign(automatically_enroll_employees=False)
+        employee_ids = [*self.import_employees(3), self.employee.id]
+        enrolling.employees.add(self.employee)
+
+        with patch.object(drain_email_outbox, "delay") as drain:
+            result = auto_enroll_employees_task(
+                str(self.organization.id), employee_ids
+            )
+
+        self.assertEqual(result, {"enrolled": 3, "notified": 6})
+        self.assertEqual(
+            EmployeeCourseCampaign.objects.filter(course_campaign=enrolling).count(), 4
+        )
+        self.assertEqual(EmployeeCourseCampaign.objects.count(), 4)
+        drain.assert_called_once()
+        self.assertEqual(len(mail.outbox), 0)
+        drain_email_outbox()
+        self.assertEqual(len(mail.outbox), 6)
+
+        result = CampaignAutoEnrollmentManager(
+            self.organization.id, employee_ids
+        ).handle()
+        self.assertEqual(result, {"enrolled": 0, "notified": 0})
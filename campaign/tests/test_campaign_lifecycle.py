@@ -0,0 +1,128 @@
+from datetime import timedelta
+from unittest.mock import patch
+
+from django.core import mail
+from django.test import override_settings
+from django.utils import timezone
+
+from abstract.base_test import BaseTestCase
+from abstract.tasks import drain_email_outbox, send_email
+from abstract.toolboxes.mailer import EmailConnectionPool
+from campaign.enums import CampaignStatus, CampaignTypes
+from campaign.models import Campaign
+from campaign.tasks import sweep_campaigns_lifecycle_task
+from courses.models import CourseCampaign, EmployeeCourseCampaign
+
+
+@override_settings(EMAIL_OUTBOX_BACKEND="django.core.mail.backends.locmem.EmailBackend")
+class TestCampaignLifecycle(BaseTestCase):
+    def create_course_campaign(self, status, start_date, end_date) -> Campaign:
+        campaign = Campaign.objects.create(
+            organization=self.organization,
+            name="Lifecycle campaign",
+            type=CampaignTypes.GENERAL,
+            status=status,
+            start_date=start_date,
+            end_date=end_date,
+        )
+        course_campaign = CourseCampaign.objects.create(campaign=campaign)
+        course_campaign.employees.add(self.employee)
+        return campaign
+
+    def tearDown(self) -> None:
+        EmailConnectionPool.discard()
+
+    def test_scheduled_campaign_is_started_and_employees_notified(self):
+        now = timezone.now()
+        due = self.create_course_campaign(
+            CampaignStatus.SCHEDULED,
+            now - timedelta(minutes=1),
+            now + timedelta(days=3),
+        )
+        not_due = self.create_course_campaign(
+            CampaignStatus.SCHEDULED, now + timedelta(days=1), now + timedelta(days=3)
+        )
+
+        with patch.object(drain_email_outbox, "delay") as drain:
+            result = sweep_campaigns_lifecycle_task()
+
+        due.refresh_from_db()
+        not_due.refresh_from_db()
+        self.assertEqual(result["started"], 1)
+        self.assertEqual(due.status, CampaignStatus.ACTIVE)
+        self.assertEqual(not_due.status, CampaignStatus.SCHEDULED)
+        # the sweeper only queues the emails, the outbox worker sends them
+        drain.assert_called_once()
+        self.assertEqual(len(mail.outbox), 0)
+        drain_email_outbox()
+        self.assertEqual(len(mail.outbox), 1)
+        self.assertEqual(mail.outbox[0].to, [self.employee.email])
+
+    def test_campaign_started_by_the_sweeper_is_not_started_again(self):
+        now = timezone.now()
+        campaign = self.create_course_campaign(
+            CampaignStatus.SCHEDULED,
+            now - timedelta(minutes=1),
+            now + timedelta(days=3),
+        )
+        with patch.object(drain_email_outbox, "delay"):
+            sweep_campaigns_lifecycle_task()
+        drain_email_outbox()
+
+        with patch.object(send_email, "delay") as delay:
+            self.assertFalse(campaign.course_campaign.start())
+
+        delay.assert_not_called()
+        self.assertEqual(len(mail.outbox), 1)
+
+    def test_campaign_started_on_initiation_is_skipped_by_the_sweeper(self):
+        now = timezone.now()
+        campaign = self.create_course_campaign(
+            CampaignStatus.SCHEDULED,
+            now - timedelta(minutes=1),
+            now + timedelta(days=3),
+        )
+        with patch.object(send_email, "delay") as delay:
+            self.assertTrue(campaign.course_campaign.start())
+
+        result = sweep_campaigns_lifecycle_task()
+
+        campaign.refresh_from_db()
+        delay.assert_called_once()
+        self.assertEqual(campaign.status, CampaignStatus.ACTIVE)
+        self.assertEqual(result["started"], 0)
+        self.assertEqual(len(mail.outbox), 0)
+
+    def test_ended_campaign_is_completed_and_learners_expired(self):
+        now = timezone.now()
+        campaign = self.create_course_campaign(
+            CampaignStatus.ACTIVE, now - timedelta(days=3), now - timedelta(minutes=1)
+        )
+
+        result = sweep_campaigns_lifecycle_task()
+
+        campaign.refresh_from_db()
+        self.assertEqual(campaign.status, CampaignStatus.COMPLETED)
+        self.assertEqual(result["completed"], 1)
+        self.assertEqual(result["expired"], 1)
+        self.assertTrue(
+            EmployeeCourseCampaign.objects.get(
+                course_campaign__campaign=campaign
+            ).is_expired
+        )
+
+    def test_rescheduling_is_a_date_edit(self):
+        now = timezone.now()
+        campaign = self.create_course_campaign(
+            CampaignStatus.SCHEDULED, now + timedelta(days=1), now + timedelta(days=3)
+        )
+        sweep_campaigns_lifecycle_task()
+        campaign.refresh_from_db()
+        self.assertEqual(campaign.status, CampaignStatus.SCHEDULED)
+
+        campaign.start_date = now - timedelta(minutes=1)
+        campaign.save()
+        with patch.object(drain_email_outbox, "delay"):
+            sweep_campaigns_lifecycle_task()
+        campaign.refresh_from_db()
+        self.assertEqual(campaign.status, CampaignStatus.ACTIVE)
@@ -159,6 +159,7 @@ class AnswerQuestionManager(SimpleModelManager):
         question: Question = self.question
         answers: models.QuerySet[QuestionOption] = self.answers
         course: Course = self.course
+        is_correct, credit = question.grade(answers)
         answered_question, _ = AnsweredQuestion.objects.update_or_create(
             user=user,
             question=question,
@@ -167,6 +168,8 @@ class AnswerQuestionManager(SimpleModelManager):
             defaults={
                 "question_options_snapshot": ContentQuestionSerializer(question).data,
                 "answers_snapshot": QuestionOptionSerializer(answers, many=True).data,
+                "is_correct": is_correct,
+                "credit": credit,
             },
         )
         answered_question.answers.set(answers)
@@ -62,24 +62,14 @@ class Content(BaseFile):
         return super().delete(*args, **kwargs)
 
     def get_score(self, user):
-        answered_questions = user.answered_questions.filter(
-            question__in=self.questions.all()
-        )
-        score = 0
-        for answered_question in answered_questions:
-            if answered_question.is_correct:
-                score += 1
-        return score
+        return user.answered_questions.filter(
+            question__content=self, is_correct=True
+        ).count()
 
     def get_campaign_score(self, user):
-        answered_questions = user.answered_campaign_questions.filter(
-            question__in=self.questions.all()
-        )
-        score = 0
-        for answered_question in answered_questions:
-            if answered_question.is_correct:
-                score += 1
-        return score
+        return user.answered_campaign_questions.filter(
+            question__content=self, is_correct=True
+        ).count()
 
     @cached_property
     def has_questions(self):
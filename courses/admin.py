@@ -11,7 +11,9 @@ from .models import (
     Course,
     CourseCampaign,
     CourseCampaignCourse,
+    CourseCampaignReminder,
     CourseContent,
+    CourseStats,
     EmployeeCourseCampaign,
 )
 
@@ -24,6 +26,8 @@ admin.site.register(EmployeeCourseCampaign)
 admin.site.register(CompletedCourseCampaignContent)
 admin.site.register(AnsweredCourseCampaignQuestion)
 admin.site.register(CourseCampaignCourse)
+admin.site.register(CourseCampaignReminder)
+admin.site.register(CourseStats)
 
 
 @admin.register(CourseContent)
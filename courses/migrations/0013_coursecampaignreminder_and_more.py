@@ -0,0 +1,54 @@
+# Generated by Django 4.1.7 on 2026-10-19 13:28
+
+from django.db import migrations, models
+import django.db.models.deletion
+import uuid
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("courses", "0012_alter_course_thumbnail"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="CourseCampaignReminder",
+            fields=[
+                (
+                    "id",
+                    models.UUIDField(
+                        default=uuid.uuid4,
+                        editable=False,
+                        primary_key=True,
+                        serialize=False,
+                    ),
+                ),
+                ("created_at", models.DateTimeField(auto_now=True)),
+                ("updated_at", models.DateTimeField(auto_now_add=True)),
+                ("is_deleted", models.BooleanField(default=False)),
+                ("deleted_at", models.DateTimeField(blank=True, null=True)),
+                ("offset_seconds", models.PositiveIntegerField()),
+                ("sent_at", models.DateTimeField(blank=True, null=True)),
+                (
+                    "employee_course_campaign",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="reminders",
+                        to="courses.employeecoursecampaign",
+                    ),
+                ),
+            ],
+            options={
+                "ordering": ["created_at"],
+                "abstract": False,
+            },
+        ),
+        migrations.AddConstraint(
+            model_name="coursecampaignreminder",
+            constraint=models.UniqueConstraint(
+                fields=("employee_course_campaign", "offset_seconds"),
+                name="unique_course_campaign_reminder_window",
+            ),
+        ),
+    ]
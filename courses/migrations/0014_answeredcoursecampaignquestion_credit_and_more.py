@@ -0,0 +1,23 @@
+# Generated by Django 4.1.7 on 2026-10-19 13:35
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("courses", "0013_coursecampaignreminder_and_more"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="answeredcoursecampaignquestion",
+            name="credit",
+            field=models.FloatField(default=0),
+        ),
+        migrations.AddField(
+            model_name="answeredcoursecampaignquestion",
+            name="is_correct",
+            field=models.BooleanField(default=False),
+        ),
+    ]
@@ -0,0 +1,50 @@
+# Generated by Django 4.1.7 on 2026-10-19 13:43
+
+import datetime
+from django.db import migrations, models
+import django.db.models.deletion
+import uuid
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("courses", "0014_answeredcoursecampaignquestion_credit_and_more"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="CourseStats",
+            fields=[
+                (
+                    "id",
+                    models.UUIDField(
+                        default=uuid.uuid4,
+                        editable=False,
+                        primary_key=True,
+                        serialize=False,
+                    ),
+                ),
+                ("created_at", models.DateTimeField(auto_now=True)),
+                ("updated_at", models.DateTimeField(auto_now_add=True)),
+                ("is_deleted", models.BooleanField(default=False)),
+                ("deleted_at", models.DateTimeField(blank=True, null=True)),
+                ("material_count", models.PositiveIntegerField(default=0)),
+                ("quiz_count", models.PositiveIntegerField(default=0)),
+                ("questions_count", models.PositiveIntegerField(default=0)),
+                ("total_duration", models.DurationField(default=datetime.timedelta)),
+                (
+                    "course",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="stats",
+                        to="courses.course",
+                    ),
+                ),
+            ],
+            options={
+                "ordering": ["created_at"],
+                "abstract": False,
+            },
+        ),
+    ]
@@ -0,0 +1,36 @@
+# Generated by Django 4.1.7 on 2026-10-19 14:06
+
+from django.db import migrations, models
+
+
+def delete_duplicate_enrollments(apps, schema_editor):
+    EmployeeCourseCampaign = apps.get_model("courses", "EmployeeCourseCampaign")
+    seen = set()
+    duplicate_ids = []
+    for id, employee_id, course_campaign_id in (
+        EmployeeCourseCampaign.objects.order_by("created_at")
+        .values_list("id", "employee_id", "course_campaign_id")
+        .iterator()
+    ):
+        if (employee_id, course_campaign_id) in seen:
+            duplicate_ids.append(id)
+        seen.add((employee_id, course_campaign_id))
+    EmployeeCourseCampaign.objects.filter(id__in=duplicate_ids).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("courses", "0015_coursestats"),
+    ]
+
+    operations = [
+        migrations.RunPython(delete_duplicate_enrollments, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name="employeecoursecampaign",
+            constraint=models.UniqueConstraint(
+                fields=("employee", "course_campaign"),
+                name="unique_employee_course_campaign",
+            ),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 4.1.7 on 2026-10-19 14:50
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("courses", "0016_employee_course_campaign_unique"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="employeecoursecampaign",
+            name="progress",
+            field=models.PositiveSmallIntegerField(default=0),
+        ),
+    ]
@@ -4,5 +4,7 @@ from .course_campaign import (
     CompletedCourseCampaignContent,
     CourseCampaign,
     CourseCampaignCourse,
+    CourseCampaignReminder,
     EmployeeCourseCampaign,
 )
+from .course_stats import CourseStats
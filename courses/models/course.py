@@ -1,6 +1,3 @@
-from datetime import timedelta
-from functools import cached_property
-
 from django.db import models
 
 from abstract.models import BaseModel
@@ -44,58 +41,47 @@ class Course(BaseModel):
 
     # def save()
 
-    @cached_property
+    @property
+    def course_stats(self):
+        from .course_stats import CourseStats
+
+        try:
+            stats = self.stats
+        except CourseStats.DoesNotExist:
+            stats = None
+        if stats is None:
+            CourseStats.refresh([self.id])
+            self.stats = stats = CourseStats.objects.get(course=self)
+        return stats
+
+    @property
     def material_count(self):
-        return self.contents.count()
+        return self.course_stats.material_count
 
-    @cached_property
+    @property
     def quiz_count(self):
-        count = 0
-        contents = self.contents.prefetch_related("questions").all()
-        for content in contents:
-            if content.questions.exists():
-                count += 1
-        return count
-
-    @cached_property
+        return self.course_stats.quiz_count
+
+    @property
     def questions_count(self):
-        count = 0
-        contents = self.contents.prefetch_related("questions").all()
-        for content in contents:
-            count += content.questions.count()
-        return count
+        return self.course_stats.questions_count
 
-    @cached_property
+    @property
     def duration(self):
-        duration = sum(
-            [
-                duration
-                for duration in self.contents.all().values_list("duration", flat=True)
-                if duration
-            ],
-            timedelta(seconds=0),
+        return PendulumToolbox.convert_timedelta_to_duration(
+            self.course_stats.total_duration, in_words=True
         )
 
-        return PendulumToolbox.convert_timedelta_to_duration(duration, in_words=True)
-
-    @cached_property
+    @property
     def duration_in_timedelta(self):
-        duration = sum(
-            [
-                duration
-                for duration in self.contents.all().values_list("duration", flat=True)
-                if duration
-            ],
-            timedelta(seconds=0),
+        return PendulumToolbox.convert_timedelta_to_duration(
+            self.course_stats.total_duration
         )
 
-        return PendulumToolbox.convert_timedelta_to_duration(duration)
-
     def get_score(self, user):
-        score = 0
-        for content in self.contents.all():
-            score += content.get_score(user)
-        return score
+        return user.answered_questions.filter(
+            question__content__in=self.contents.all(), is_correct=True
+        ).count()
 
 
 class CourseContent(BaseModel):
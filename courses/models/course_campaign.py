@@ -1,10 +1,11 @@
+import random
 from datetime import timedelta
 from functools import cached_property
 
 import pendulum
 from django.conf import settings
 from django.db import models
-from django.db.models import Count
+from django.db.models import Count, Sum
 from django.template.loader import render_to_string
 from django.utils import timezone
 
@@ -13,11 +14,9 @@ from abstract.tasks import send_email
 from abstract.toolboxes import PendulumToolbox
 from campaign.enums import CampaignStatus
 from campaign.models import Campaign
-from campaign.tasks import start_campaign
 from Castellum.celery import app
 from users.models import Organization, OrganizationProfile
 
-from ..tasks import course_campaigns_reminder_email_task
 from . import Course
 
 
@@ -87,38 +86,48 @@ class CourseCampaign(BaseModel):
     #             email_body=email_body,
     #         )
 
-    # def notify_employee_campaign_reminder(self, employee):
-    #     """Notify employee that have not completed a camaign that the deadline is approaching"""
-
-    #     available_templates = [
-    #         "emails/campaign/reminder.html",
-    #         "emails/campaign/reminder1.html",
-    #         "emails/campaign/reminder2.html",
-    #     ]
-
-    #     email_template = random.choice(available_templates)
-    #     context = {
-    #         "campaign_name": self.campaign.name.title(),
-    #         "name": employee.first_name.title(),
-    #         "campaign_type": self.campaign.type.title(),
-    #         "start_date": self.campaign.start_date.strftime("%B %d, %Y, %-I:%M %p"),
-    #         "end_date": self.campaign.end_date.strftime("%B %d, %Y, %-I:%M %p"),
-    #         "last_name": employee.last_name,
-    #         "campaign_url": f"{settings.FRONTEND_URL}employee/dashboard/campaign/{self.campaign.id}",
-    #     }
-    #     email_body = render_to_string(email_template, context=context)
-    #     send_email.delay(
-    #         email_subject=f"Tick Tock! You have a Campaign to Complete!",
-    #         to_email=[employee.email],
-    #         email_body=email_body,
-    #     )
+    def notify_employee_campaign_reminder(self, employee):
+        """Notify employee that have not completed a camaign that the deadline is approaching"""
+        send_email.delay(**self.campaign_reminder_email(employee))
+
+    def campaign_reminder_email(self, employee) -> dict:
+        available_templates = [
+            "emails/campaign/reminder.html",
+            "emails/campaign/reminder1.html",
+            "emails/campaign/reminder2.html",
+        ]
+
+        email_template = random.choice(available_templates)
+        context = {
+            "campaign_name": self.campaign.name.title(),
+            "name": employee.first_name.title(),
+            "campaign_type": self.campaign.type.title(),
+            "start_date": self.campaign.start_date.strftime("%B %d, %Y, %-I:%M %p"),
+            "end_date": self.campaign.end_date.strftime("%B %d, %Y, %-I:%M %p"),
+            "last_name": employee.last_name,
+            "campaign_url": f"{settings.FRONTEND_URL}employee/dashboard/campaign/{self.campaign.id}",
+        }
+        return {
+            "email_subject": "Tick Tock! You have a Campaign to Complete!",
+            "to_email": [employee.email],
+            "email_body": render_to_string(email_template, context=context),
+        }
+
+    def start(self) -> bool:
+        """Start the campaign if it is still scheduled, the lifecycle sweeper may have started it"""
+        from users.services import OrganizationDashboard
 
-    def start(self):
         campaign = self.campaign
+        started = Campaign.objects.filter(
+            id=campaign.id, status=CampaignStatus.SCHEDULED
+        ).update(status=CampaignStatus.ACTIVE)
+        if not started:
+            return False
         campaign.status = CampaignStatus.ACTIVE
-        campaign.save()
+        OrganizationDashboard.bump(campaign.organization_id)
         for employee_course_campaign in self.employee_records.all():
             employee_course_campaign.notify_employee_campaign_started()
+        return True
 
     def initiate_course_campaign(self):
         campaign: Campaign = self.campaign
@@ -130,32 +139,18 @@ class CourseCampaign(BaseModel):
                 employee_course_campaign.notify_employee_campaign_enrolled()
                 # course_campaign.notify_employees_campaign_enrolled()
 
-        # set the task to start campaign in due time
-        for background_task_ids in campaign.background_task_ids:
-            app.AsyncResult(background_task_ids).revoke()
-
-        campaign.background_task_ids = []
-        start_course_campaign_task = start_campaign.apply_async(
-            args=[campaign.id], eta=campaign.start_date
-        )
-        campaign.background_task_ids.append(str(start_course_campaign_task.id))
-        campaign.save()
+        # the campaign lifecycle sweeper starts the campaign once start_date is reached,
+        # revoke start tasks scheduled before it existed
+        if campaign.background_task_ids:
+            campaign.revoke_background_tasks()
+            campaign.save()
+        if campaign.start_date and campaign.start_date <= timezone.now():
+            self.start()
 
-        # set up reminder tasks
-        for reminder_task_id in self.reminder_task_ids:
-            app.AsyncResult(reminder_task_id).revoke()
-
-        self.reminder_task_ids = []
-        if org_profile.reminder_notification:
-            now = timezone.now()
-            for reminder in settings.COURSE_CAMPAIGN_REMINDERS_IN_SECONDS:
-                reminder_time = self.campaign.end_date - timedelta(seconds=reminder)
-                if reminder_time > now:
-                    reminder_task = course_campaigns_reminder_email_task.apply_async(
-                        args=[self.campaign.id], eta=reminder_time
-                    )
-                    self.reminder_task_ids.append(str(reminder_task.id))
-            self.save()
+        # reminders are sent by the send_course_campaign_reminders_task beat job,
+        # revoke reminder tasks scheduled before it existed
+        if self.reminder_task_ids:
+            self.cancel()
 
     @property
     def activity(self):
@@ -164,22 +159,22 @@ class CourseCampaign(BaseModel):
             "total": self.employees.count(),
         }
 
+    @cached_property
+    def course_stats(self):
+        from .course_stats import CourseStats
+
+        return CourseStats.for_courses(self.courses.all()).aggregate(
+            total_duration=Sum("total_duration"), quiz_count=Sum("quiz_count")
+        )
+
     @cached_property
     def duration(self):
-        durations = []
-        for course in self.courses.all():
-            if course.duration_in_timedelta:
-                durations.append(course.duration_in_timedelta)
-        duration = sum(durations, timedelta())
+        duration = self.course_stats["total_duration"] or timedelta()
         return PendulumToolbox.convert_timedelta_to_duration(duration, in_words=True)
 
     @cached_property
     def quiz_count(self):
-        count = 0
-        courses = self.courses.prefetch_related("contents__questions").all()
-        for course in courses:
-            count += course.quiz_count
-        return count
+        return self.course_stats["quiz_count"] or 0
 
     @cached_property
     def average_score(self):
@@ -216,9 +211,22 @@ class EmployeeCourseCampaign(BaseModel):
     is_completed = models.BooleanField(default=False)
     is_started = models.BooleanField(default=False)
     is_expired = models.BooleanField(default=False)
+    # progress rate kept up to date by courses.services.CourseCampaignProgress
+    progress = models.PositiveSmallIntegerField(default=0)
+
+    class Meta(BaseModel.Meta):
+        constraints = [
+            models.UniqueConstraint(
+                fields=["employee", "course_campaign"],
+                name="unique_employee_course_campaign",
+            )
+        ]
 
     def notify_employee_campaign_started(self):
         """Notify employees that the campaign has started"""
+        send_email.delay(**self.campaign_started_email())
+
+    def campaign_started_email(self) -> dict:
         employee = self.employee
         campaign = self.course_campaign.campaign
         context = {
@@ -230,14 +238,17 @@ class EmployeeCourseCampaign(BaseModel):
         email_body = render_to_string(
             "emails/campaign/campaign_started.html", context=context
         )
-        send_email.delay(
-            email_subject=f"Campaign - {campaign.name} has started!",
-            to_email=[employee.email],
-            email_body=email_body,
-        )
+        return {
+            "email_subject": f"Campaign - {campaign.name} has started!",
+            "to_email": [employee.email],
+            "email_body": email_body,
+        }
 
     def notify_employee_campaign_enrolled(self):
         """Notify employees that they have been enrolled in a campaign"""
+        send_email.delay(**self.campaign_enrolled_email())
+
+    def campaign_enrolled_email(self) -> dict:
         employee = self.employee
         campaign = self.course_campaign.campaign
         context = {
@@ -252,11 +263,11 @@ class EmployeeCourseCampaign(BaseModel):
         email_body = render_to_string(
             "emails/campaign/employee_enrollment.html", context=context
         )
-        send_email.delay(
-            email_subject=f"You've been added to a learning campaign!",
-            to_email=[employee.email],
-            email_body=email_body,
-        )
+        return {
+            "email_subject": f"You've been added to a learning campaign!",
+            "to_email": [employee.email],
+            "email_body": email_body,
+        }
 
     @property
     def courses_left(self):
@@ -382,6 +393,27 @@ class EmployeeCourseCampaign(BaseModel):
         return False
 
 
+class CourseCampaignReminder(BaseModel):
+    """Deadline reminder sent to an employee for one of COURSE_CAMPAIGN_REMINDERS_IN_SECONDS"""
+
+    employee_course_campaign = models.ForeignKey(
+        EmployeeCourseCampaign, on_delete=models.CASCADE, related_name="reminders"
+    )
+    offset_seconds = models.PositiveIntegerField()
+    sent_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta(BaseModel.Meta):
+        constraints = [
+            models.UniqueConstraint(
+                fields=["employee_course_campaign", "offset_seconds"],
+                name="unique_course_campaign_reminder_window",
+            )
+        ]
+
+    def __str__(self):
+        return f"{self.employee_course_campaign} - {self.offset_seconds}"
+
+
 class CourseCampaignCourse(BaseModel):
     employee = models.ForeignKey(
         "users.Employee",
@@ -419,15 +451,12 @@ class CourseCampaignCourse(BaseModel):
 
     @cached_property
     def score(self):
-        answered_questions = AnsweredCourseCampaignQuestion.objects.filter(
+        score = AnsweredCourseCampaignQuestion.objects.filter(
             employee=self.employee,
             course=self.course,
             course_campaign=self.course_campaign,
-        )
-        score = 0
-        for answered_question in answered_questions:
-            if answered_question.is_correct:
-                score += 1
+            is_correct=True,
+        ).count()
         return int((score / self.questions_count) * 100) if self.questions_count else 0
 
     @cached_property
@@ -517,10 +546,8 @@ class AnsweredCourseCampaignQuestion(BaseModel):
     answers = models.ManyToManyField("quiz.QuestionOption", blank=True)
     question_options_snapshot = models.JSONField(default=dict)
     answers_snapshot = models.JSONField(default=dict)
+    is_correct = models.BooleanField(default=False)
+    credit = models.FloatField(default=0)
 
     def __str__(self):
         return f"{self.employee} - {self.question}"
-
-    @property
-    def is_correct(self):
-        return not self.answers.filter(is_correct=False).exists()
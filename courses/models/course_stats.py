@@ -0,0 +1,82 @@
+from datetime import timedelta
+
+from django.db import models
+from django.db.models import Count, Q, Sum
+
+from abstract.models import BaseModel
+
+
+class CourseStats(BaseModel):
+    """Catalog numbers of a course, kept up to date by courses.signals"""
+
+    course = models.OneToOneField(
+        "Course", on_delete=models.CASCADE, related_name="stats"
+    )
+    material_count = models.PositiveIntegerField(default=0)
+    quiz_count = models.PositiveIntegerField(default=0)
+    questions_count = models.PositiveIntegerField(default=0)
+    total_duration = models.DurationField(default=timedelta)
+
+    def __str__(self):
+        return f"{self.course}"
+
+    @classmethod
+    def refresh(cls, course_ids) -> None:
+        """Recompute the stats of the given courses with two grouped queries"""
+        from .course import Course, CourseContent
+
+        course_ids = set(course_ids)
+        if not course_ids:
+            return
+
+        counts = (
+            Course.objects.filter(id__in=course_ids)
+            .annotate(
+                num_materials=Count("course_contents", distinct=True),
+                num_quizzes=Count(
+                    "contents",
+                    filter=Q(contents__questions__isnull=False),
+                    distinct=True,
+                ),
+                num_questions=Count("contents__questions", distinct=True),
+            )
+            .values_list("id", "num_materials", "num_quizzes", "num_questions")
+        )
+        durations = dict(
+            CourseContent.objects.filter(course_id__in=course_ids)
+            .values("course_id")
+            .annotate(total_duration=Sum("content__duration"))
+            .values_list("course_id", "total_duration")
+        )
+        cls.objects.bulk_create(
+            [
+                cls(
+                    course_id=course_id,
+                    material_count=material_count,
+                    quiz_count=quiz_count,
+                    questions_count=questions_count,
+                    total_duration=durations.get(course_id) or timedelta(),
+                )
+                for course_id, material_count, quiz_count, questions_count in counts
+            ],
+            update_conflicts=True,
+            unique_fields=["course"],
+            update_fields=[
+                "material_count",
+                "quiz_count",
+                "questions_count",
+                "total_duration",
+            ],
+        )
+
+    @classmethod
+    def for_courses(cls, courses) -> models.QuerySet["CourseStats"]:
+        """Stats of the given courses, computing the ones that are missing"""
+        course_ids = set(courses.values_list("id", flat=True))
+        missing = course_ids - set(
+            cls.objects.filter(course_id__in=course_ids).values_list(
+                "course_id", flat=True
+            )
+        )
+        cls.refresh(missing)
+        return cls.objects.filter(course_id__in=course_ids)
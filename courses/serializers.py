@@ -1,3 +1,4 @@
+from django.db import models
 from django.db.models import Count, Q
 from rest_framework import serializers
 
@@ -9,11 +10,24 @@ from users.models import AnsweredQuestion, Employee, Organization, UserCourse
 from users.serializers import EmployeeSerializer
 
 from .models import Course, CourseCampaign, CourseContent
+from .services import CourseCompletionRate, CourseProgress
+
+
+class CourseStatsListSerializer(serializers.ListSerializer):
+    """Load the CourseStats of every listed course in the same query"""
+
+    def to_representation(self, data):
+        if isinstance(data, models.Manager):
+            data = data.all()
+        if isinstance(data, models.QuerySet):
+            data = data.select_related("stats")
+        return super().to_representation(data)
 
 
 class CourseListSerializer(serializers.ModelSerializer):
     class Meta:
         model = Course
+        list_serializer_class = CourseStatsListSerializer
         fields = [
             "id",
             "name",
@@ -30,6 +44,7 @@ class CourseListSerializer(serializers.ModelSerializer):
 class CampaignCourseListSerializer(serializers.ModelSerializer):
     class Meta:
         model = Course
+        list_serializer_class = CourseStatsListSerializer
         fields = [
             "id",
             "name",
@@ -156,39 +171,41 @@ class CourseSerializer(serializers.ModelSerializer):
         if user.role == Roles.EMPLOYEE:
             return None
 
-        employees = Employee.objects.filter(emp_profile__organization=obj.organization)
-        employees_courses = UserCourse.objects.filter(user__in=employees, course=obj)
-        progress_rates = [
-            employee_course.progress_rate for employee_course in employees_courses
-        ]
-        return (
-            int(sum(progress_rates) / len(progress_rates) * 100)
-            if progress_rates
-            else 0
-        )
+        return CourseCompletionRate(user.id).for_course(obj)
+
+    def get_user_course(self, course) -> tuple[UserCourse, int] | None:
+        """The requesting user's UserCourse and progress, loaded once for every serialized course"""
+        user_courses = self.context.setdefault("user_courses", {})
+        if course.id not in user_courses:
+            courses = [course]
+            if isinstance(self.parent, serializers.ListSerializer):
+                courses = self.parent.instance
+                if isinstance(courses, models.Manager):
+                    courses = courses.all()
+            course_ids = {course.id, *[listed.id for listed in courses]}
+            loaded = CourseProgress.for_user(self.context["request"].user, course_ids)
+            user_courses.update(
+                {course_id: loaded.get(course_id) for course_id in course_ids}
+            )
+        return user_courses[course.id]
 
     def get_course_progression(self, course) -> int:
-
-        user = self.context["request"].user
-
-        user_course = UserCourse.objects.filter(user=user, course=course).first()
+        user_course = self.get_user_course(course)
         if not user_course:
             return 0
         else:
-            return user_course.progress_rate
+            return user_course[1]
 
     def get_is_started(self, course) -> bool:
-        user = self.context["request"].user
-        user_course = UserCourse.objects.filter(user=user, course=course).first()
+        user_course = self.get_user_course(course)
         if not user_course:
             return False
         else:
-            return user_course.is_started
+            return user_course[0].is_started
 
     def get_is_completed(self, course) -> bool:
-        user = self.context["request"].user
-        user_course = UserCourse.objects.filter(user=user, course=course).first()
+        user_course = self.get_user_course(course)
         if not user_course:
             return False
         else:
-            return user_course.is_completed
+            return user_course[0].is_completed
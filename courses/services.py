@@ -0,0 +1,384 @@
+import threading
+import time
+from collections import defaultdict
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Avg, Count, Q, Value
+from django.db.models.functions import Coalesce
+
+from users.models import (
+    AnsweredQuestion,
+    CompletedContent,
+    OrganizationProfile,
+    UserCourse,
+)
+from users.services import OrganizationDashboard
+
+from .models import (
+    AnsweredCourseCampaignQuestion,
+    CompletedCourseCampaignContent,
+    Course,
+    CourseCampaign,
+    CourseCampaignCourse,
+    CourseStats,
+    EmployeeCourseCampaign,
+)
+
+
+class CourseProgress:
+    """UserCourse progress rates computed with grouped queries instead of
+    UserCourse.progress_rate, which costs several queries per user course.
+    """
+
+    @staticmethod
+    def totals(course_ids) -> dict:
+        """Questions plus contents without questions, per course"""
+        return {
+            stats.course_id: stats.questions_count
+            + stats.material_count
+            - stats.quiz_count
+            for stats in CourseStats.for_courses(
+                Course.objects.filter(id__in=course_ids)
+            )
+        }
+
+    @staticmethod
+    def done(course_ids, **filters) -> dict:
+        """Answered questions plus completed contents without questions, per (user, course)"""
+        answered = (
+            AnsweredQuestion.objects.filter(course_id__in=course_ids, **filters)
+            .values("user_id", "course_id")
+            .annotate(count=Count("id"))
+        )
+        completed = (
+            CompletedContent.objects.filter(
+                course_id__in=course_ids, content__questions__isnull=True, **filters
+            )
+            .values("user_id", "course_id")
+            .annotate(count=Count("id", distinct=True))
+        )
+        done = defaultdict(int)
+        for row in [*answered, *completed]:
+            done[(row["user_id"], row["course_id"])] += row["count"]
+        return done
+
+    @staticmethod
+    def rate(done: int, total: int) -> int:
+        return int((done / total) * 100) if total else 0
+
+    @classmethod
+    def for_user(cls, user, course_ids) -> dict:
+        """The user's UserCourse and progress rate for every started course"""
+        course_ids = list(course_ids)
+        user_courses = UserCourse.objects.filter(user=user, course_id__in=course_ids)
+        if not user_courses:
+            return {}
+        totals = cls.totals(course_ids)
+        done = cls.done(course_ids, user=user)
+        return {
+            user_course.course_id: (
+                user_course,
+                cls.rate(
+                    done[(user_course.user_id, user_course.course_id)],
+                    totals.get(user_course.course_id),
+                ),
+            )
+            for user_course in user_courses
+        }
+
+
+class CourseCompletionRate:
+    """Average progress rate of an organization's employees on one or many courses"""
+
+    def __init__(self, organization_id, *args, **kwargs):
+        self.organization_id = organization_id
+
+    @staticmethod
+    def cache_key(organization_id, course_id) -> str:
+        return f"course-completion-rate:{organization_id}:{course_id}"
+
+    @classmethod
+    def invalidate(cls, organization_id, course_id):
+        cache.delete(cls.cache_key(organization_id, course_id))
+
+    def for_course(self, course: Course) -> int:
+        return self.for_courses([course.id])[course.id]
+
+    def for_courses(self, course_ids) -> dict:
+        course_ids = list(course_ids)
+        timeout = settings.COURSE_COMPLETION_RATE_CACHE_TIMEOUT
+        rates = {}
+        if timeout:
+            cached = cache.get_many(
+                [self.cache_key(self.organization_id, id) for id in course_ids]
+            )
+            for course_id in course_ids:
+                key = self.cache_key(self.organization_id, course_id)
+                if key in cached:
+                    rates[course_id] = cached[key]
+
+        missing = [course_id for course_id in course_ids if course_id not in rates]
+        if missing:
+            computed = self.compute(missing)
+            rates.update(computed)
+            if timeout:
+                cache.set_many(
+                    {
+                        self.cache_key(self.organization_id, course_id): rate
+                        for course_id, rate in computed.items()
+                    },
+                    timeout,
+                )
+        return rates
+
+    def compute(self, course_ids) -> dict:
+        organization_filter = {"user__emp_profile__organization": self.organization_id}
+        totals = CourseProgress.totals(course_ids)
+        done = CourseProgress.done(course_ids, **organization_filter)
+        user_courses = UserCourse.objects.filter(
+            course_id__in=course_ids, **organization_filter
+        ).values_list("user_id", "course_id")
+
+        progress_rates = defaultdict(list)
+        for user_id, course_id in user_courses:
+            progress_rates[course_id].append(
+                CourseProgress.rate(done[(user_id, course_id)], totals.get(course_id))
+            )
+        return {
+            course_id: (
+                int(sum(progress_rates[course_id]) / len(progress_rates[course_id]))
+                if progress_rates[course_id]
+                else 0
+            )
+            for course_id in course_ids
+        }
+
+
+class CourseCampaignProgress:
+    """Progress rates of learners stored on EmployeeCourseCampaign, and the organization's
+    training completion rate derived from them. Both are refreshed with grouped queries
+    when learners progress instead of being recomputed on every dashboard load.
+    """
+
+    # learners scheduled in the current transaction, refreshed together on commit
+    pending = threading.local()
+
+    @staticmethod
+    def compute(course_campaign_id, employee_ids) -> dict:
+        """Progress rate of each employee, the average of their campaign courses' rates"""
+        filters = {
+            "course_campaign_id": course_campaign_id,
+            "employee_id__in": employee_ids,
+        }
+        campaign_courses = list(
+            CourseCampaignCourse.objects.filter(**filters).values_list(
+                "employee_id", "course_id"
+            )
+        )
+        totals = CourseProgress.totals({course_id for _, course_id in campaign_courses})
+        answered = (
+            AnsweredCourseCampaignQuestion.objects.filter(**filters)
+            .values("employee_id", "course_id")
+            .annotate(count=Count("id"))
+        )
+        completed = (
+            CompletedCourseCampaignContent.objects.filter(
+                content__questions__isnull=True, **filters
+            )
+            .values("employee_id", "course_id")
+            .annotate(count=Count("id", distinct=True))
+        )
+        done = defaultdict(int)
+        for row in [*answered, *completed]:
+            done[(row["employee_id"], row["course_id"])] += row["count"]
+
+        rates = defaultdict(list)
+        for employee_id, course_id in campaign_courses:
+            rates[employee_id].append(
+                CourseProgress.rate(
+                    done[(employee_id, course_id)], totals.get(course_id)
+                )
+            )
+        return {
+            employee_id: int(sum(employee_rates) / len(employee_rates))
+            for employee_id, employee_rates in rates.items()
+        }
+
+    @classmethod
+    def refresh(cls, course_campaign_id, employee_ids=None):
+        employee_records = EmployeeCourseCampaign.objects.filter(
+            course_campaign_id=course_campaign_id
+        )
+        if employee_ids is not None:
+            employee_records = employee_records.filter(employee_id__in=employee_ids)
+        employee_records = list(employee_records.only("id", "employee_id", "progress"))
+        progress = cls.compute(
+            course_campaign_id,
+            [employee_record.employee_id for employee_record in employee_records],
+        )
+        for employee_record in employee_records:
+            employee_record.progress = progress.get(employee_record.employee_id, 0)
+        EmployeeCourseCampaign.objects.bulk_update(
+            employee_records, ["progress"], batch_size=1000
+        )
+        cls.refresh_organization(
+            CourseCampaign.objects.filter(id=course_campaign_id)
+            .values_list("campaign__organization_id", flat=True)
+            .first()
+        )
+
+    @classmethod
+    def schedule(cls, course_campaign_id, employee_ids=None):
+        """Refresh once the current transaction commits. Every learner scheduled in the
+        transaction is collected so each course campaign is refreshed a single time,
+        None refreshes all of its learners.
+        """
+        connection = transaction.get_connection()
+        if not connection.in_atomic_block:
+            cls.refresh(course_campaign_id, employee_ids)
+            return
+        batch = getattr(cls.pending, "batch", None)
+        # a rolled back transaction discards the callback along with its batch
+        if batch is None or not any(
+            callback is batch["flush"] for _, callback, *_ in connection.run_on_commit
+        ):
+            batch = {"course_campaigns": {}}
+            batch["flush"] = lambda: cls.flush(batch)
+            cls.pending.batch = batch
+            transaction.on_commit(batch["flush"])
+        course_campaigns = batch["course_campaigns"]
+        scheduled = course_campaigns.setdefault(course_campaign_id, set())
+        if scheduled is None or employee_ids is None:
+            course_campaigns[course_campaign_id] = None
+        else:
+            scheduled.update(employee_ids)
+
+    @classmethod
+    def flush(cls, batch):
+        if getattr(cls.pending, "batch", None) is batch:
+            cls.pending.batch = None
+        for course_campaign_id, employee_ids in batch["course_campaigns"].items():
+            cls.refresh(
+                course_campaign_id, None if employee_ids is None else list(employee_ids)
+            )
+
+    @staticmethod
+    def refresh_organization(organization_id):
+        """Average of the organization's course campaign progress rates, in one query"""
+        if not organization_id:
+            return
+        rates = list(
+            CourseCampaign.objects.filter(campaign__organization_id=organization_id)
+            .annotate(rate=Coalesce(Avg("employee_records__progress"), Value(0.0)))
+            .values_list("rate", flat=True)
+        )
+        OrganizationProfile.objects.filter(organization_id=organization_id).update(
+            training_completion_rate=sum(rates) / len(rates) if rates else 0
+        )
+        OrganizationDashboard.bump(organization_id)
+
+
+class CourseCatalog:
+    """Cached course catalog. Public courses are shared by every organization and
+    cached once, private courses are cached per organization, both per learning type.
+    Writes bump the scope's version so stale entries are never read again.
+    """
+
+    PUBLIC = "public"
+
+    @staticmethod
+    def version_key(scope) -> str:
+        return f"course-catalog:version:{scope}"
+
+    @classmethod
+    def version(cls, scope) -> int:
+        # seeded from the clock so an evicted counter never reuses an old version
+        cache.add(cls.version_key(scope), time.time_ns(), None)
+        return cache.get(cls.version_key(scope))
+
+    @classmethod
+    def bump(cls, scope):
+        try:
+            cache.incr(cls.version_key(scope))
+        except ValueError:
+            cache.set(cls.version_key(scope), time.time_ns(), None)
+
+    @classmethod
+    def invalidate(cls, course_ids):
+        """Bump the scopes the given courses are listed in"""
+        scopes = set()
+        for is_public, organization_id in Course.objects.filter(
+            id__in=course_ids
+        ).values_list("is_public", "organization_id"):
+            scopes.add(cls.PUBLIC if is_public else organization_id)
+        for scope in scopes:
+            cls.bump(scope)
+
+    @classmethod
+    def courses(cls, scope, learning_type=None) -> list[Course]:
+        """Courses of one scope, with their stats loaded"""
+        key = f"course-catalog:{scope}:{learning_type or 'all'}:{cls.version(scope)}"
+        courses = cache.get(key)
+        if courses is None:
+            courses = Course.objects.select_related("stats")
+            if scope == cls.PUBLIC:
+                courses = courses.filter(is_public=True)
+            else:
+                courses = courses.filter(is_public=False, organization_id=scope)
+            if learning_type:
+                courses = courses.filter(learning_type=learning_type)
+            loaded = list(courses)
+            # compute missing stats before caching, the cached courses are never reloaded
+            if any(not hasattr(course, "stats") for course in loaded):
+                CourseStats.for_courses(courses)
+                loaded = list(courses.all())
+            courses = loaded
+            cache.set(key, courses, settings.COURSE_CATALOG_CACHE_TIMEOUT)
+        return courses
+
+    @classmethod
+    def for_organization(cls, organization_id, learning_type=None) -> list[Course]:
+        """Public and organization courses, in catalog order"""
+        if not settings.COURSE_CATALOG_CACHE_TIMEOUT:
+            courses = Course.objects.select_related("stats").filter(
+                Q(is_public=True) | Q(organization_id=organization_id)
+            )
+            if learning_type:
+                courses = courses.filter(learning_type=learning_type)
+            return list(courses)
+        return sorted(
+            [
+                *cls.courses(cls.PUBLIC, learning_type),
+                *cls.courses(organization_id, learning_type),
+            ],
+            key=lambda course: course.created_at,
+        )
+
+    @classmethod
+    def get(cls, organization_id, course_id) -> Course | None:
+        """One course of the organization's catalog, cached under its scope's version"""
+        key = f"course-catalog:course:{course_id}"
+        timeout = settings.COURSE_CATALOG_CACHE_TIMEOUT
+        cached = cache.get(key) if timeout else None
+        if cached is not None:
+            scope, version, course = cached
+            if scope in (cls.PUBLIC, str(organization_id)) and version == cls.version(
+                scope
+            ):
+                return course
+
+        courses = Course.objects.select_related("stats").filter(
+            Q(is_public=True) | Q(organization_id=organization_id), id=course_id
+        )
+        course = courses.first()
+        if course is None:
+            return None
+        if not hasattr(course, "stats"):
+            CourseStats.for_courses(courses)
+            course = courses.first()
+        if timeout:
+            scope = cls.PUBLIC if course.is_public else str(course.organization_id)
+            cache.set(key, (scope, cls.version(scope), course), timeout)
+        return course
@@ -0,0 +1,168 @@
+from django.db import transaction
+from django.db.models.signals import m2m_changed, post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from campaign.models import Campaign
+from content.models import Content
+from quiz.models import Question
+from users.models import AnsweredQuestion, CompletedContent, EmployeeProfile, UserCourse
+
+from .models import (
+    AnsweredCourseCampaignQuestion,
+    CompletedCourseCampaignContent,
+    Course,
+    CourseCampaign,
+    CourseCampaignCourse,
+    CourseContent,
+    CourseStats,
+    EmployeeCourseCampaign,
+)
+from .services import CourseCampaignProgress, CourseCatalog, CourseCompletionRate
+
+
+def refresh_courses_stats(course_ids):
+    course_ids = list(course_ids)
+    CourseStats.refresh(course_ids)
+    CourseCatalog.invalidate(course_ids)
+
+
+def refresh_content_courses_stats(content_ids):
+    refresh_courses_stats(
+        CourseContent.objects.filter(content_id__in=content_ids).values_list(
+            "course_id", flat=True
+        )
+    )
+
+
+@receiver(post_save, sender=Course)
+@receiver(post_delete, sender=Course)
+def invalidate_course_catalog(sender, instance: Course, **kwargs) -> None:
+    # the course may just have moved out of the public catalog, bump both scopes
+    CourseCatalog.bump(CourseCatalog.PUBLIC)
+    if instance.organization_id:
+        CourseCatalog.bump(instance.organization_id)
+
+
+@receiver(post_save, sender=CourseContent)
+@receiver(post_delete, sender=CourseContent)
+def refresh_course_stats(sender, instance: CourseContent, raw=False, **kwargs) -> None:
+    # nothing to refresh when the course itself is being deleted
+    if raw or isinstance(kwargs.get("origin"), Course):
+        return
+    refresh_courses_stats([instance.course_id])
+
+
+@receiver(m2m_changed, sender=Course.contents.through)
+def refresh_course_stats_on_contents_changed(
+    sender, instance, action, reverse, pk_set, **kwargs
+) -> None:
+    if action not in ["post_add", "post_remove", "post_clear"]:
+        return
+    if reverse:
+        refresh_content_courses_stats([instance.id])
+    else:
+        refresh_courses_stats([instance.id])
+
+
+@receiver(pre_save, sender=Question)
+def remember_question_content(sender, instance: Question, raw=False, **kwargs) -> None:
+    if raw or instance._state.adding:
+        return
+    instance._previous_content_id = (
+        Question.objects.filter(id=instance.id)
+        .values_list("content_id", flat=True)
+        .first()
+    )
+
+
+@receiver(post_save, sender=Question)
+@receiver(post_delete, sender=Question)
+def refresh_question_courses_stats(
+    sender, instance: Question, raw=False, **kwargs
+) -> None:
+    if raw:
+        return
+    refresh_content_courses_stats(
+        [instance.content_id, getattr(instance, "_previous_content_id", None)]
+    )
+
+
+@receiver(post_save, sender=Content)
+def refresh_content_courses_duration(
+    sender, instance: Content, created, raw=False, update_fields=None, **kwargs
+) -> None:
+    if raw or created:
+        return
+    if update_fields is not None and "duration" not in update_fields:
+        return
+    refresh_content_courses_stats([instance.id])
+
+
+@receiver(post_save, sender=AnsweredQuestion)
+@receiver(post_delete, sender=AnsweredQuestion)
+@receiver(post_save, sender=CompletedContent)
+@receiver(post_delete, sender=CompletedContent)
+@receiver(post_save, sender=UserCourse)
+@receiver(post_delete, sender=UserCourse)
+def invalidate_course_completion_rate(sender, instance, raw=False, **kwargs) -> None:
+    if raw or not instance.course_id:
+        return
+    organization_id = (
+        EmployeeProfile.objects.filter(employee_id=instance.user_id)
+        .values_list("organization_id", flat=True)
+        .first()
+    )
+    if organization_id:
+        # after commit, or a concurrent read could cache the rate from before the write
+        course_id = instance.course_id
+        transaction.on_commit(
+            lambda: CourseCompletionRate.invalidate(organization_id, course_id)
+        )
+
+
+@receiver(post_save, sender=AnsweredCourseCampaignQuestion)
+@receiver(post_delete, sender=AnsweredCourseCampaignQuestion)
+@receiver(post_save, sender=CompletedCourseCampaignContent)
+@receiver(post_delete, sender=CompletedCourseCampaignContent)
+@receiver(post_save, sender=CourseCampaignCourse)
+@receiver(post_save, sender=EmployeeCourseCampaign)
+@receiver(post_delete, sender=EmployeeCourseCampaign)
+def refresh_course_campaign_progress(sender, instance, raw=False, **kwargs) -> None:
+    if raw or not instance.course_campaign_id:
+        return
+    if sender is EmployeeCourseCampaign and not (
+        kwargs.get("created") or kwargs["signal"] is post_delete
+    ):
+        # saving an enrollment does not change its progress
+        return
+    CourseCampaignProgress.schedule(instance.course_campaign_id, [instance.employee_id])
+
+
+@receiver(m2m_changed, sender=CourseCampaign.employees.through)
+def refresh_progress_on_employees_changed(
+    sender, instance, action, reverse, pk_set, **kwargs
+) -> None:
+    if action not in ("post_add", "post_remove", "post_clear"):
+        return
+    if reverse:
+        for course_campaign_id in pk_set or []:
+            CourseCampaignProgress.schedule(course_campaign_id, [instance.id])
+    else:
+        CourseCampaignProgress.schedule(instance.id, list(pk_set or []))
+
+
+@receiver(post_save, sender=CourseCampaign)
+@receiver(post_delete, sender=CourseCampaign)
+def refresh_training_completion_rate(
+    sender, instance: CourseCampaign, raw=False, **kwargs
+) -> None:
+    if raw or kwargs.get("created") is False:
+        return
+    organization_id = (
+        Campaign.objects.filter(id=instance.campaign_id)
+        .values_list("organization_id", flat=True)
+        .first()
+    )
+    transaction.on_commit(
+        lambda: CourseCampaignProgress.refresh_organization(organization_id)
+    )
@@ -1,7 +1,13 @@
 import logging
+from datetime import timedelta
 
 from celery import shared_task
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Case, Exists, IntegerField, OuterRef, Value, When
+from django.utils import timezone
 
+from campaign.enums import CampaignStatus
 from campaign.models import Campaign
 from users.models import Employee
 
@@ -44,15 +50,95 @@ def complete_course_campaign_course_task(
 
 @shared_task(name="Course Campaigns Reminder Email")
 def course_campaigns_reminder_email_task(campaign_id: str):
-    from courses.models import CourseCampaign
+    """Kept so reminder ETA tasks queued before the beat job existed don't fail as unregistered,
+    send_course_campaign_reminders_task sends those reminders now
+    """
+    logger.info("Skipping legacy reminder task for campaign %s", campaign_id)
 
-    campaign: Campaign = Campaign.objects.filter(id=campaign_id).first()
 
-    if not campaign:
-        return
+@shared_task(name="Send due course campaign reminders")
+def send_course_campaign_reminders_task():
+    """Record the reminder window each incomplete learner is due for, then email the unsent ones.
+    The unique (employee_course_campaign, offset_seconds) pair makes every window fire once.
+    """
+    from abstract.toolboxes import EmailOutboxToolbox
+    from courses.models import CourseCampaignReminder, EmployeeCourseCampaign
+
+    now = timezone.now()
+    offsets = sorted(settings.COURSE_CAMPAIGN_REMINDERS_IN_SECONDS)
+    if not offsets:
+        return 0
+
+    # the tightest window the deadline falls in, e.g. 1 day left -> the 1 day reminder
+    reminder_window = Case(
+        *[
+            When(
+                course_campaign__campaign__end_date__lte=now
+                + timedelta(seconds=offset),
+                then=Value(offset),
+            )
+            for offset in offsets
+        ],
+        output_field=IntegerField(),
+    )
+    due_records = (
+        EmployeeCourseCampaign.objects.filter(
+            is_completed=False,
+            course_campaign__campaign__status=CampaignStatus.ACTIVE,
+            course_campaign__campaign__end_date__gt=now,
+            course_campaign__campaign__end_date__lte=now
+            + timedelta(seconds=offsets[-1]),
+            course_campaign__campaign__organization__org_profile__reminder_notification=True,
+        )
+        .annotate(reminder_window=reminder_window)
+        .exclude(
+            Exists(
+                CourseCampaignReminder.objects.filter(
+                    employee_course_campaign=OuterRef("pk"),
+                    offset_seconds=OuterRef("reminder_window"),
+                )
+            )
+        )
+        .values_list("id", "reminder_window")
+    )
+    CourseCampaignReminder.objects.bulk_create(
+        [
+            CourseCampaignReminder(
+                employee_course_campaign_id=record_id, offset_seconds=offset
+            )
+            for record_id, offset in due_records
+        ],
+        ignore_conflicts=True,
+    )
+
+    with transaction.atomic():
+        reminders = list(
+            CourseCampaignReminder.objects.select_for_update(
+                skip_locked=True, of=("self",)
+            )
+            .filter(
+                sent_at__isnull=True,
+                employee_course_campaign__is_completed=False,
+                employee_course_campaign__course_campaign__campaign__status=CampaignStatus.ACTIVE,
+                employee_course_campaign__course_campaign__campaign__end_date__gt=now,
+            )
+            .select_related(
+                "employee_course_campaign__employee__emp_profile",
+                "employee_course_campaign__course_campaign__campaign",
+            )
+        )
+        EmailOutboxToolbox.enqueue_many(
+            [
+                reminder.employee_course_campaign.course_campaign.campaign_reminder_email(
+                    reminder.employee_course_campaign.employee
+                )
+                for reminder in reminders
+            ]
+        )
+        CourseCampaignReminder.objects.filter(
+            id__in=[reminder.id for reminder in reminders]
+        ).update(sent_at=now)
 
-    course_campaign: CourseCampaign = campaign.course_campaign
-    employees_records = course_campaign.employee_records.exclude(is_completed=True)
-    for employee_record in employees_records:
-        employee = employee_record.employee
-        course_campaign.notify_employee_campaign_reminder(employee)
+    if reminders:
+        EmailOutboxToolbox.schedule_drain()
+    return len(reminders)
@@ -0,0 +1,53 @@
+from io import StringIO
+from unittest.mock import patch
+
+from django.core.management import call_command
+
+from abstract.base_test import BaseTestCase
+from content.tasks import update_completed_content
+from courses.models import Course
+from quiz.enums import QuestionTypes
+from quiz.models import Question
+from users.models import AnsweredQuestion
+
+
+class TestAnswerGrades(BaseTestCase):
+    def test_grade_option_ids(self):
+        grade = Question.grade_option_ids
+        self.assertEqual(grade(QuestionTypes.SINGLECHOICE, {1}, {1}), (True, 1.0))
+        self.assertEqual(grade(QuestionTypes.SINGLECHOICE, {1}, {2}), (False, 0.0))
+        self.assertEqual(grade(QuestionTypes.MULTICHOICE, {1, 2}, {1}), (True, 0.5))
+        self.assertEqual(grade(QuestionTypes.MULTICHOICE, {1, 2}, {1, 2}), (True, 1.0))
+        self.assertEqual(grade(QuestionTypes.MULTICHOICE, {1, 2}, {1, 3}), (False, 0))
+        self.assertEqual(grade(QuestionTypes.MULTICHOICE, {1, 2}, set()), (False, 0))
+
+    def answer_first_question(self):
+        course = Course.objects.filter(contents__questions__isnull=False).first()
+        user_course = self.employee.start_course(course)
+        question = Question.objects.filter(
+            content__in=course.contents.all(), options__is_correct=True
+        ).first()
+        correct = question.options.filter(is_correct=True)[:1]
+        with patch.object(update_completed_content, "delay"):
+            answered_question = self.employee.answer_course_content_question(
+                question.content, question, correct, course, user_course
+            )
+        return course, answered_question
+
+    def test_answer_is_graded_when_submitted(self):
+        course, answered_question = self.answer_first_question()
+
+        self.assertTrue(answered_question.is_correct)
+        self.assertGreater(answered_question.credit, 0)
+        self.assertEqual(course.get_score(self.employee), 1)
+
+    def test_backfill_answer_grades(self):
+        course, answered_question = self.answer_first_question()
+        AnsweredQuestion.objects.update(is_correct=False, credit=0)
+        self.assertEqual(course.get_score(self.employee), 0)
+
+        call_command("backfill_answer_grades", stdout=StringIO())
+
+        answered_question.refresh_from_db()
+        self.assertTrue(answered_question.is_correct)
+        self.assertEqual(course.get_score(self.employee), 1)
@@ -0,0 +1,139 @@
+from unittest.mock import patch
+
+from abstract.base_test import BaseTestCase
+from campaign.enums import CampaignTypes
+from campaign.models import Campaign
+from content.tasks import update_completed_course_campaign_content
+from courses.models import (
+    AnsweredCourseCampaignQuestion,
+    Course,
+    CourseCampaign,
+    CourseCampaignCourse,
+    EmployeeCourseCampaign,
+)
+from courses.services import CourseCampaignProgress
+from users.factory import EmployeeFactory
+from users.models import Organization
+
+
+class TestCourseCampaignProgress(BaseTestCase):
+    def setUp(self) -> None:
+        super().setUp()
+        self.course = Course.objects.filter(contents__questions__isnull=False).first()
+        self.other_employee = EmployeeFactory.create()
+        self.other_employee.emp_profile.organization = self.organization
+        self.other_employee.emp_profile.save()
+
+        campaign = Campaign.objects.create(
+            organization=self.organization, name="Training", type=CampaignTypes.GENERAL
+        )
+        with self.captureOnCommitCallbacks(execute=True):
+            self.course_campaign = CourseCampaign.objects.create(campaign=campaign)
+            self.course_campaign.courses.add(self.course)
+            self.course_campaign.employees.add(self.employee, self.other_employee)
+        self.employee_record = EmployeeCourseCampaign.objects.get(
+            employee=self.employee, course_campaign=self.course_campaign
+        )
+
+    def get_training_completion_rate(self):
+        return Organization.objects.get(
+            id=self.organization.id
+        ).organization_training_completion_rate
+
+    def complete_course(self):
+        self.employee_record.start()
+        course_campaign_course = CourseCampaignCourse.objects.get(
+            employee=self.employee, course_campaign=self.course_campaign
+        )
+        with patch.object(
+            update_completed_course_campaign_content, "delay"
+        ), self.captureOnCommitCallbacks(execute=True):
+            for content in self.course.contents.all():
+                if content.has_questions:
+                    for question in content.questions.all():
+                        self.employee.answer_course_campaign_content_question(
+                            content,
+                            question,
+                            question.options.all()[:1],
+                            self.course,
+                            self.course_campaign,
+                        )
+                else:
+                    self.employee.complete_course_campaign_content(
+                        content,
+                        self.course,
+                        self.course_campaign,
+                        course_campaign_course,
+                    )
+
+    def test_progress_is_stored_when_learners_progress(self):
+        self.assertEqual(self.get_training_completion_rate(), 0)
+
+        self.complete_course()
+
+        self.employee_record.refresh_from_db()
+        self.assertEqual(self.employee_record.progress, 100)
+        self.assertEqual(
+            self.employee_record.progress, self.employee_record.progress_rate
+        )
+        self.assertEqual(self.get_training_completion_rate(), 50)
+
+    def test_new_learners_lower_the_completion_rate(self):
+        self.complete_course()
+        with self.captureOnCommitCallbacks(execute=True):
+            self.course_campaign.employees.remove(self.other_employee)
+        self.assertEqual(self.get_training_completion_rate(), 100)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            EmployeeCourseCampaign.objects.create(
+                employee=self.other_employee, course_campaign=self.course_campaign
+            )
+        self.assertEqual(self.get_training_completion_rate(), 50)
+
+    def test_dashboard_reads_the_stored_rate(self):
+        self.complete_course()
+        organization = Organization.objects.select_related("org_profile").get(
+            id=self.organization.id
+        )
+
+        with self.assertNumQueries(0):
+            self.assertEqual(organization.organization_training_completion_rate, 50)
+
+    def test_answering_a_content_refreshes_the_progress_once(self):
+        self.employee_record.start()
+        content = self.course.contents.filter(questions__isnull=False).first()
+        question_answers = {
+            question: question.options.all()[:1] for question in content.questions.all()
+        }
+        course_campaign_course = CourseCampaignCourse.objects.get(
+            employee=self.employee, course_campaign=self.course_campaign
+        )
+
+        def answer():
+            self.employee.answer_course_campaign_content_questions(
+                content,
+                self.course,
+                self.course_campaign,
+                course_campaign_course,
+                self.employee_record,
+                question_answers,
+            )
+
+        with patch.object(update_completed_course_campaign_content, "delay"):
+            with self.captureOnCommitCallbacks(execute=True):
+                answer()
+            # answering again deletes every previous answer, one signal each
+            with patch.object(
+                CourseCampaignProgress,
+                "refresh",
+                wraps=CourseCampaignProgress.refresh,
+            ) as refresh, self.captureOnCommitCallbacks(execute=True):
+                answer()
+
+        self.assertEqual(
+            AnsweredCourseCampaignQuestion.objects.filter(
+                employee=self.employee, content=content
+            ).count(),
+            len(question_answers),
+        )
+        refresh.assert_called_once_with(self.course_campaign.id, [self.employee.id])
@@ -0,0 +1,112 @@
+from datetime import timedelta
+from unittest.mock import patch
+
+from django.core import mail
+from django.test import override_settings
+from django.utils import timezone
+
+from abstract.base_test import BaseTestCase
+from abstract.tasks import drain_email_outbox
+from abstract.toolboxes.mailer import EmailConnectionPool
+from campaign.enums import CampaignStatus, CampaignTypes
+from campaign.models import Campaign
+from courses.models import CourseCampaign, CourseCampaignReminder
+from courses.tasks import (
+    course_campaigns_reminder_email_task,
+    send_course_campaign_reminders_task,
+)
+from users.factory import EmployeeFactory
+
+
+@override_settings(
+    EMAIL_OUTBOX_BACKEND="django.core.mail.backends.locmem.EmailBackend",
+    COURSE_CAMPAIGN_REMINDERS_IN_SECONDS=[3600, 86400, 604800],
+)
+class TestCourseCampaignReminders(BaseTestCase):
+    def setUp(self) -> None:
+        super().setUp()
+        now = timezone.now()
+        self.campaign = Campaign.objects.create(
+            organization=self.organization,
+            name="Reminder campaign",
+            type=CampaignTypes.GENERAL,
+            status=CampaignStatus.ACTIVE,
+            start_date=now - timedelta(days=2),
+            end_date=now + timedelta(hours=20),
+        )
+        self.course_campaign = CourseCampaign.objects.create(campaign=self.campaign)
+        self.completed_employee = EmployeeFactory.create()
+        self.course_campaign.employees.add(self.employee, self.completed_employee)
+        self.course_campaign.employee_records.filter(
+            employee=self.completed_employee
+        ).update(is_completed=True)
+
+    def tearDown(self) -> None:
+        EmailConnectionPool.discard()
+
+    def test_reminder_sent_once_per_window_to_incomplete_employees(self):
+        with patch.object(drain_email_outbox, "delay") as delay:
+            self.assertEqual(send_course_campaign_reminders_task(), 1)
+            self.assertEqual(send_course_campaign_reminders_task(), 0)
+
+        # the job only queues the reminders, the outbox worker sends them
+        delay.assert_called_once()
+        self.assertEqual(len(mail.outbox), 0)
+        drain_email_outbox()
+
+        reminder = CourseCampaignReminder.objects.get()
+        self.assertEqual(reminder.offset_seconds, 86400)
+        self.assertIsNotNone(reminder.sent_at)
+        self.assertEqual(len(mail.outbox), 1)
+        self.assertEqual(mail.outbox[0].to, [self.employee.email])
+
+    def test_next_window_is_sent_when_deadline_gets_closer(self):
+        with patch.object(drain_email_outbox, "delay"):
+            send_course_campaign_reminders_task()
+            Campaign.objects.filter(id=self.campaign.id).update(
+                end_date=timezone.now() + timedelta(minutes=30)
+            )
+            send_course_campaign_reminders_task()
+        drain_email_outbox()
+
+        self.assertEqual(
+            sorted(
+                CourseCampaignReminder.objects.values_list("offset_seconds", flat=True)
+            ),
+            [3600, 86400],
+        )
+        self.assertEqual(len(mail.outbox), 2)
+
+    def test_no_reminder_when_disabled_or_campaign_not_active(self):
+        self.organization.org_profile.reminder_notification = False
+        self.organization.org_profile.save()
+        self.assertEqual(send_course_campaign_reminders_task(), 0)
+
+        self.organization.org_profile.reminder_notification = True
+        self.organization.org_profile.save()
+        Campaign.objects.filter(id=self.campaign.id).update(
+            status=CampaignStatus.CANCELLED
+        )
+        self.assertEqual(send_course_campaign_reminders_task(), 0)
+        self.assertFalse(CourseCampaignReminder.objects.exists())
+
+    def test_recorded_reminder_is_not_sent_once_campaign_stops(self):
+        CourseCampaignReminder.objects.create(
+            employee_course_campaign=self.course_campaign.employee_records.get(
+                employee=self.employee
+            ),
+            offset_seconds=86400,
+        )
+        Campaign.objects.filter(id=self.campaign.id).update(
+            status=CampaignStatus.CANCELLED
+        )
+
+        self.assertEqual(send_course_campaign_reminders_task(), 0)
+        self.assertIsNone(CourseCampaignReminder.objects.get().sent_at)
+        self.assertEqual(len(mail.outbox), 0)
+
+    def test_legacy_reminder_task_is_a_no_op(self):
+        course_campaigns_reminder_email_task(str(self.campaign.id))
+
+        self.assertFalse(CourseCampaignReminder.objects.exists())
+        self.assertEqual(len(mail.outbox), 0)
@@ -0,0 +1,117 @@
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from abstract.base_test import BaseTestCase
+from Castellum.enums import LearningTypes
+from courses.models import Course, CourseContent, CourseStats
+from users.factory import OrganizationFactory
+
+COURSES = "/api/courses/"
+get_course_detail = lambda id: f"{COURSES}{id}/"
+
+
+class TestCourseCatalog(BaseTestCase):
+    def list_course_ids(self, **params) -> list[str]:
+        ids = []
+        page = 1
+        while page:
+            response = self.client.get(COURSES, {**params, "page": page})
+            self.assert_ok(response)
+            ids += [course["id"] for course in response.data["results"]]
+            page = page + 1 if response.data["next"] else None
+        return ids
+
+    def test_public_and_private_courses_are_listed_per_organization(self):
+        private = Course.objects.create(
+            name="Private", organization=self.organization, is_public=False
+        )
+        other = Course.objects.create(
+            name="Other", organization=OrganizationFactory.create(), is_public=False
+        )
+
+        self.client.force_authenticate(self.employee)
+        ids = self.list_course_ids()
+
+        self.assertEqual(
+            ids,
+            [
+                str(id)
+                for id in Course.objects.filter(is_public=True).values_list(
+                    "id", flat=True
+                )
+            ]
+            + [str(private.id)],
+        )
+        self.assertNotIn(str(other.id), ids)
+        self.assertEqual(self.client.get(get_course_detail(other.id)).status_code, 404)
+        self.assert_ok(self.client.get(get_course_detail(private.id)))
+
+    def test_learning_type_is_cached_separately(self):
+        course = Course.objects.filter(is_public=True).first()
+        Course.objects.filter(id=course.id).update(
+            learning_type=LearningTypes.SPECIALIZED
+        )
+        Course.objects.get(id=course.id).save()
+
+        self.client.force_authenticate(self.organization)
+        all_ids = self.list_course_ids()
+        specialized_ids = self.list_course_ids(learning_type=LearningTypes.SPECIALIZED)
+
+        self.assertIn(str(course.id), all_ids)
+        self.assertIn(str(course.id), specialized_ids)
+        self.assertEqual(
+            specialized_ids,
+            [
+                str(id)
+                for id in Course.objects.filter(
+                    learning_type=LearningTypes.SPECIALIZED
+                ).values_list("id", flat=True)
+            ],
+        )
+
+    def test_catalog_is_served_from_cache(self):
+        self.client.force_authenticate(self.organization)
+        self.list_course_ids()
+
+        with CaptureQueriesContext(connection) as queries:
+            self.assert_ok(self.client.get(COURSES))
+        self.assertFalse(
+            [query for query in queries if '"courses_course"' in query["sql"]]
+        )
+
+    def test_course_detail_is_cached_by_id(self):
+        self.client.force_authenticate(self.organization)
+        course = Course.objects.filter(is_public=True).first()
+        CourseStats.for_courses(Course.objects.filter(id=course.id))
+        loads_course = lambda query: (
+            'FROM "courses_course" LEFT OUTER JOIN "courses_coursestats"'
+            in query["sql"]
+        )
+
+        with CaptureQueriesContext(connection) as queries:
+            self.assert_ok(self.client.get(get_course_detail(course.id)))
+        self.assertEqual(len([query for query in queries if loads_course(query)]), 1)
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(get_course_detail(course.id))
+        self.assertEqual(response.data["id"], str(course.id))
+        self.assertFalse([query for query in queries if loads_course(query)])
+
+    def test_writes_invalidate_the_catalog(self):
+        self.client.force_authenticate(self.organization)
+        course = Course.objects.filter(is_public=True).first()
+        self.list_course_ids()
+
+        course.name = "Renamed"
+        course.save()
+        response = self.client.get(get_course_detail(course.id))
+        self.assertEqual(response.data["name"], "Renamed")
+
+        material_count = response.data["material_count"]
+        CourseContent.objects.filter(course=course).first().delete()
+        response = self.client.get(get_course_detail(course.id))
+        self.assertEqual(response.data["material_count"], material_count - 1)
+
+        course.is_public = False
+        course.save()
+        self.assertNotIn(str(course.id), self.list_course_ids())
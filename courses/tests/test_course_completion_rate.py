@@ -0,0 +1,79 @@
+from unittest.mock import patch
+
+from django.core.cache import cache
+
+from abstract.base_test import BaseTestCase
+from content.tasks import update_completed_content
+from courses.models import Course
+from courses.services import CourseCompletionRate
+from users.factory import EmployeeFactory
+from users.models import UserCourse
+
+
+class TestCourseCompletionRate(BaseTestCase):
+    def setUp(self) -> None:
+        super().setUp()
+        cache.clear()
+        self.course = Course.objects.filter(contents__questions__isnull=False).first()
+        self.other_employee = EmployeeFactory.create()
+        self.other_employee.emp_profile.organization = self.organization
+        self.other_employee.emp_profile.save()
+
+    def answer_all_questions(self, employee):
+        user_course = employee.start_course(self.course)
+        with patch.object(update_completed_content, "delay"):
+            for content in self.course.contents.all():
+                if content.has_questions:
+                    for question in content.questions.all():
+                        employee.answer_course_content_question(
+                            content,
+                            question,
+                            question.options.all()[:1],
+                            self.course,
+                            user_course,
+                        )
+                else:
+                    employee.complete_content(content, self.course, user_course)
+        return user_course
+
+    def test_completion_rate_matches_progress_rates(self):
+        user_course = self.answer_all_questions(self.employee)
+        other_user_course = self.other_employee.start_course(self.course)
+
+        expected = int(
+            (
+                UserCourse.objects.get(id=user_course.id).progress_rate
+                + UserCourse.objects.get(id=other_user_course.id).progress_rate
+            )
+            / 2
+        )
+        self.assertEqual(expected, 50)
+        self.assertEqual(
+            CourseCompletionRate(self.organization.id).for_course(self.course),
+            expected,
+        )
+
+    def test_completion_rate_is_cached_and_invalidated_on_answers(self):
+        service = CourseCompletionRate(self.organization.id)
+        self.assertEqual(service.for_course(self.course), 0)
+
+        with self.assertNumQueries(0):
+            self.assertEqual(service.for_course(self.course), 0)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.answer_all_questions(self.employee)
+        self.assertEqual(service.for_course(self.course), 100)
+
+    def test_completion_rate_is_invalidated_by_the_worker(self):
+        service = CourseCompletionRate(self.organization.id)
+        user_course = self.employee.start_course(self.course)
+        self.assertEqual(service.for_course(self.course), 0)
+
+        # the task runs in a celery worker, it reaches the web's cache through CACHES
+        with self.captureOnCommitCallbacks(execute=True):
+            for content in self.course.contents.filter(questions__isnull=True):
+                update_completed_content(self.employee.id, content.id, self.course.id)
+        user_course.refresh_from_db()
+
+        self.assertGreater(user_course.progress_rate, 0)
+        self.assertEqual(service.for_course(self.course), user_course.progress_rate)
@@ -0,0 +1,64 @@
+from unittest.mock import patch
+
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIRequestFactory
+
+from abstract.base_test import BaseTestCase
+from content.tasks import update_completed_content
+from courses.models import Course, CourseStats
+from courses.serializers import CourseSerializer
+from users.models import UserCourse
+
+
+class TestCourseSerializer(BaseTestCase):
+    def serialize(self, courses):
+        request = APIRequestFactory().get("/")
+        request.user = self.employee
+        return CourseSerializer(courses, many=True, context={"request": request}).data
+
+    def test_course_state_matches_user_course(self):
+        course = Course.objects.filter(contents__questions__isnull=False).first()
+        user_course = self.employee.start_course(course)
+        content = course.contents.filter(questions__isnull=False).first()
+        question = content.questions.first()
+        with patch.object(update_completed_content, "delay"):
+            self.employee.answer_course_content_question(
+                content, question, question.options.all()[:1], course, user_course
+            )
+
+        data = {row["id"]: row for row in self.serialize(Course.objects.all()[:10])}
+
+        self.assertTrue(data[str(course.id)]["is_started"])
+        self.assertFalse(data[str(course.id)]["is_completed"])
+        self.assertEqual(
+            data[str(course.id)]["course_progression"],
+            UserCourse.objects.get(id=user_course.id).progress_rate,
+        )
+
+    def test_course_state_is_constant_query(self):
+        courses = Course.objects.prefetch_related(
+            "course_contents__content"
+        ).select_related("stats")
+        CourseStats.refresh(Course.objects.values_list("id", flat=True))
+        for course in Course.objects.all()[:3]:
+            self.employee.start_course(course)
+
+        self.assertEqual(self.state_queries(courses[:2]), 3)
+        self.assertEqual(self.state_queries(courses[:6]), 3)
+
+    def state_queries(self, courses):
+        """Count the UserCourse and progress lookups made while serializing"""
+        with CaptureQueriesContext(connection) as queries:
+            self.serialize(courses)
+        return sum(
+            any(
+                table in query["sql"]
+                for table in [
+                    '"users_usercourse"',
+                    '"users_answeredquestion"',
+                    'FROM "users_completedcontent"',
+                ]
+            )
+            for query in queries
+        )
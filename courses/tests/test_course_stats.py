@@ -0,0 +1,62 @@
+from datetime import timedelta
+
+from abstract.base_test import BaseTestCase
+from courses.models import Course, CourseContent, CourseStats
+from quiz.models import Question
+
+COURSES = "/api/courses/"
+
+
+class TestCourseStats(BaseTestCase):
+    def setUp(self) -> None:
+        super().setUp()
+        self.course = Course.objects.filter(contents__questions__isnull=False).first()
+
+    def assert_stats_match_contents(self, course: Course):
+        stats = CourseStats.objects.get(course=course)
+        contents = course.contents.all()
+        self.assertEqual(stats.material_count, contents.count())
+        self.assertEqual(
+            stats.quiz_count,
+            contents.filter(questions__isnull=False).distinct().count(),
+        )
+        self.assertEqual(
+            stats.questions_count, Question.objects.filter(content__in=contents).count()
+        )
+        self.assertEqual(
+            stats.total_duration,
+            sum(
+                [content.duration for content in contents if content.duration],
+                timedelta(),
+            ),
+        )
+
+    def test_stats_are_computed_on_first_read(self):
+        self.assertFalse(CourseStats.objects.filter(course=self.course).exists())
+        self.assertEqual(self.course.material_count, self.course.contents.count())
+        self.assert_stats_match_contents(self.course)
+
+    def test_stats_follow_question_and_content_changes(self):
+        CourseStats.refresh([self.course.id])
+        content = self.course.contents.first()
+
+        Question.objects.create(content=content, text="A new question")
+        self.assert_stats_match_contents(self.course)
+
+        content.duration = timedelta(minutes=42)
+        content.save()
+        self.assert_stats_match_contents(self.course)
+
+        CourseContent.objects.filter(course=self.course, content=content).delete()
+        self.assert_stats_match_contents(self.course)
+
+        self.course.contents.add(content, through_defaults={"order": 99})
+        self.assert_stats_match_contents(self.course)
+
+    def test_course_list_reads_stats(self):
+        self.client.force_authenticate(self.organization)
+        CourseStats.refresh(Course.objects.values_list("id", flat=True))
+
+        with self.assertNumQueries(2):
+            response = self.client.get(COURSES)
+        self.assert_ok(response)
@@ -1,5 +1,6 @@
 # Create your views here.
-from django.db.models import Q
+from django.db.models import Q, QuerySet
+from django.http import Http404
 from django.shortcuts import get_object_or_404, render
 from drf_spectacular.utils import OpenApiParameter, extend_schema, extend_schema_view
 from rest_framework import generics
@@ -38,6 +39,7 @@ from .arch.managers import (
     StartCourseManager,
 )
 from .models import Course
+from .services import CourseCatalog
 
 # Create your views here.
 # class CreateCourseView(SimpleCreateGenericView, SimpleGetListGenericView):
@@ -46,7 +48,7 @@ from .models import Course
 
 
 class CourseQuerySetHelper(generics.GenericAPIView):
-    queryset = Course.objects.all()
+    queryset = Course.objects.select_related("stats")
     lookup_field = "id"
     lookup_url_kwarg = "course_id"
 
@@ -66,6 +68,16 @@ class CourseQuerySetHelper(generics.GenericAPIView):
                 queryset = self.queryset
         return queryset.all()
 
+    def get_catalog_organization_id(self):
+        """The organization whose catalog the user sees, None when the catalog is not scoped"""
+        user = self.request.user
+        match user.role:
+            case Roles.ORGANIZATION:
+                return user.id
+            case Roles.EMPLOYEE:
+                return user.emp_profile.organization_id
+        return None
+
 
 class CourseContentQuerySetHelper(CourseQuerySetHelper):
     def get_queryset(self):
@@ -100,10 +112,21 @@ class CourseContentQuerySetHelper(CourseQuerySetHelper):
 )
 class GetCourseListView(generics.ListAPIView, CourseQuerySetHelper):
     serializer_class = CourseListSerializer
-    queryset = Course.objects.all()
+    queryset = Course.objects.select_related("stats")
     permission_classes = [IsAuthenticated]
 
+    def get_queryset(self):
+        organization_id = self.get_catalog_organization_id()
+        if organization_id is None:
+            return super().get_queryset()
+        return CourseCatalog.for_organization(
+            organization_id, self.request.query_params.get("learning_type")
+        )
+
     def filter_queryset(self, queryset):
+        if not isinstance(queryset, QuerySet):
+            # served from the catalog cache, already filtered by learning type
+            return queryset
         learning_type = self.request.query_params.get("learning_type")
         if learning_type:
             queryset = queryset.filter(learning_type=learning_type)
@@ -121,9 +144,18 @@ class GetCourseDetailView(
     SimpleGetDetailGenericView,
 ):
     serializer_class = CourseSerializer
-    queryset = Course.objects.all()
+    queryset = Course.objects.select_related("stats")
     permission_classes = [IsAuthenticated]
 
+    def get_object(self):
+        organization_id = self.get_catalog_organization_id()
+        if organization_id is None:
+            return super().get_object()
+        course = CourseCatalog.get(organization_id, self.kwargs.get("course_id"))
+        if course is None:
+            raise Http404
+        return course
+
 
 @extend_schema_view(
     get=extend_schema(
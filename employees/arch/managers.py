@@ -139,6 +139,95 @@ class EmployeesAnswerCourseCampaignQuestionManager(SimpleModelManager):
         return "Campaign Question Answered Successfully"
 
 
+class QuestionAnswerSerializer(serializers.Serializer):
+    question_id = serializers.UUIDField()
+    answer_ids = serializers.ListField(child=serializers.UUIDField(), min_length=1)
+
+
+class EmployeesAnswerCourseCampaignContentQuestionsManager(SimpleModelManager):
+    answers = QuestionAnswerSerializer(many=True, write_only=True)
+
+    class Meta:
+        model = Content
+        fields = ["answers"]
+
+    def _validate_fields(self, attrs):
+        question_ids = [answer["question_id"] for answer in attrs["answers"]]
+        if not question_ids:
+            raise serializers.ValidationError("No answers submitted")
+        if len(set(question_ids)) != len(question_ids):
+            raise serializers.ValidationError("A question can only be answered once")
+        return super()._validate_fields(attrs)
+
+    def _validate_db(self, attrs):
+        course = self.context["course"]
+        content = self.instance
+        course_campaign = self.context["course_campaign"]
+
+        employee = self.context["request"].user
+        employee_course_campaign = EmployeeCourseCampaign.objects.filter(
+            employee=employee, course_campaign=course_campaign
+        ).first()
+
+        if not employee_course_campaign:
+            raise serializers.ValidationError("You were not enrolled into this course")
+
+        if not employee_course_campaign.is_active:
+            raise serializers.ValidationError(
+                "You can't take any action on this course"
+            )
+
+        course_campaign_course = course_campaign.campaign_courses.filter(
+            employee=employee, course=course
+        ).first()
+
+        if not course_campaign_course:
+            raise serializers.ValidationError("You were not enrolled into this course")
+
+        questions = {
+            question.id: question
+            for question in content.questions.prefetch_related("options")
+        }
+        question_answers = {}
+        for answer in attrs["answers"]:
+            question = questions.get(answer["question_id"])
+            if not question:
+                raise serializers.ValidationError("Question not found")
+            answer_ids = set(answer["answer_ids"])
+            options = [
+                option for option in question.options.all() if option.id in answer_ids
+            ]
+            if len(options) != len(answer_ids):
+                raise serializers.ValidationError("Answer not found")
+            if question.type == QuestionTypes.SINGLECHOICE and len(options) > 1:
+                raise serializers.ValidationError("Single choice question")
+            question_answers[question] = options
+
+        self.course = course
+        self.content = content
+        self.course_campaign = course_campaign
+        self.course_campaign_course = course_campaign_course
+        self.employee_course_campaign = employee_course_campaign
+        self.question_answers = question_answers
+        return attrs
+
+    def _update(self, instance, validated_data):
+        employee: Employee = self.context["request"].user
+
+        employee.answer_course_campaign_content_questions(
+            content=self.content,
+            course=self.course,
+            course_campaign=self.course_campaign,
+            course_campaign_course=self.course_campaign_course,
+            employee_course_campaign=self.employee_course_campaign,
+            question_answers=self.question_answers,
+        )
+        return instance
+
+    def _to_representation(self, instance):
+        return "Campaign Questions Answered Successfully"
+
+
 class EmployeesCompleteCourseCampaignContentManager(SimpleModelManager):
     class Meta:
         model = Content
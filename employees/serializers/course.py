@@ -1,6 +1,7 @@
 from rest_framework import serializers
 
 from courses.models import Course
+from courses.serializers import CourseStatsListSerializer
 
 
 class LearningResourceCourseSerializer(serializers.ModelSerializer):
@@ -9,6 +10,7 @@ class LearningResourceCourseSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = Course
+        list_serializer_class = CourseStatsListSerializer
         fields = ["name", "thumbnail", "duration", "button_text", "course_card_type"]
 
     def get_button_text(self, obj):
@@ -0,0 +1,124 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Avg, Count, Q
+from django.utils import timezone
+
+from campaign.enums import CampaignStatus
+from campaign.models import Campaign
+from courses.models import EmployeeCourseCampaign
+from phishing.models import EmployeePhishingCampaign
+from users.models import (
+    Employee,
+    UserTimeSeriesCompletedCourses,
+    UserTimeSeriesSecurityScore,
+)
+
+
+class EmployeeDashboard:
+    """The employee dashboard built from a fixed number of queries. It reads like
+    an Employee to EmployeeDashboardManager. Each series is fetched once for 30 days
+    and the last 7 days are sliced from it.
+    """
+
+    def __init__(self, employee: Employee, now=None):
+        self.employee = employee
+        self.emp_profile = employee.emp_profile
+        self.now = now or timezone.now()
+        self.load()
+        self.load_series()
+
+    @staticmethod
+    def key(employee_id) -> str:
+        return f"employee-dashboard:{employee_id}"
+
+    @classmethod
+    def get(cls, employee: Employee) -> dict:
+        """The serialized dashboard, cached for a short time per employee"""
+        from .arch.managers import EmployeeDashboardManager
+
+        if not settings.EMPLOYEE_DASHBOARD_CACHE_TIMEOUT:
+            return EmployeeDashboardManager(cls(employee)).data
+        data = cache.get(cls.key(employee.id))
+        if data is None:
+            data = EmployeeDashboardManager(cls(employee)).data
+            cache.set(
+                cls.key(employee.id), data, settings.EMPLOYEE_DASHBOARD_CACHE_TIMEOUT
+            )
+        return data
+
+    def load(self):
+        """Everything but the series, in one query per table"""
+        campaigns = Campaign.objects.filter(
+            organization_id=self.emp_profile.organization_id,
+            course_campaign__employee_records__employee=self.employee,
+        ).aggregate(
+            active=Count(
+                "id",
+                filter=Q(
+                    course_campaign__employee_records__is_started=True,
+                    course_campaign__employee_records__is_completed=False,
+                )
+                | Q(status=CampaignStatus.ACTIVE),
+            ),
+            completed=Count(
+                "id",
+                filter=Q(
+                    course_campaign__employee_records__is_started=True,
+                    course_campaign__employee_records__is_completed=True,
+                )
+                | Q(status=CampaignStatus.COMPLETED),
+            ),
+        )
+        self.active_campaigns_count = campaigns["active"]
+        self.completed_campaigns_count = campaigns["completed"]
+        self.phishing_reported_count = EmployeePhishingCampaign.objects.filter(
+            employee=self.employee, is_reported=True
+        ).count()
+        progress = EmployeeCourseCampaign.objects.filter(
+            employee=self.employee, is_started=True
+        ).aggregate(progress=Avg("progress"))["progress"]
+        self.progress_rate = int(progress or 0)
+        self.employees_leaderboard = list(
+            Employee.objects.filter(
+                emp_profile__organization_id=self.emp_profile.organization_id
+            )
+            .select_related("emp_profile__department")
+            .order_by("-emp_profile__security_score")[:10]
+        )
+        self.ongoing_employee_campaign = (
+            EmployeeCourseCampaign.objects.filter(
+                employee=self.employee,
+                course_campaign__campaign__status=CampaignStatus.ACTIVE,
+                is_started=True,
+                is_completed=False,
+            )
+            .select_related("course_campaign__campaign")
+            .first()
+        )
+
+    def series(self, model, days=30) -> list:
+        return list(
+            model.objects.filter(
+                user=self.employee, created_at__gte=self.now - timedelta(days=days)
+            ).order_by("created_at")
+        )
+
+    def last_days(self, points: list, days=7) -> list:
+        since = self.now - timedelta(days=days)
+        return [point for point in points if point.created_at >= since]
+
+    def load_series(self):
+        self.security_score_timeseries_last_30_days = self.series(
+            UserTimeSeriesSecurityScore
+        )
+        self.courses_completed_timeseries_last_30_days = self.series(
+            UserTimeSeriesCompletedCourses
+        )
+        self.security_score_timeseries_last_7days = self.last_days(
+            self.security_score_timeseries_last_30_days
+        )
+        self.courses_completed_timeseries_last_7days = self.last_days(
+            self.courses_completed_timeseries_last_30_days
+        )
@@ -1,3 +1,164 @@
-from django.test import TestCase
+from datetime import timedelta
+from unittest.mock import patch
 
-# Create your tests here.
+from django.utils import timezone
+
+from abstract.base_test import BaseTestCase
+from abstract.tasks import send_email
+from campaign.enums import CampaignStatus, CampaignTypes
+from campaign.models import Campaign
+from courses.models import (
+    AnsweredCourseCampaignQuestion,
+    CompletedCourseCampaignContent,
+    Course,
+    CourseCampaign,
+    CourseCampaignCourse,
+    EmployeeCourseCampaign,
+)
+from employees.arch.managers import EmployeeDashboardManager
+from employees.services import EmployeeDashboard
+from users.models import UserTimeSeriesSecurityScore
+
+EMPLOYEES = "/api/employees/"
+get_answer_campaign_content_questions_path = (
+    lambda campaign_id, course_id, content_id: f"{EMPLOYEES}campaigns/{campaign_id}/courses/{course_id}/contents/{content_id}/answers/"
+)
+
+
+class TestEmployeeCourseCampaign(BaseTestCase):
+    def setUp(self) -> None:
+        super().setUp()
+        now = timezone.now()
+        self.campaign = Campaign.objects.create(
+            organization=self.organization,
+            name="Learning campaign",
+            type=CampaignTypes.GENERAL,
+            status=CampaignStatus.ACTIVE,
+            start_date=now - timedelta(days=1),
+            end_date=now + timedelta(days=5),
+        )
+        self.course = Course.objects.filter(contents__questions__isnull=False).first()
+        self.course_campaign = CourseCampaign.objects.create(campaign=self.campaign)
+        self.course_campaign.courses.add(self.course)
+        self.course_campaign.employees.add(self.employee)
+        self.employee_course_campaign = EmployeeCourseCampaign.objects.get(
+            employee=self.employee, course_campaign=self.course_campaign
+        )
+        self.employee_course_campaign.start()
+
+    def get_answers(self, content):
+        return [
+            {
+                "question_id": str(question.id),
+                "answer_ids": [str(question.options.first().id)],
+            }
+            for question in content.questions.all()
+        ]
+
+    def answer_content(self, content, answers):
+        return self.client.patch(
+            get_answer_campaign_content_questions_path(
+                self.campaign.id, self.course.id, content.id
+            ),
+            {"answers": answers},
+            format="json",
+        )
+
+    def test_answer_campaign_content_questions(self):
+        self.client.force_authenticate(self.employee)
+        content = self.course.contents.filter(questions__isnull=False).first()
+        answers = self.get_answers(content)
+
+        response = self.answer_content(content, answers)
+        self.assert_ok(response)
+        # resubmitting replaces the previous answers
+        response = self.answer_content(content, answers)
+        self.assert_ok(response)
+
+        self.assertEqual(
+            AnsweredCourseCampaignQuestion.objects.filter(
+                employee=self.employee, content=content
+            ).count(),
+            len(answers),
+        )
+        self.assertTrue(
+            CompletedCourseCampaignContent.objects.filter(
+                employee=self.employee, content=content
+            ).exists()
+        )
+
+    @patch.object(send_email, "delay")
+    def test_answering_every_content_completes_course_and_campaign(self, _):
+        self.client.force_authenticate(self.employee)
+        for content in self.course.contents.all():
+            if content.has_questions:
+                response = self.answer_content(content, self.get_answers(content))
+                self.assert_ok(response)
+            else:
+                self.employee.complete_course_campaign_content(
+                    content=content,
+                    course=self.course,
+                    course_campaign=self.course_campaign,
+                    course_campaign_course=CourseCampaignCourse.objects.get(
+                        employee=self.employee, course=self.course
+                    ),
+                )
+
+        self.employee_course_campaign.refresh_from_db()
+        self.assertTrue(
+            CourseCampaignCourse.objects.get(
+                employee=self.employee, course=self.course
+            ).is_completed
+        )
+        self.assertTrue(self.employee_course_campaign.is_completed)
+
+    def test_answer_unknown_question(self):
+        self.client.force_authenticate(self.employee)
+        content = self.course.contents.filter(questions__isnull=False).first()
+        answers = self.get_answers(content)
+        answers[0]["question_id"] = str(self.campaign.id)
+
+        response = self.answer_content(content, answers)
+        self.assert_bad(response)
+        self.assertFalse(AnsweredCourseCampaignQuestion.objects.exists())
+
+
+class TestEmployeeDashboard(BaseTestCase):
+    def setUp(self) -> None:
+        super().setUp()
+        now = timezone.now()
+        for days in [1, 10, 40]:
+            point = UserTimeSeriesSecurityScore.objects.create(
+                user=self.employee, security_score=days
+            )
+            UserTimeSeriesSecurityScore.objects.filter(id=point.id).update(
+                created_at=now - timedelta(days=days)
+            )
+
+    def test_dashboard_is_built_from_a_fixed_number_of_queries(self):
+        self.employee.emp_profile
+
+        with self.assertNumQueries(7):
+            data = EmployeeDashboardManager(EmployeeDashboard(self.employee)).data[
+                "data"
+            ]
+
+        self.assertEqual(
+            [
+                point["security_score"]
+                for point in data["security_score_timeseries_last_30_days"]
+            ],
+            [10, 1],
+        )
+        self.assertEqual(len(data["security_score_timeseries_last_7days"]), 1)
+        self.assertEqual(data["progress_rate"], 0)
+
+    def test_dashboard_is_cached_per_employee(self):
+        self.client.force_authenticate(self.employee)
+        response = self.client.get(f"{EMPLOYEES}dashboard/")
+        self.assert_ok(response)
+
+        with self.assertNumQueries(0):
+            cached = self.client.get(f"{EMPLOYEES}dashboard/")
+
+        self.assertEqual(cached.data, response.data)
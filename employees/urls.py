@@ -8,6 +8,7 @@ from .views import (
     EmployeeDetailedCourseCampaignView,
     EmployeeLearningResourcesView,
     EmployeeProfileView,
+    EmployeesAnswerCourseCampaignContentQuestionsView,
     EmployeesAnswerCourseCampaignQuestionView,
     EmployeesCompleteCourseCampaignContentView,
     EmployeesCompleteCourseCampaignView,
@@ -45,6 +46,11 @@ urlpatterns = [
         EmployeesAnswerCourseCampaignQuestionView.as_view(),
         name="employee-answer-campaign-question",
     ),
+    path(
+        "campaigns/<uuid:campaign_id>/courses/<uuid:course_id>/contents/<uuid:content_id>/answers/",
+        EmployeesAnswerCourseCampaignContentQuestionsView.as_view(),
+        name="employee-answer-campaign-content-questions",
+    ),
     path(
         "campaigns/<uuid:campaign_id>/courses/<uuid:course_id>/contents/<uuid:content_id>/complete/",
         EmployeesCompleteCourseCampaignContentView.as_view(),
@@ -42,6 +42,7 @@ from employees.arch.managers import (
     EmployeeCompleteRegistrationManager,
     EmployeeDashboardManager,
     EmployeeLearningResourceManager,
+    EmployeesAnswerCourseCampaignContentQuestionsManager,
     EmployeesAnswerCourseCampaignQuestionManager,
     EmployeesCompleteCourseCampaignContentManager,
     EmployeesCompleteCourseCampaignManager,
@@ -51,6 +52,7 @@ from users.models import Employee
 from users.serializers import EmployeeSerializer
 
 from .serializers import EmployeeCourseCampaignCountSerializer
+from .services import EmployeeDashboard
 
 
 @extend_schema_view(
@@ -260,6 +262,18 @@ class EmployeesCompleteCourseCampaignContentView(SimpleUpdateGenericView):
         return course.contents.all()
 
 
+@extend_schema_view(
+    patch=extend_schema(
+        summary="Employee answer campaign content questions",
+        description="Answer all the questions of a campaign content at once for the authenticated employee",
+    )
+)
+class EmployeesAnswerCourseCampaignContentQuestionsView(
+    EmployeesCompleteCourseCampaignContentView
+):
+    serializer_class = EmployeesAnswerCourseCampaignContentQuestionsManager
+
+
 @extend_schema_view(
     patch=extend_schema(
         summary="Employee complete a course in a campaign",
@@ -293,6 +307,11 @@ class EmployeeDashboardView(SimpleGetDetailGenericView):
     def get_object(self):
         return self.request.user
 
+    def get(self, request, *args, **kwargs):
+        return Response(
+            EmployeeDashboard.get(self.get_object()), status=status.HTTP_200_OK
+        )
+
 
 @extend_schema_view(
     get=extend_schema(
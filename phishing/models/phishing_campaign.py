@@ -10,7 +10,6 @@ from django.utils import timezone
 from abstract.models import BaseModel
 from campaign.enums import CampaignStatus
 from campaign.models import Campaign
-from campaign.tasks import start_campaign
 from campaign.typed_dicts import CampaignActivity
 from Castellum.celery import app
 from phishing.toolboxes import PhishingSecurityScoreToolbox
@@ -198,13 +197,7 @@ class PhishingCampaign(BaseModel):
                     employee_phishing_campaign.save()
 
             case EmailDeliveryTypes.SCHEDULED:
-                campaign: Campaign = self.campaign
-                background_task = start_campaign.apply_async(
-                    args=[campaign.id], eta=self.email_delivery_date
-                )
-                campaign.background_task_ids.append(background_task.id)
-                campaign.save()
-
+                # the campaign lifecycle sweeper starts the campaign on email_delivery_date
                 for employee in self.employees.all():
                     employee_phishing_campaign = EmployeePhishingCampaign.objects.get(
                         employee=employee, phishing_campaign=self
@@ -218,13 +211,6 @@ class PhishingCampaign(BaseModel):
             case EmailDeliveryTypes.SCHEDULED_RANGE:
                 start_date = self.email_delivery_start_date
                 end_date = self.email_delivery_end_date
-                campaign: Campaign = self.campaign
-
-                background_task = start_campaign.apply_async(
-                    args=[campaign.id], eta=start_date
-                )
-                campaign.background_task_ids.append(background_task.id)
-                campaign.save()
 
                 for employee in self.employees.all():
                     employee_phishing_campaign = EmployeePhishingCampaign.objects.get(
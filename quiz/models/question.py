@@ -32,6 +32,29 @@ class Question(BaseModel):
     def get_correct_answers(self):
         return self.options.filter(is_correct=True).values_list("text", flat=True)
 
+    def grade(self, answers) -> tuple[bool, float]:
+        """Grade the selected options, returns (is_correct, credit)"""
+        options = self.options.values_list("id", "is_correct")
+        return self.grade_option_ids(
+            self.type,
+            {option_id for option_id, is_correct in options if is_correct},
+            {answer.id for answer in answers},
+        )
+
+    @staticmethod
+    def grade_option_ids(
+        question_type, correct_option_ids: set, selected_option_ids: set
+    ) -> tuple[bool, float]:
+        """An answer is correct when no wrong option is selected.
+        MULTICHOICE earns partial credit, every wrong option cancels a right one.
+        """
+        right = len(selected_option_ids & correct_option_ids)
+        wrong = len(selected_option_ids - correct_option_ids)
+        is_correct = bool(selected_option_ids) and not wrong
+        if question_type != QuestionTypes.MULTICHOICE or not correct_option_ids:
+            return is_correct, 1.0 if is_correct else 0.0
+        return is_correct, max(right - wrong, 0) / len(correct_option_ids)
+
 
 class QuestionOption(BaseModel):
     question = models.ForeignKey(
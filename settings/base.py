@@ -9,6 +9,7 @@ https://docs.djangoproject.com/en/5.0/topics/settings/
 For the full list of settings and their values, see
 https://docs.djangoproject.com/en/5.0/ref/settings/
 """
+
 import os
 from pathlib import Path
 
@@ -30,6 +31,9 @@ AZURE_AD = {
     "CLIENT_SECRET": os.environ.get("CLIENT_SECRET"),
     "REDIRECT_PATH": os.environ.get("REDIRECT_PATH"),
     "SCOPE": ["User.Read"],
+    # app only Graph token of an organization's tenant, requested by the sync worker
+    "TENANT_AUTHORITY": "https://login.microsoftonline.com/{tenant_id}",
+    "GRAPH_SCOPE": ["https://graph.microsoft.com/.default"],
 }
 
 
@@ -214,6 +218,15 @@ REDIS_URL = os.environ.get("REDIS_URL", "redis://localhost:6379/0")
 # }
 
 
+# # CACHE
+# shared by the web and celery processes, tasks invalidate entries the web serves
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.redis.RedisCache",
+        "LOCATION": REDIS_URL,
+    }
+}
+
 CELERY_BROKER_URL = REDIS_URL
 CELERY_RESULT_BACKEND = CELERY_BROKER_URL
 CELERY_ACCEPT_CONTENT = ["application/json"]
@@ -235,12 +248,29 @@ DEFAULT_FROM_EMAIL = os.environ.get("DEFAULT_FROM_EMAIL")
 EMAIL_HOST_PASSWORD = os.environ.get("EMAIL_HOST_PASSWORD")
 SERVER_MAIL = DEFAULT_FROM_EMAIL
 
+# EMAIL OUTBOX SETTINGS
+EMAIL_OUTBOX_BACKEND = os.environ.get("EMAIL_OUTBOX_BACKEND")  # None uses EMAIL_BACKEND
+EMAIL_OUTBOX_BATCH_SIZE = 50
+EMAIL_OUTBOX_MAX_BATCHES_PER_RUN = 20
+EMAIL_OUTBOX_MAX_ATTEMPTS = 5
+EMAIL_OUTBOX_RETRY_BACKOFF = 60  # seconds, doubled on every attempt
+EMAIL_OUTBOX_LEASE_SECONDS = 5 * 60
+EMAIL_OUTBOX_CONNECTION_MAX_AGE = 60  # seconds
+EMAIL_OUTBOX_CONNECTION_MAX_MESSAGES = 100
+
 
 FRONTEND_URL = "https://castellum-test.vercel.app/"
 
 OKTA_DOMAIN = "https://dev-11469632.okta.com"
 OKTA_API_TOKEN = os.environ.get("Okta_Token")
 
+GRAPH_API_URL = "https://graph.microsoft.com/v1.0"
+
+DIRECTORY_SYNC_PAGE_SIZE = 200
+DIRECTORY_SYNC_REQUEST_TIMEOUT = 30  # seconds
+DIRECTORY_SYNC_CREDENTIAL_TIMEOUT = 10 * 60  # seconds an encrypted password waits
+DIRECTORY_SYNC_LEASE_SECONDS = 60 * 60  # a processing sync silent this long is stale
+
 PHISHING_EMAIL_HEADERS = ["X-PHISHTEST-Castellum"]
 PHISHING_EMAIL_IP_ADDRESSES = [
     "52.142.26.215",
@@ -256,6 +286,25 @@ COURSE_CAMPAIGN_REMINDERS_IN_SECONDS = [
 
 USER_TOKEN_EXPIRY = 15 * 60  # 15 minutes
 
+COURSE_COMPLETION_RATE_CACHE_TIMEOUT = 5 * 60  # 0 disables the cache
+
+COURSE_CATALOG_CACHE_TIMEOUT = 60 * 60  # 0 disables the cache
+
+ORGANIZATION_DASHBOARD_CACHE_TIMEOUT = 24 * 60 * 60  # 0 disables the cache
+ORGANIZATION_DASHBOARD_MAX_AGE = 15 * 60  # seconds before a refresh is queued
+ORGANIZATION_DASHBOARD_REFRESH_TIMEOUT = 60  # seconds between queued refreshes
+ORGANIZATION_DASHBOARD_ACTIVITY_LOGS = 10  # latest entries embedded in the dashboard
+
+EMPLOYEE_DASHBOARD_CACHE_TIMEOUT = 60  # 0 disables the cache
+
+ACTIVITY_FEED_PAGE_SIZE = 20
+ACTIVITY_FEED_MAX_PAGE_SIZE = 100
+
+TIME_SERIES_DAILY_RETENTION_DAYS = 90  # then rolled up per week
+TIME_SERIES_WEEKLY_RETENTION_DAYS = 2 * 365  # then rolled up per month
+
+IMPORT_JOB_CHUNK_SIZE = 1000  # rows imported per transaction
+
 HIGH_RISK_SCORE_RANGE = [0, 29]
 MEDIUM_RISK_SCORE_RANGE = [30, 69]
 LOW_RISK_SCORE_RANGE = [70, 100]
@@ -263,7 +312,19 @@ LOW_RISK_SCORE_RANGE = [70, 100]
 
 CELERY_BEAT_SCHEDULE = {
     "store_security_scores_and_courses_completed_task": {
-        "task": "users.tasks.store_security_scores_and_courses_completed",
+        "task": "Store security scores and courses completed at the end of the day",
         "schedule": crontab(hour=0, minute=0),
     },
+    "sweep_campaigns_lifecycle_task": {
+        "task": "Sweep campaigns lifecycle",
+        "schedule": crontab(minute="*"),
+    },
+    "send_course_campaign_reminders_task": {
+        "task": "Send due course campaign reminders",
+        "schedule": crontab(minute="*/15"),
+    },
+    "drain_email_outbox_task": {
+        "task": "Drain email outbox",
+        "schedule": 30.0,
+    },
 }
@@ -11,8 +11,11 @@ from .models import (
     DeliverabilityTest,
     Department,
     DepartmentTimeSeriesSecurityScore,
+    DirectorySync,
     Employee,
     EmployeeProfile,
+    ImportJob,
+    LDAPConfiguration,
     Organization,
     OrganizationProfile,
     User,
@@ -186,6 +189,9 @@ admin.site.register(UserCourse)
 admin.site.register(DeliverabilityTest)
 admin.site.register(AuthorizedDomain)
 admin.site.register(ActivityLog)
+admin.site.register(ImportJob)
+admin.site.register(DirectorySync)
+admin.site.register(LDAPConfiguration)
 
 
 @admin.register(DepartmentTimeSeriesSecurityScore)
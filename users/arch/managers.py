@@ -1,30 +1,38 @@
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+
 import pendulum
 from django.conf import settings
 from django.contrib.auth import get_user_model
+from django.db import transaction
 from django.utils import timezone
 from rest_framework import serializers
 
 from abstract.managers import SimpleManager, SimpleModelManager
 from campaign.enums import CampaignTypes
+from campaign.services import CampaignActivityChart
 from phishing.models import PhishingTemplate
+from users.enums import DirectoryProvider, TimeSeriesKind, TimeSeriesResolution
 from users.models import (
     AuthorizedDomain,
     Department,
     Employee,
     EmployeeProfile,
+    ImportJob,
+    LDAPConfiguration,
     Organization,
     OrganizationProfile,
 )
-from users.tasks import create_employee_records
+from users.tasks import process_import_job
 
 from ..serializers import (
     ActivityLogSerializer,
     DepartmentSerializer,
+    DirectorySyncSerializer,
     EmployeeProfileSerializer,
-    EmployeeSerializer,
+    ImportJobSerializer,
     TokensSerializer,
 )
-from ..services import UserImport
+from ..services import DirectorySyncManager, TimeSeries, UserImport
 from ..utils import UserCSVImport, UserFileImport, UserXLSXImport
 
 User = get_user_model()
@@ -152,31 +160,81 @@ class Step2RegisterOrgManager(SimpleModelManager):
 
 class UserFileImportManager(serializers.Serializer):
     file = serializers.FileField(required=True, write_only=True)
-    employees = EmployeeSerializer(read_only=True, many=True)
 
     class Meta:
-        fields = ["file", "employees"]
+        fields = ["file"]
+
+    def validate_file(self, file):
+        if not file.name.endswith((".csv", ".xlsx")):
+            raise serializers.ValidationError("Upload a .csv or .xlsx file")
+        # only the header row is read here, the rows are imported in the background
+        user_file = UserFileImport(file)
+        if not user_file.is_valid():
+            raise serializers.ValidationError(user_file.errors)
+        file.seek(0)
+        return file
 
     def create(self, validated_data):
         file = validated_data["file"]
-        file = UserFileImport(file)
-        if file.is_valid():
-            records = file.records
-            self.new_employees = create_employee_records(
-                records, self.context["request"].user.id
-            )
-            if not self.new_employees:
-                raise serializers.ValidationError({"file": "No new employees added"})
-            return records
-        else:
-            raise serializers.ValidationError(file.errors)
+        import_job = ImportJob.objects.create(
+            organization=self.context["request"].user, file=file, file_name=file.name
+        )
+        transaction.on_commit(lambda: process_import_job.delay(str(import_job.id)))
+        return import_job
+
+    def to_representation(self, instance):
+        return {
+            "data": ImportJobSerializer(instance).data,
+            "message": "Import started",
+        }
+
+
+class LDAPConfigurationManager(SimpleModelManager):
+    class Meta:
+        model = LDAPConfiguration
+        fields = [
+            "id",
+            "server_address",
+            "port",
+            "use_ssl",
+            "bind_dn",
+            "search_base",
+            "search_filter",
+            "page_size",
+        ]
+        extra_kwargs = {"page_size": {"min_value": 1, "max_value": 1000}}
+
+    def _update(self, instance, validated_data):
+        for field, value in validated_data.items():
+            setattr(instance, field, value)
+        instance.save()
+        return instance
+
+
+class LDAPImportManager(serializers.Serializer):
+    password = serializers.CharField(write_only=True, trim_whitespace=False)
+
+    class Meta:
+        fields = ["password"]
+
+    def validate(self, attrs):
+        if not LDAPConfiguration.objects.filter(
+            organization_id=self.context["request"].user.id
+        ).exists():
+            raise serializers.ValidationError("Set up the LDAP configuration first")
+        return attrs
+
+    def create(self, validated_data):
+        return DirectorySyncManager.schedule(
+            self.context["request"].user.id,
+            DirectoryProvider.LDAP,
+            credential=validated_data["password"],
+        )
 
     def to_representation(self, instance):
         return {
-            "data": {
-                "employees": EmployeeSerializer(self.new_employees, many=True).data,
-            },
-            "message": "Users added Successfully",
+            "data": DirectorySyncSerializer(instance).data,
+            "message": "LDAP import started",
         }
 
 
@@ -231,7 +289,7 @@ class AddEmployeeManager(SimpleModelManager):
             first_name=first_name,
             last_name=last_name,
             department=department,
-            **validated_data
+            **validated_data,
         )
         employee.receive_email("employee-invite")
         return employee
@@ -275,6 +333,8 @@ class DepartmentManager(SimpleModelManager):
                     "id": instance.id,
                     "name": instance.name,
                     "num_employees": instance.num_employees,
+                    "security_score": instance.security_score,
+                    "employees_data": instance.employees_data,
                 }
             case "PATCH":
                 return {
@@ -570,14 +630,110 @@ class AuthorizedDomainManager(SimpleModelManager):
         return authorized_domain
 
 
+class CampaignActivityManager(serializers.Serializer):
+    start = serializers.DateField()
+    end = serializers.DateField()
+    resolution = serializers.ChoiceField(
+        choices=list(CampaignActivityChart.truncs), default="day"
+    )
+    timezone = serializers.CharField(required=False)
+
+    max_buckets = 400
+
+    def validate_timezone(self, value):
+        try:
+            ZoneInfo(value)
+        except (ZoneInfoNotFoundError, ValueError):
+            raise serializers.ValidationError(f"{value} is not a valid timezone")
+        return value
+
+    def validate(self, attrs):
+        if attrs["start"] > attrs["end"]:
+            raise serializers.ValidationError("start must be before end")
+        message = (
+            f"The range cannot have more than {self.max_buckets} {attrs['resolution']}s"
+        )
+        if (attrs["end"] - attrs["start"]).days > self.max_buckets * 31:
+            raise serializers.ValidationError(message)
+        chart = CampaignActivityChart(
+            self.context["request"].user,
+            start=attrs["start"],
+            end=attrs["end"],
+            resolution=attrs["resolution"],
+            tz=attrs.get("timezone"),
+        )
+        if len(chart.bucket_dates()) > self.max_buckets:
+            raise serializers.ValidationError(message)
+        attrs["chart"] = chart
+        return attrs
+
+    def to_representation(self, instance):
+        return {
+            "data": instance.buckets(),
+            "message": "Campaign activity",
+        }
+
+
+class OrganizationTimeSeriesManager(serializers.Serializer):
+    series = serializers.ChoiceField(choices=TimeSeriesKind.choices)
+    start = serializers.DateField()
+    end = serializers.DateField()
+    resolution = serializers.ChoiceField(
+        choices=TimeSeriesResolution.choices, required=False
+    )
+    department = serializers.UUIDField(required=False)
+
+    max_buckets = 400
+    bucket_days = {
+        TimeSeriesResolution.DAY: 1,
+        TimeSeriesResolution.WEEK: 7,
+        TimeSeriesResolution.MONTH: 28,
+    }
+
+    def validate_department(self, value):
+        if not Department.objects.filter(
+            id=value, organization_id=self.context["request"].user.id
+        ).exists():
+            raise serializers.ValidationError("Department not found")
+        return value
+
+    def validate(self, attrs):
+        if attrs["start"] > attrs["end"]:
+            raise serializers.ValidationError("start must be before end")
+        resolution = attrs.get("resolution") or TimeSeries.pick_resolution(
+            attrs["start"], attrs["end"]
+        )
+        days = (attrs["end"] - attrs["start"]).days
+        if days // self.bucket_days[resolution] >= self.max_buckets:
+            raise serializers.ValidationError(
+                f"The range cannot have more than {self.max_buckets} {resolution}s"
+            )
+        try:
+            attrs["time_series"] = TimeSeries(
+                attrs["series"],
+                user_id=self.context["request"].user.id,
+                department_id=attrs.get("department"),
+            )
+        except ValueError as error:
+            raise serializers.ValidationError(str(error))
+        attrs["resolution"] = resolution
+        return attrs
+
+    def to_representation(self, instance):
+        return {
+            "data": instance["time_series"].points(
+                instance["start"], instance["end"], instance["resolution"]
+            ),
+            "message": "Time series",
+        }
+
+
 class OrganizationDashboardManager(SimpleModelManager):
     training_completion_rate = serializers.IntegerField(
         read_only=True, source="organization_training_completion_rate"
     )
     security_score = serializers.SerializerMethodField()
-    activity_logs = ActivityLogSerializer(
-        read_only=True, source="org_activity_logs", many=True
-    )
+    activity_logs = serializers.SerializerMethodField()
 
     class Meta:
         model = Organization
@@ -594,6 +750,13 @@ class OrganizationDashboardManager(SimpleModelManager):
     def get_security_score(self, obj):
         return obj.org_profile.security_score
 
+    def get_activity_logs(self, obj):
+        # only the latest entries, the rest is read from the activity feed
+        activity_logs = obj.org_activity_logs.feed()[
+            : settings.ORGANIZATION_DASHBOARD_ACTIVITY_LOGS
+        ]
+        return ActivityLogSerializer(activity_logs, many=True).data
+
 
 class PhishingPermissionCheckManager(SimpleModelManager):
     authorized_domains = serializers.BooleanField(read_only=True)
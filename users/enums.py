@@ -25,3 +25,27 @@ class CourseCardType(models.TextChoices):
     IN_PROGRESS = "in-progress", "In-Progress"
     COMPLETED = "completed", "Completed"
     RECOMMENDED = "recommended", "Recommended"
+
+
+class ImportJobStatus(models.TextChoices):
+    PENDING = "pending", "Pending"
+    PROCESSING = "processing", "Processing"
+    COMPLETED = "completed", "Completed"
+    FAILED = "failed", "Failed"
+
+
+class DirectoryProvider(models.TextChoices):
+    OKTA = "okta", "Okta"
+    AZURE_AD = "azure_ad", "Azure AD"
+    LDAP = "ldap", "LDAP"
+
+
+class TimeSeriesKind(models.TextChoices):
+    SECURITY_SCORE = "security_score", "Security Score"
+    COMPLETED_COURSES = "completed_courses", "Completed Courses"
+
+
+class TimeSeriesResolution(models.TextChoices):
+    DAY = "day", "Day"
+    WEEK = "week", "Week"
+    MONTH = "month", "Month"
@@ -0,0 +1,76 @@
+from collections import defaultdict
+
+from django.core.management import BaseCommand
+
+from courses.models import AnsweredCourseCampaignQuestion
+from quiz.models import Question, QuestionOption
+
+from ...models import AnsweredQuestion
+
+
+class Command(BaseCommand):
+    """Store is_correct and credit on answers submitted before grading was persisted"""
+
+    help = "Grade existing AnsweredQuestion and AnsweredCourseCampaignQuestion rows"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=1000)
+
+    def handle(self, *args, **kwargs):
+        batch_size = kwargs["batch_size"]
+
+        question_types = dict(Question.objects.values_list("id", "type"))
+        correct_option_ids = defaultdict(set)
+        for question_id, option_id in QuestionOption.objects.filter(
+            is_correct=True
+        ).values_list("question_id", "id"):
+            correct_option_ids[question_id].add(option_id)
+
+        for model in [AnsweredQuestion, AnsweredCourseCampaignQuestion]:
+            graded = self.grade(model, question_types, correct_option_ids, batch_size)
+            self.stdout.write(f"{model.__name__}: graded {graded} answers")
+
+        self.stdout.write(self.style.SUCCESS("Done!"))
+
+    def grade(self, model, question_types, correct_option_ids, batch_size):
+        through = model.answers.through
+        owner_field = f"{model._meta.model_name}_id"
+        graded = 0
+        answered_questions = model.objects.only("id", "question_id").order_by("id")
+
+        batch = []
+        for answered_question in answered_questions.iterator(chunk_size=batch_size):
+            batch.append(answered_question)
+            if len(batch) == batch_size:
+                graded += self.grade_batch(
+                    model,
+                    through,
+                    owner_field,
+                    batch,
+                    question_types,
+                    correct_option_ids,
+                )
+                batch = []
+        if batch:
+            graded += self.grade_batch(
+                model, through, owner_field, batch, question_types, correct_option_ids
+            )
+        return graded
+
+    def grade_batch(
+        self, model, through, owner_field, batch, question_types, correct_option_ids
+    ):
+        selected_option_ids = defaultdict(set)
+        for owner_id, option_id in through.objects.filter(
+            **{f"{owner_field}__in": [answered.id for answered in batch]}
+        ).values_list(owner_field, "questionoption_id"):
+            selected_option_ids[owner_id].add(option_id)
+
+        for answered in batch:
+            answered.is_correct, answered.credit = Question.grade_option_ids(
+                question_types.get(answered.question_id),
+                correct_option_ids[answered.question_id],
+                selected_option_ids[answered.id],
+            )
+        model.objects.bulk_update(batch, ["is_correct", "credit"])
+        return len(batch)
@@ -0,0 +1,17 @@
+from django.core.management import BaseCommand
+
+from courses.models import CourseCampaign
+from courses.services import CourseCampaignProgress
+
+
+class Command(BaseCommand):
+    """Store the progress of learners enrolled before it was kept on EmployeeCourseCampaign"""
+
+    help = "Compute stored course campaign progress and organization training completion rates"
+
+    def handle(self, *args, **kwargs):
+        course_campaign_ids = CourseCampaign.objects.values_list("id", flat=True)
+        for course_campaign_id in course_campaign_ids.iterator():
+            CourseCampaignProgress.refresh(course_campaign_id)
+        self.stdout.write(f"Refreshed {course_campaign_ids.count()} course campaigns")
+        self.stdout.write(self.style.SUCCESS("Done!"))
@@ -1,3 +1,5 @@
+from .activity_log import ActivityLogQuerySet
+from .department import DepartmentQuerySet, risk_band_filters
 from .employee import EmployeeManager
 from .organization import OrganizationManager
 from .users import UserManager
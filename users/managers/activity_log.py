@@ -0,0 +1,50 @@
+from django.db import models
+
+from ..enums import ActivityType
+
+DESCRIPTIONS = {
+    ActivityType.COURSE_CAMPAIGN_STARTED: "{first_name} started a course campaign",
+    ActivityType.COURSE_CAMPAIGN_COMPLETED: "{first_name} completed a course campaign",
+    ActivityType.COURSE_STARTED: "{first_name} started a course",
+    ActivityType.COURSE_COMPLETED: "{first_name} completed a course",
+}
+
+
+class ActivityLogQuerySet(models.QuerySet):
+    def build(self, employee, activity_type: str):
+        """An unsaved activity log with its description, employee.emp_profile must be
+        loaded or it is fetched here
+        """
+        description = DESCRIPTIONS.get(activity_type)
+        if description:
+            description = description.format(first_name=employee.emp_profile.first_name)
+        return self.model(
+            employee=employee,
+            organization_id=employee.emp_profile.organization_id,
+            type=activity_type,
+            description=description,
+        )
+
+    def log(self, employee, activity_type: str):
+        activity_log = self.build(employee, activity_type)
+        activity_log.save(force_insert=True)
+        return activity_log
+
+    def log_many(self, activities: list[tuple]) -> list:
+        """Log (employee, activity type) pairs with a single insert"""
+        from ..services import OrganizationDashboard
+
+        activity_logs = self.bulk_create(
+            [
+                self.build(employee, activity_type)
+                for employee, activity_type in activities
+            ]
+        )
+        # bulk_create sends no post_save, bump the dashboards here
+        for organization_id in {log.organization_id for log in activity_logs}:
+            OrganizationDashboard.bump(organization_id)
+        return activity_logs
+
+    def feed(self):
+        """Newest first, with what the activity log serializer reads"""
+        return self.select_related("employee__emp_profile").order_by("-created_at")
@@ -0,0 +1,31 @@
+from django.conf import settings
+from django.db import models
+from django.db.models import Count, Q
+
+
+def risk_band_filters(field: str) -> dict:
+    """Q filters of the high, medium and low risk bands on a security score field.
+    A band ends where the next one starts so fractional scores are not dropped.
+    """
+    high, medium, low = (
+        settings.HIGH_RISK_SCORE_RANGE,
+        settings.MEDIUM_RISK_SCORE_RANGE,
+        settings.LOW_RISK_SCORE_RANGE,
+    )
+    return {
+        "high": Q(**{f"{field}__gte": high[0], f"{field}__lt": medium[0]}),
+        "medium": Q(**{f"{field}__gte": medium[0], f"{field}__lt": low[0]}),
+        "low": Q(**{f"{field}__gte": low[0], f"{field}__lte": low[1]}),
+    }
+
+
+class DepartmentQuerySet(models.QuerySet):
+    def with_security_stats(self):
+        """Employee counts per risk band of every department in one grouped query"""
+        bands = risk_band_filters("employee_profiles__security_score")
+        return self.annotate(
+            employees_count=Count("employee_profiles"),
+            high_risk_count=Count("employee_profiles", filter=bands["high"]),
+            medium_risk_count=Count("employee_profiles", filter=bands["medium"]),
+            low_risk_count=Count("employee_profiles", filter=bands["low"]),
+        )
@@ -0,0 +1,23 @@
+# Generated by Django 4.1.7 on 2026-10-19 13:35
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("users", "0021_alter_usertimeseriescompletedcourses_created_at"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="answeredquestion",
+            name="credit",
+            field=models.FloatField(default=0),
+        ),
+        migrations.AddField(
+            model_name="answeredquestion",
+            name="is_correct",
+            field=models.BooleanField(default=False),
+        ),
+    ]
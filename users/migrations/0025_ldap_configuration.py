@@ -0,0 +1,65 @@
+# Generated by Django 4.1.7 on 2026-10-19 14:32
+
+from django.db import migrations, models
+import django.db.models.deletion
+import uuid
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("users", "0024_directory_sync"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="directorysync",
+            name="provider",
+            field=models.CharField(
+                choices=[("okta", "Okta"), ("azure_ad", "Azure AD"), ("ldap", "LDAP")],
+                max_length=50,
+            ),
+        ),
+        migrations.CreateModel(
+            name="LDAPConfiguration",
+            fields=[
+                (
+                    "id",
+                    models.UUIDField(
+                        default=uuid.uuid4,
+                        editable=False,
+                        primary_key=True,
+                        serialize=False,
+                    ),
+                ),
+                ("created_at", models.DateTimeField(auto_now=True)),
+                ("updated_at", models.DateTimeField(auto_now_add=True)),
+                ("is_deleted", models.BooleanField(default=False)),
+                ("deleted_at", models.DateTimeField(blank=True, null=True)),
+                ("server_address", models.CharField(max_length=256)),
+                ("port", models.PositiveIntegerField(blank=True, null=True)),
+                ("use_ssl", models.BooleanField(default=True)),
+                ("bind_dn", models.CharField(max_length=512)),
+                ("search_base", models.CharField(max_length=512)),
+                (
+                    "search_filter",
+                    models.CharField(
+                        default="(&(objectClass=user)(mail=*))", max_length=512
+                    ),
+                ),
+                ("page_size", models.PositiveIntegerField(default=500)),
+                (
+                    "organization",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="ldap_configuration",
+                        to="users.organization",
+                    ),
+                ),
+            ],
+            options={
+                "ordering": ["created_at"],
+                "abstract": False,
+            },
+        ),
+    ]
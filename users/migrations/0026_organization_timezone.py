@@ -0,0 +1,18 @@
+# Generated by Django 4.1.7 on 2026-10-19 14:45
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("users", "0025_ldap_configuration"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="organizationprofile",
+            name="timezone",
+            field=models.CharField(default="Africa/Lagos", max_length=64),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 4.1.7 on 2026-10-19 14:50
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("users", "0026_organization_timezone"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="organizationprofile",
+            name="training_completion_rate",
+            field=models.FloatField(default=0),
+        ),
+    ]
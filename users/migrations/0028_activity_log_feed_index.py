@@ -0,0 +1,20 @@
+# Generated by Django 4.1.7 on 2026-10-19 14:58
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("users", "0027_training_completion_rate"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="activitylog",
+            index=models.Index(
+                fields=["organization", "-created_at"],
+                name="activitylog_org_created_idx",
+            ),
+        ),
+    ]
@@ -0,0 +1,112 @@
+# Generated by Django 4.1.7 on 2026-10-19 15:07
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+import uuid
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("users", "0028_activity_log_feed_index"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="TimeSeriesRollup",
+            fields=[
+                (
+                    "id",
+                    models.UUIDField(
+                        default=uuid.uuid4,
+                        editable=False,
+                        primary_key=True,
+                        serialize=False,
+                    ),
+                ),
+                ("created_at", models.DateTimeField(auto_now=True)),
+                ("updated_at", models.DateTimeField(auto_now_add=True)),
+                ("is_deleted", models.BooleanField(default=False)),
+                ("deleted_at", models.DateTimeField(blank=True, null=True)),
+                (
+                    "series",
+                    models.CharField(
+                        choices=[
+                            ("security_score", "Security Score"),
+                            ("completed_courses", "Completed Courses"),
+                        ],
+                        max_length=32,
+                    ),
+                ),
+                (
+                    "resolution",
+                    models.CharField(
+                        choices=[("day", "Day"), ("week", "Week"), ("month", "Month")],
+                        max_length=8,
+                    ),
+                ),
+                ("period_start", models.DateField()),
+                ("value", models.FloatField()),
+                ("points", models.PositiveIntegerField(default=1)),
+            ],
+            options={
+                "ordering": ["created_at"],
+                "abstract": False,
+            },
+        ),
+        migrations.AddIndex(
+            model_name="departmenttimeseriessecurityscore",
+            index=models.Index(
+                fields=["department", "created_at"], name="department_score_series_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="usertimeseriescompletedcourses",
+            index=models.Index(
+                fields=["user", "created_at"], name="user_courses_series_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="usertimeseriessecurityscore",
+            index=models.Index(
+                fields=["user", "created_at"], name="user_score_series_idx"
+            ),
+        ),
+        migrations.AddField(
+            model_name="timeseriesrollup",
+            name="department",
+            field=models.ForeignKey(
+                blank=True,
+                null=True,
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="time_series_rollups",
+                to="users.department",
+            ),
+        ),
+        migrations.AddField(
+            model_name="timeseriesrollup",
+            name="user",
+            field=models.ForeignKey(
+                blank=True,
+                null=True,
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="time_series_rollups",
+                to=settings.AUTH_USER_MODEL,
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="timeseriesrollup",
+            index=models.Index(
+                fields=["user", "series", "resolution", "period_start"],
+                name="user_rollup_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="timeseriesrollup",
+            index=models.Index(
+                fields=["department", "series", "resolution", "period_start"],
+                name="department_rollup_idx",
+            ),
+        ),
+    ]
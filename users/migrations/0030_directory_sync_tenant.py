@@ -0,0 +1,18 @@
+# Generated by Django 4.1.7 on 2026-10-19 15:45
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("users", "0029_time_series_rollups"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="directorysync",
+            name="tenant_id",
+            field=models.CharField(blank=True, max_length=64, null=True),
+        ),
+    ]
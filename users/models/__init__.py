@@ -1,4 +1,6 @@
+from .directory_sync import DirectoryEntry, DirectorySync, LDAPConfiguration
 from .employee import Employee, EmployeeProfile
+from .import_job import ImportJob
 from .organization import (
     ActivityLog,
     AuthorizedDomain,
@@ -11,6 +13,7 @@ from .user import (
     CompletedContent,
     Department,
     DepartmentTimeSeriesSecurityScore,
+    TimeSeriesRollup,
     User,
     UserCourse,
     UserTimeSeriesCompletedCourses,
@@ -0,0 +1,78 @@
+from django.db import models
+
+from abstract.models import BaseModel
+from users.enums import DirectoryProvider, ImportJobStatus
+
+
+class DirectorySync(BaseModel):
+    """Incremental import of an organization's Okta or Azure AD directory"""
+
+    organization = models.ForeignKey(
+        "Organization", on_delete=models.CASCADE, related_name="directory_syncs"
+    )
+    provider = models.CharField(max_length=50, choices=DirectoryProvider.choices)
+    status = models.CharField(
+        max_length=50, choices=ImportJobStatus.choices, default=ImportJobStatus.PENDING
+    )
+    # Okta lastUpdated of the newest user seen, or the Graph delta link
+    cursor = models.TextField(null=True, blank=True)
+    # Azure AD tenant of the admin who signed in, the worker gets its own token for it
+    tenant_id = models.CharField(max_length=64, null=True, blank=True)
+    fetched_count = models.PositiveIntegerField(default=0)
+    changed_count = models.PositiveIntegerField(default=0)
+    created_count = models.PositiveIntegerField(default=0)
+    failed_count = models.PositiveIntegerField(default=0)
+    errors = models.JSONField(default=list, blank=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    completed_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta(BaseModel.Meta):
+        constraints = [
+            models.UniqueConstraint(
+                fields=["organization", "provider"],
+                name="unique_organization_directory_sync",
+            )
+        ]
+
+    def __str__(self):
+        return f"{self.organization} - {self.provider}"
+
+
+class DirectoryEntry(BaseModel):
+    """Hash of a directory user as last imported, unchanged users are skipped"""
+
+    directory_sync = models.ForeignKey(
+        DirectorySync, on_delete=models.CASCADE, related_name="entries"
+    )
+    external_id = models.CharField(max_length=256)
+    content_hash = models.CharField(max_length=64)
+
+    class Meta(BaseModel.Meta):
+        constraints = [
+            models.UniqueConstraint(
+                fields=["directory_sync", "external_id"],
+                name="unique_directory_entry",
+            )
+        ]
+
+
+class LDAPConfiguration(BaseModel):
+    """Where to find an organization's users in its LDAP or Active Directory server.
+    The bind password is never stored, it is sent with every import.
+    """
+
+    organization = models.OneToOneField(
+        "Organization", on_delete=models.CASCADE, related_name="ldap_configuration"
+    )
+    server_address = models.CharField(max_length=256)
+    port = models.PositiveIntegerField(null=True, blank=True)
+    use_ssl = models.BooleanField(default=True)
+    bind_dn = models.CharField(max_length=512)
+    search_base = models.CharField(max_length=512)
+    search_filter = models.CharField(
+        max_length=512, default="(&(objectClass=user)(mail=*))"
+    )
+    page_size = models.PositiveIntegerField(default=500)
+
+    def __str__(self):
+        return f"{self.organization} - {self.server_address}"
@@ -78,12 +78,7 @@ class Employee(User):
     def perform_activity(self, activity_type: ActivityType):
         from .organization import ActivityLog
 
-        activity_log = ActivityLog(
-            employee=self,
-            organization=self.emp_profile.organization,
-            type=activity_type,
-        )
-        activity_log.save()
+        return ActivityLog.objects.log(self, activity_type)
 
     @property
     def employees_leaderboard(self):
@@ -0,0 +1,36 @@
+from django.db import models
+
+from abstract.models import BaseModel
+from users.enums import ImportJobStatus
+
+
+class ImportJob(BaseModel):
+    """An uploaded employee file, imported in the background chunk by chunk"""
+
+    organization = models.ForeignKey(
+        "Organization", on_delete=models.CASCADE, related_name="import_jobs"
+    )
+    file = models.FileField(upload_to="imports/")
+    file_name = models.CharField(max_length=256)
+    status = models.CharField(
+        max_length=50, choices=ImportJobStatus.choices, default=ImportJobStatus.PENDING
+    )
+    total_rows = models.PositiveIntegerField(default=0)
+    processed_rows = models.PositiveIntegerField(default=0)
+    created_count = models.PositiveIntegerField(default=0)
+    updated_count = models.PositiveIntegerField(default=0)
+    failed_count = models.PositiveIntegerField(default=0)
+    errors = models.JSONField(default=list, blank=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    completed_at = models.DateTimeField(null=True, blank=True)
+
+    def __str__(self):
+        return f"{self.organization} - {self.file_name}"
+
+    @property
+    def progress(self) -> int:
+        if self.status == ImportJobStatus.COMPLETED:
+            return 100
+        if not self.total_rows:
+            return 0
+        return int((self.processed_rows / self.total_rows) * 100)
@@ -1,10 +1,11 @@
 import uuid
 from datetime import timedelta
+from zoneinfo import ZoneInfo
 
-import pendulum
 from django.conf import settings
 from django.db import models
-from django.db.models import Q
+from django.db.models import Count, OuterRef, Q, Subquery
+from django.db.models.functions import Coalesce
 from django.template.loader import render_to_string
 from django.utils import timezone
 
@@ -15,7 +16,7 @@ from Castellum.celery import app
 from Castellum.enums import Roles
 from users.enums import ActivityType, EmployeeStatuses
 
-from ..managers import OrganizationManager
+from ..managers import ActivityLogQuerySet, OrganizationManager, risk_band_filters
 from .employee import Employee
 from .user import User
 
@@ -28,6 +29,8 @@ class OrganizationProfile(BaseModel):
     url = models.URLField(null=True, blank=True)
     cut_off_score = models.FloatField(default=0)
     security_score = models.FloatField(null=True, blank=True)
+    # kept up to date by courses.services.CourseCampaignProgress
+    training_completion_rate = models.FloatField(default=0)
 
     campaign_email_notification = models.BooleanField(
         "Employees receive an email with every new campaign they are enrolled in",
@@ -42,6 +45,7 @@ class OrganizationProfile(BaseModel):
     )
 
     phishing_report_email = models.EmailField(null=True, blank=True)
+    timezone = models.CharField(max_length=64, default=settings.TIME_ZONE)
 
     def __str__(self) -> str:
         return f"{self.name}'s Profile"
@@ -75,190 +79,111 @@ class Organization(User):
 
     @property
     def campaign_stats(self):
-        campaigns = self.org_campaigns
-        return {
-            "phishing_campaigns": campaigns.filter(
-                type=CampaignTypes.PHISHING,
-                start_date__gte=timezone.now() - timedelta(days=14),
-                start_date__lte=timezone.now(),
-            ).count(),
-            "learning_campaigns": campaigns.exclude(type=CampaignTypes.PHISHING)
-            .filter(
-                start_date__gte=timezone.now() - timedelta(days=14),
-                start_date__lte=timezone.now(),
-            )
-            .count(),
-            "active_learning_campaigns": campaigns.filter(
-                status=CampaignStatus.ACTIVE,
-            )
-            .exclude(type=CampaignTypes.PHISHING)
-            .count(),
-        }
+        now = timezone.now()
+        last_14_days = Q(start_date__gte=now - timedelta(days=14), start_date__lte=now)
+        phishing = Q(type=CampaignTypes.PHISHING)
+        return self.org_campaigns.aggregate(
+            phishing_campaigns=Count("id", filter=phishing & last_14_days),
+            learning_campaigns=Count("id", filter=~phishing & last_14_days),
+            active_learning_campaigns=Count(
+                "id", filter=~phishing & Q(status=CampaignStatus.ACTIVE)
+            ),
+        )
 
     @property
     def organization_training_completion_rate(self):
-        from courses.models import CourseCampaign
-
-        progress_rates = [
-            course_campaign.progress_rate
-            for course_campaign in CourseCampaign.objects.filter(
-                campaign__organization=self
-            ).values()
-        ]
-        if progress_rates:
-            return sum(progress_rates) / len(progress_rates)
-        return 0
+        return self.org_profile.training_completion_rate
 
     @property
     def employees_security_stats(self):
-        from users.models import Department, Employee
+        from users.models import Department
 
-        employees = Employee.objects.prefetch_related("emp_profile").filter(
-            emp_profile__organization=self
+        bands = risk_band_filters("employee_profiles__security_score")
+        departments_count = (
+            Department.objects.filter(organization=OuterRef("id"))
+            .order_by()
+            .values("organization")
+            .annotate(count=Count("id"))
+            .values("count")
+        )
+        stats = (
+            Organization.objects.filter(id=self.id)
+            .annotate(
+                employees_count=Count("employee_profiles"),
+                active_employees_count=Count(
+                    "employee_profiles",
+                    filter=Q(employee_profiles__status=EmployeeStatuses.ACTIVE),
+                ),
+                high_risk_count=Count("employee_profiles", filter=bands["high"]),
+                medium_risk_count=Count("employee_profiles", filter=bands["medium"]),
+                low_risk_count=Count("employee_profiles", filter=bands["low"]),
+                departments_count=Coalesce(Subquery(departments_count), 0),
+            )
+            .values(
+                "employees_count",
+                "active_employees_count",
+                "high_risk_count",
+                "medium_risk_count",
+                "low_risk_count",
+                "departments_count",
+            )
+            .get()
         )
-        risk_rating = {
-            "high": employees.filter(emp_profile__security_score__lt=40).count(),
-            "medium": employees.filter(
-                emp_profile__security_score__gt=40, emp_profile__security_score__lt=70
-            ).count(),
-            "low": employees.filter(
-                emp_profile__security_score__gte=70,
-            ).count(),
-        }
 
         return {
-            "employees_count": employees.count(),
-            "active_employees_count": employees.filter(
-                emp_profile__status=EmployeeStatuses.ACTIVE
-            ).count(),
-            "inactive_employees_count": employees.exclude(
-                emp_profile__status=EmployeeStatuses.ACTIVE
-            ).count(),
-            "departments_count": self.departments.all().count(),
-            "risk_rating": risk_rating,
+            "employees_count": stats["employees_count"],
+            "active_employees_count": stats["active_employees_count"],
+            "inactive_employees_count": stats["employees_count"]
+            - stats["active_employees_count"],
+            "departments_count": stats["departments_count"],
+            "risk_rating": {
+                "high": stats["high_risk_count"],
+                "medium": stats["medium_risk_count"],
+                "low": stats["low_risk_count"],
+            },
         }
 
     @property
     def departments_security_stats(self):
-        from users.models import Department
+        from users.serializers import DepartmentSecurityStatsSerializer
 
-        departments = Department.objects.filter(organization=self)
-        graph_data = []
-        for department in departments:
-            department_employees = Employee.objects.prefetch_related(
-                "emp_profile"
-            ).filter(emp_profile__department=department)
-            temp_data = {
-                "name": department.name,
-                "security_score": department.security_score,
-                "employees_data": {
-                    "count": department_employees.count(),
-                    "high_risk": department_employees.filter(
-                        emp_profile__security_score__gte=settings.HIGH_RISK_SCORE_RANGE[
-                            0
-                        ],
-                        emp_profile__security_score__lte=settings.HIGH_RISK_SCORE_RANGE[
-                            1
-                        ],
-                    ).count(),
-                    "medium_risk": department_employees.filter(
-                        emp_profile__security_score__gte=settings.MEDIUM_RISK_SCORE_RANGE[
-                            0
-                        ],
-                        emp_profile__security_score__lte=settings.MEDIUM_RISK_SCORE_RANGE[
-                            1
-                        ],
-                    ).count(),
-                    "low_risk": department_employees.filter(
-                        emp_profile__security_score__gte=settings.LOW_RISK_SCORE_RANGE[
-                            0
-                        ],
-                        emp_profile__security_score__lte=settings.LOW_RISK_SCORE_RANGE[
-                            1
-                        ],
-                    ).count(),
-                },
-            }
-            graph_data.append(temp_data)
-        return graph_data
+        departments = self.departments.with_security_stats()
+        return DepartmentSecurityStatsSerializer(departments, many=True).data
 
     @property
     def courses_phishing_campaign_stats(self):
-        last_30_days = timezone.now() - timedelta(days=30)
-        last_30_days_range = pendulum.period(last_30_days, timezone.now())
-
-        last_30_days_data = []
-        count = 0
-        for dt in last_30_days_range.range("weeks"):
-            count += 1
-            temp_data = {
-                "name": f"Week {count}",
-                "learning_campaigns": self.org_campaigns.exclude(
-                    type=CampaignTypes.PHISHING
-                )
-                .filter(
-                    start_date__gte=dt.start_of("week"),
-                    start_date__lte=dt.end_of("week"),
-                )
-                .count(),
-                "phishing_campaigns": self.org_campaigns.filter(
-                    type=CampaignTypes.PHISHING,
-                    start_date__gte=dt.start_of("week"),
-                    start_date__lte=dt.end_of("week"),
-                ).count(),
-            }
-            last_30_days_data.append(temp_data)
-
-        this_week_start = pendulum.now().start_of("week")
-        this_week_end = pendulum.now().end_of("week")
-        this_week_data = {
-            "name": "This Week",
-            "learning_campaigns": self.org_campaigns.exclude(
-                type=CampaignTypes.PHISHING
-            )
-            .filter(
-                start_date__gte=this_week_start,
-                start_date__lte=this_week_end,
+        from campaign.services import CampaignActivityChart
+
+        today = timezone.localdate(timezone=ZoneInfo(self.org_profile.timezone))
+        # the calendar weeks of the last 30 days, counted per day in one query
+        start = today - timedelta(days=30)
+        start -= timedelta(days=start.weekday())
+        days = CampaignActivityChart(self, start=start, end=today).buckets()
+
+        weeks = {}
+        for day in days:
+            week = weeks.setdefault(
+                day["date"] - timedelta(days=day["date"].weekday()),
+                {"learning_campaigns": 0, "phishing_campaigns": 0},
             )
-            .count(),
-            "phishing_campaigns": self.org_campaigns.filter(
-                type=CampaignTypes.PHISHING,
-                start_date__gte=this_week_start,
-                start_date__lte=this_week_end,
-            ).count(),
-        }
-
-        last_30_days_data.append(this_week_data)
-
-        now = timezone.now()
+            week["learning_campaigns"] += day["learning_campaigns"]
+            week["phishing_campaigns"] += day["phishing_campaigns"]
+        last_30_days_data = [
+            {"name": f"Week {count}", **week}
+            for count, week in enumerate(weeks.values(), start=1)
+        ]
+        last_30_days_data.append({**last_30_days_data[-1], "name": "This Week"})
 
-        start_date = now - timedelta(days=7)
-
-        last_7_days_data = []
-
-        for i in range(7):
-            day = start_date + timedelta(days=i)
-            next_day = day + timedelta(days=1)
-
-            temp_data = {
-                "name": day.strftime("%A"),  # Get the day name (e.g., Monday)
-                "learning_campaigns": self.org_campaigns.exclude(
-                    type=CampaignTypes.PHISHING
-                )
-                .filter(Q(start_date__gte=day) & Q(start_date__lt=next_day))
-                .count(),
-                "phishing_campaigns": self.org_campaigns.filter(
-                    type=CampaignTypes.PHISHING,
-                    start_date__gte=day,
-                    start_date__lt=next_day,
-                ).count(),
+        last_7_days_data = [
+            {
+                "name": day["date"].strftime("%A"),
+                "learning_campaigns": day["learning_campaigns"],
+                "phishing_campaigns": day["phishing_campaigns"],
             }
-            last_7_days_data.append(temp_data)
-
+            for day in days[-7:]
+        ]
         last_7_days_data[-1]["name"] = "Today"
-        data = {"last_30_days": last_30_days_data, "last_7_days": last_7_days_data}
-
-        return data
+        return {"last_30_days": last_30_days_data, "last_7_days": last_7_days_data}
 
 
 class AuthorizedDomain(BaseModel):
@@ -379,5 +304,15 @@ class ActivityLog(BaseModel):
     description = models.TextField(null=True, blank=True)
     created_at = models.DateTimeField(auto_now_add=True)
 
+    objects = ActivityLogQuerySet.as_manager()
+
+    class Meta(BaseModel.Meta):
+        indexes = [
+            models.Index(
+                fields=["organization", "-created_at"],
+                name="activitylog_org_created_idx",
+            )
+        ]
+
     def __str__(self) -> str:
         return f"{self.type} - {self.employee.email}"
@@ -4,7 +4,7 @@ from functools import cached_property
 import pendulum
 from django.conf import settings
 from django.contrib.auth.models import AbstractBaseUser, PermissionsMixin
-from django.db import models
+from django.db import models, transaction
 from django.utils import timezone
 from django.utils.translation import gettext_lazy as _
 from rest_framework_simplejwt.tokens import RefreshToken
@@ -15,7 +15,8 @@ from abstract.toolboxes import UserEmailToolbox
 from Castellum.celery import app
 from Castellum.enums import Roles
 
-from ..managers import UserManager
+from ..enums import TimeSeriesKind, TimeSeriesResolution
+from ..managers import DepartmentQuerySet, UserManager
 
 
 class User(AbstractBaseUser, PermissionsMixin, BaseModel):
@@ -148,6 +149,7 @@ class User(AbstractBaseUser, PermissionsMixin, BaseModel):
         from content.tasks import update_completed_content
         from quiz.serializers import QuestionOptionSerializer
 
+        is_correct, credit = question.grade(answers)
         answered_question, _ = AnsweredQuestion.objects.update_or_create(
             user=self,
             question=question,
@@ -157,6 +159,8 @@ class User(AbstractBaseUser, PermissionsMixin, BaseModel):
             defaults={
                 "question_options_snapshot": ContentQuestionSerializer(question).data,
                 "answers_snapshot": QuestionOptionSerializer(answers, many=True).data,
+                "is_correct": is_correct,
+                "credit": credit,
             },
         )
         answered_question.answers.set(answers)
@@ -176,6 +180,7 @@ class User(AbstractBaseUser, PermissionsMixin, BaseModel):
         from courses.models import AnsweredCourseCampaignQuestion
         from quiz.serializers import QuestionOptionSerializer
 
+        is_correct, credit = question.grade(answers)
         answered_question, _ = AnsweredCourseCampaignQuestion.objects.update_or_create(
             employee=self,
             question=question,
@@ -185,6 +190,8 @@ class User(AbstractBaseUser, PermissionsMixin, BaseModel):
             defaults={
                 "question_options_snapshot": ContentQuestionSerializer(question).data,
                 "answers_snapshot": QuestionOptionSerializer(answers, many=True).data,
+                "is_correct": is_correct,
+                "credit": credit,
             },
         )
         answered_question.answers.set(answers)
@@ -193,6 +200,94 @@ class User(AbstractBaseUser, PermissionsMixin, BaseModel):
         )
         return answered_question
 
+    def answer_course_campaign_content_questions(
+        self,
+        content,
+        course,
+        course_campaign,
+        course_campaign_course,
+        employee_course_campaign,
+        question_answers,
+    ):
+        """Grade and store every answer of a content at once, then evaluate completion.
+        question_answers maps each Question (options prefetched) to its selected options.
+        """
+        from content.serializers import ContentQuestionSerializer
+        from courses.models import AnsweredCourseCampaignQuestion
+        from courses.services import CourseCampaignProgress
+        from quiz.serializers import QuestionOptionSerializer
+
+        answered_questions = []
+        for question, answers in question_answers.items():
+            is_correct, credit = question.grade(answers)
+            answered_questions.append(
+                AnsweredCourseCampaignQuestion(
+                    employee=self,
+                    question=question,
+                    content=content,
+                    course=course,
+                    course_campaign=course_campaign,
+                    question_options_snapshot=ContentQuestionSerializer(question).data,
+                    answers_snapshot=QuestionOptionSerializer(answers, many=True).data,
+                    is_correct=is_correct,
+                    credit=credit,
+                )
+            )
+
+        answer_through = AnsweredCourseCampaignQuestion.answers.through
+        with transaction.atomic():
+            AnsweredCourseCampaignQuestion.objects.filter(
+                employee=self,
+                course_campaign=course_campaign,
+                course=course,
+                question__in=question_answers.keys(),
+            ).delete()
+            AnsweredCourseCampaignQuestion.objects.bulk_create(answered_questions)
+            # bulk_create sends no post_save, refresh the stored progress here
+            CourseCampaignProgress.schedule(course_campaign.id, [self.id])
+            answer_through.objects.bulk_create(
+                [
+                    answer_through(
+                        answeredcoursecampaignquestion_id=answered_question.id,
+                        questionoption_id=answer.id,
+                    )
+                    for answered_question, answers in zip(
+                        answered_questions, question_answers.values()
+                    )
+                    for answer in answers
+                ]
+            )
+
+            content_completed = (
+                self.answered_campaign_questions.filter(
+                    content=content, course_campaign=course_campaign, course=course
+                ).count()
+                >= content.questions.count()
+            )
+            if not content_completed:
+                return answered_questions
+            self.complete_course_campaign_content(
+                content=content,
+                course=course,
+                course_campaign=course_campaign,
+                course_campaign_course=course_campaign_course,
+            )
+
+            if (
+                course_campaign_course.is_completed
+                or course_campaign_course.progression_rate < 100
+            ):
+                return answered_questions
+            self.complete_course_campaign_course(
+                course=course,
+                course_campaign=course_campaign,
+                employee_course_campaign=employee_course_campaign,
+            )
+
+            if not employee_course_campaign.courses_left:
+                employee_course_campaign.complete()
+        return answered_questions
+
     def complete_course_campaign_course(
         self, course, course_campaign, employee_course_campaign
     ):
@@ -217,13 +312,27 @@ class Department(BaseModel):
         null=True,
     )
 
+    objects = DepartmentQuerySet.as_manager()
+
     def __str__(self):
         return self.name
 
     @property
     def num_employees(self):
+        if hasattr(self, "employees_count"):
+            return self.employees_count
         return self.employee_profiles.count()
 
+    @property
+    def employees_data(self):
+        """Risk band counts, only on departments from with_security_stats()"""
+        return {
+            "count": self.employees_count,
+            "high_risk": self.high_risk_count,
+            "medium_risk": self.medium_risk_count,
+            "low_risk": self.low_risk_count,
+        }
+
 
 class UserCourse(BaseModel):
     user = models.ForeignKey(
@@ -307,14 +416,7 @@ class UserCourse(BaseModel):
         return self.get_score()
 
     def get_score(self):
-        course = self.course
-        contents = course.contents.all()
-        user = self.user
-        score = 0
-        for content in contents:
-            content_score = content.get_score(user)
-            score += content_score
-        return score
+        return self.course.get_score(self.user)
 
     @cached_property
     def contents(self):
@@ -374,17 +476,12 @@ class AnsweredQuestion(BaseModel):
     answers = models.ManyToManyField("quiz.QuestionOption", blank=True)
     question_options_snapshot = models.JSONField(default=dict)
     answers_snapshot = models.JSONField(default=dict)
+    is_correct = models.BooleanField(default=False)
+    credit = models.FloatField(default=0)
 
     def __str__(self):
         return f"{self.user} - {self.question}"
 
-    @cached_property
-    def is_correct(self):
-        for answer in self.answers.all():
-            if not answer.is_correct:
-                return False
-        return True
-
 
 class UserTimeSeriesSecurityScore(BaseModel):
     user = models.ForeignKey(
@@ -392,6 +489,11 @@ class UserTimeSeriesSecurityScore(BaseModel):
     )
     security_score = models.FloatField()
 
+    class Meta(BaseModel.Meta):
+        indexes = [
+            models.Index(fields=["user", "created_at"], name="user_score_series_idx")
+        ]
+
 
 class DepartmentTimeSeriesSecurityScore(BaseModel):
     department = models.ForeignKey(
@@ -401,6 +503,13 @@ class DepartmentTimeSeriesSecurityScore(BaseModel):
     )
     security_score = models.FloatField()
 
+    class Meta(BaseModel.Meta):
+        indexes = [
+            models.Index(
+                fields=["department", "created_at"], name="department_score_series_idx"
+            )
+        ]
+
 
 class UserTimeSeriesCompletedCourses(BaseModel):
     user = models.ForeignKey(
@@ -408,3 +517,47 @@ class UserTimeSeriesCompletedCourses(BaseModel):
     )
     courses_completed = models.IntegerField()
     created_at = models.DateTimeField(auto_now_add=True, editable=True)
+
+    class Meta(BaseModel.Meta):
+        indexes = [
+            models.Index(fields=["user", "created_at"], name="user_courses_series_idx")
+        ]
+
+
+class TimeSeriesRollup(BaseModel):
+    """Daily time series points aggregated per week or month once they are older
+    than the daily retention window. value is the average security score or the
+    highest completed courses count of the period, points the daily points in it.
+    """
+
+    series = models.CharField(max_length=32, choices=TimeSeriesKind.choices)
+    resolution = models.CharField(max_length=8, choices=TimeSeriesResolution.choices)
+    user = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        null=True,
+        blank=True,
+        related_name="time_series_rollups",
+    )
+    department = models.ForeignKey(
+        "Department",
+        on_delete=models.CASCADE,
+        null=True,
+        blank=True,
+        related_name="time_series_rollups",
+    )
+    period_start = models.DateField()
+    value = models.FloatField()
+    points = models.PositiveIntegerField(default=1)
+
+    class Meta(BaseModel.Meta):
+        indexes = [
+            models.Index(
+                fields=["user", "series", "resolution", "period_start"],
+                name="user_rollup_idx",
+            ),
+            models.Index(
+                fields=["department", "series", "resolution", "period_start"],
+                name="department_rollup_idx",
+            ),
+        ]
@@ -7,12 +7,13 @@ from users.models import (
     AuthorizedDomain,
     DeliverabilityTest,
     Department,
+    DirectorySync,
     Employee,
     EmployeeProfile,
+    ImportJob,
     Organization,
     OrganizationProfile,
 )
-from users.tasks import create_employee_records
 
 from .services import UserImport
 from .utils import UserCSVImport, UserFileImport, UserXLSXImport
@@ -27,10 +28,11 @@ class TokensSerializer(serializers.Serializer):
 
 class OrganizationSerializer(serializers.ModelSerializer):
     name = serializers.CharField(source="org_profile.name")
+    timezone = serializers.CharField(source="org_profile.timezone", read_only=True)
 
     class Meta:
         model = Organization
-        fields = ["email", "last_login", "name", "id"]
+        fields = ["email", "last_login", "name", "id", "timezone"]
 
 
 class DepartmentSerializer(serializers.ModelSerializer):
@@ -39,6 +41,14 @@ class DepartmentSerializer(serializers.ModelSerializer):
         fields = ["name", "id"]
 
 
+class DepartmentSecurityStatsSerializer(serializers.ModelSerializer):
+    employees_data = serializers.DictField(read_only=True)
+
+    class Meta:
+        model = Department
+        fields = ["id", "name", "security_score", "employees_data"]
+
+
 class EmployeeProfileSerializer(serializers.ModelSerializer):
     department = DepartmentSerializer(read_only=True)
 
@@ -177,3 +187,41 @@ class UserLoginSerializer(serializers.ModelSerializer):
 
     def to_representation(self, instance):
         return {"role": instance.role, **instance.tokens}
+
+
+class ImportJobSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = ImportJob
+        fields = [
+            "id",
+            "file_name",
+            "status",
+            "progress",
+            "total_rows",
+            "processed_rows",
+            "created_count",
+            "updated_count",
+            "failed_count",
+            "errors",
+            "started_at",
+            "completed_at",
+            "created_at",
+        ]
+
+
+class DirectorySyncSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = DirectorySync
+        fields = [
+            "id",
+            "provider",
+            "status",
+            "fetched_count",
+            "changed_count",
+            "created_count",
+            "failed_count",
+            "errors",
+            "started_at",
+            "completed_at",
+            "updated_at",
+        ]
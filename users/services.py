@@ -1,50 +1,1125 @@
-from django.db import models
+import base64
+import hashlib
+import json
+import math
+import os
+import time
+from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime
+from datetime import time as day_time
+from datetime import timedelta
+from itertools import islice
+from urllib.parse import urlencode
 
-from users.models import Department, Employee, EmployeeProfile, Organization
+import requests
+from cryptography.fernet import Fernet, InvalidToken
+from cryptography.hazmat.primitives import hashes
+from cryptography.hazmat.primitives.kdf.hkdf import HKDF
+from django.conf import settings
+from django.contrib.auth.base_user import BaseUserManager
+from django.core.cache import cache
+from django.core.exceptions import ValidationError
+from django.core.validators import validate_email
+from django.db import transaction
+from django.db.models import Count, DateField, F, Max, Q, Sum
+from django.db.models.functions import TruncDay, TruncMonth, TruncWeek
+from django.utils import timezone
+from ldap3 import NONE, SUBTREE, SYNC, Connection, Server
+from msal import ConfidentialClientApplication
+from rest_framework import status
+from rest_framework.exceptions import APIException
+
+from abstract.toolboxes import EmployeeInviteToolbox
+from Castellum.enums import Roles
+from users.enums import (
+    DirectoryProvider,
+    ImportJobStatus,
+    TimeSeriesKind,
+    TimeSeriesResolution,
+)
+from users.models import (
+    Department,
+    DepartmentTimeSeriesSecurityScore,
+    DirectoryEntry,
+    DirectorySync,
+    Employee,
+    EmployeeProfile,
+    ImportJob,
+    LDAPConfiguration,
+    Organization,
+    OrganizationProfile,
+    TimeSeriesRollup,
+    User,
+    UserCourse,
+    UserTimeSeriesCompletedCourses,
+    UserTimeSeriesSecurityScore,
+)
+from users.utils import UserFileImport
 
 
 class UserImport:
-    def __init__(self, records: list[dict], organization: Organization):
+    """Create or update an organization's employees from imported rows with a fixed
+    number of queries. Rows that cannot be imported are reported in errors.
+    """
+
+    batch_size = 1000
+
+    def __init__(
+        self,
+        records: list[dict],
+        organization: Organization,
+        first_row: int = 2,
+        row_numbers: list[int] | None = None,
+    ):
         self.records = records
         self.organization = organization
+        # file row of the first record, the header is row 1
+        self.first_row = first_row
+        # file row of every record, when blank rows were skipped between them
+        self.row_numbers = row_numbers
         self.new_employees = []
+        self.updated_employees = []
+        self.errors = []
+
+    @staticmethod
+    def clean(value) -> str | None:
+        # pandas gives NaN for empty cells
+        if value is None or (isinstance(value, float) and math.isnan(value)):
+            return None
+        value = str(value).strip()
+        return value or None
+
+    def add_error(self, index: int, column: str, message: str):
+        row = self.row_numbers[index] if self.row_numbers else self.first_row + index
+        self.errors.append({"row": row, "column": column, "message": message})
+
+    def clean_records(self) -> list[tuple[int, dict]]:
+        rows, emails = [], set()
+        for index, record in enumerate(self.records):
+            email = self.clean(record.get("email"))
+            if not email:
+                self.add_error(index, "email", "Email is required")
+                continue
+            email = BaseUserManager.normalize_email(email)
+            try:
+                validate_email(email)
+            except ValidationError:
+                self.add_error(index, "email", f"{email} is not a valid email")
+                continue
+            if email in emails:
+                self.add_error(index, "email", f"{email} appears more than once")
+                continue
+            emails.add(email)
+            department = self.clean(record.get("department"))
+            rows.append(
+                (
+                    index,
+                    {
+                        "email": email,
+                        "first_name": self.clean(record.get("first_name")),
+                        "last_name": self.clean(record.get("last_name")),
+                        "department": department.lower() if department else None,
+                    },
+                )
+            )
+        return rows
+
+    def get_departments(self, names: set) -> dict:
+        departments = {}
+        for department in Department.objects.filter(
+            organization=self.organization, name__in=names
+        ).order_by("-created_at"):
+            departments[department.name] = department
+        missing = [name for name in names if name not in departments]
+        for department in Department.objects.bulk_create(
+            [Department(name=name, organization=self.organization) for name in missing]
+        ):
+            departments[department.name] = department
+        return departments
 
     def create_records(self):
-        records = self.records
-        organization = self.organization
-        registered_employees = []
-
-        flattened_records = [record["email"] for record in records]
-        registered_employees = Employee.objects.prefetch_related("emp_profile").filter(
-            email__in=flattened_records,
-            # emp_profile__organization=organization
-        )
-        new_employees = []
-        for record in records:
-            employee = registered_employees.filter(email=record["email"])
-            department = None
-            if record.get("department"):
-                department = Department.objects.filter(
-                    name=record.get("department").lower(), organization=organization
-                ).first()
-                if not department:
-                    department = Department.objects.create(
-                        name=record.get("department").lower(), organization=organization
-                    )
-            if employee.exists():
-                employee = employee.first()
-                profile = employee.emp_profile
-                profile.department = department
-                profile.first_name = record["first_name"]
-                profile.last_name = record["last_name"]
-                profile.save()
+        from campaign.services import CampaignAutoEnrollmentManager
+
+        rows = self.clean_records()
+        users = {
+            user.email: user
+            for user in User.objects.select_related("emp_profile").filter(
+                email__in=[row["email"] for _, row in rows]
+            )
+        }
+
+        to_update, to_create = [], []
+        for index, row in rows:
+            user = users.get(row["email"])
+            if user is None:
+                to_create.append(row)
+            elif user.role != Roles.EMPLOYEE or not hasattr(user, "emp_profile"):
+                self.add_error(index, "email", f"{row['email']} is already registered")
+            elif user.emp_profile.organization_id != self.organization.id:
+                self.add_error(
+                    index,
+                    "email",
+                    f"{row['email']} belongs to another organization",
+                )
             else:
-                employee = Employee.objects.create_emp(
-                    email=record["email"],
-                    first_name=record["first_name"],
-                    last_name=record["last_name"],
-                    organization=organization,
-                    department=department,
+                to_update.append((user, row))
+
+        with transaction.atomic():
+            departments = self.get_departments(
+                {row["department"] for _, row in rows if row["department"]}
+            )
+
+            profiles = []
+            for user, row in to_update:
+                profile = user.emp_profile
+                profile.department = departments.get(row["department"])
+                profile.first_name = row["first_name"]
+                profile.last_name = row["last_name"]
+                profiles.append(profile)
+            EmployeeProfile.objects.bulk_update(
+                profiles,
+                ["department", "first_name", "last_name"],
+                batch_size=self.batch_size,
+            )
+
+            new_employees, new_profiles = [], []
+            for row in to_create:
+                employee = Employee(
+                    email=row["email"],
+                    role=Roles.EMPLOYEE,
+                    is_active=True,
+                    is_email_verified=False,
                 )
+                employee.set_unusable_password()
                 new_employees.append(employee)
+                new_profiles.append(
+                    EmployeeProfile(
+                        employee=employee,
+                        organization=self.organization,
+                        department=departments.get(row["department"]),
+                        first_name=row["first_name"],
+                        last_name=row["last_name"],
+                    )
+                )
+            Employee.objects.bulk_create(new_employees, batch_size=self.batch_size)
+            EmployeeProfile.objects.bulk_create(
+                new_profiles, batch_size=self.batch_size
+            )
+
+        # bulk_create skips the EmployeeProfile post_save enrollment, schedule it once
+        CampaignAutoEnrollmentManager.schedule(
+            self.organization.id, [employee.id for employee in new_employees]
+        )
+        OrganizationDashboard.bump(self.organization.id)
         self.new_employees = new_employees
+        self.updated_employees = [user for user, _ in to_update]
+
+
+class ImportJobRunner:
+    """Import the file of an ImportJob in chunks, recording progress as it goes"""
+
+    def __init__(self, import_job: ImportJob, *args, **kwargs):
+        self.import_job = import_job
+        self.chunk_size = settings.IMPORT_JOB_CHUNK_SIZE
+
+    def update(self, **fields):
+        ImportJob.objects.filter(id=self.import_job.id).update(
+            updated_at=timezone.now(), **fields
+        )
+
+    def import_chunk(self, records: list[dict], row_numbers: list[int]):
+        user_import = UserImport(
+            records=records,
+            organization=self.import_job.organization,
+            row_numbers=row_numbers,
+        )
+        user_import.create_records()
+        EmployeeInviteToolbox(user_import.new_employees).send()
+        return user_import
+
+    def handle(self):
+        import_job = self.import_job
+        self.update(status=ImportJobStatus.PROCESSING, started_at=timezone.now())
+        errors, processed_rows = [], 0
+        try:
+            with import_job.file.open("rb") as file:
+                user_file = UserFileImport(file)
+                if not user_file.is_valid():
+                    self.update(status=ImportJobStatus.FAILED, errors=user_file.errors)
+                    return
+                self.update(total_rows=user_file.count_rows())
+                for batch in user_file.numbered_batches(self.chunk_size):
+                    records = [record for _, record in batch]
+                    user_import = self.import_chunk(
+                        records, row_numbers=[row_number for row_number, _ in batch]
+                    )
+                    processed_rows += len(records)
+                    errors += user_import.errors
+                    self.update(
+                        processed_rows=processed_rows,
+                        created_count=F("created_count")
+                        + len(user_import.new_employees),
+                        updated_count=F("updated_count")
+                        + len(user_import.updated_employees),
+                        failed_count=F("failed_count") + len(user_import.errors),
+                        errors=errors,
+                    )
+        except Exception as error:
+            self.update(
+                status=ImportJobStatus.FAILED,
+                errors=errors + [{"row": None, "column": None, "message": str(error)}],
+            )
+            raise
+        self.update(
+            status=ImportJobStatus.COMPLETED,
+            total_rows=processed_rows,
+            completed_at=timezone.now(),
+        )
+        import_job.refresh_from_db()
+
+
+class HTTPDirectory(ABC):
+    """A directory API whose pages are chained by opaque next links. They cannot be
+    requested in parallel, so a single worker fetches the next page while the current
+    one is imported.
+    """
+
+    @abstractmethod
+    def first_url(self, cursor: str | None) -> str:
+        """Url of the first page, of the changes since the cursor when there is one"""
+
+    @abstractmethod
+    def fetch(self, url: str) -> tuple[list[dict], str | None, str | None]:
+        """A page of records, the next page url and the page cursor"""
+
+    def pages(self, cursor: str | None):
+        with ThreadPoolExecutor(max_workers=1) as pool:
+            future = pool.submit(self.fetch, self.first_url(cursor))
+            while future is not None:
+                records, next_url, page_cursor = future.result()
+                future = pool.submit(self.fetch, next_url) if next_url else None
+                yield records, page_cursor
+
+
+class OktaDirectory(HTTPDirectory):
+    """Users of the Okta org, only the ones updated since the cursor when there is one"""
+
+    def __init__(self, domain=None, api_token=None, *args, **kwargs):
+        self.domain = domain or settings.OKTA_DOMAIN
+        self.session = requests.Session()
+        self.session.headers.update(
+            {
+                "Authorization": f"SSWS {api_token or settings.OKTA_API_TOKEN}",
+                "Accept": "application/json",
+            }
+        )
+
+    def first_url(self, cursor: str | None) -> str:
+        params = {"limit": settings.DIRECTORY_SYNC_PAGE_SIZE}
+        if cursor:
+            # ge, users updated in the same millisecond are skipped by their hash
+            params["search"] = f'lastUpdated ge "{cursor}"'
+        return f"{self.domain}/api/v1/users?{urlencode(params)}"
+
+    def fetch(self, url: str) -> tuple[list[dict], str | None, str | None]:
+        response = self.session.get(
+            url, timeout=settings.DIRECTORY_SYNC_REQUEST_TIMEOUT
+        )
+        response.raise_for_status()
+        users = response.json()
+        records = [
+            {
+                "external_id": user["id"],
+                "email": user["profile"].get("email"),
+                "first_name": user["profile"].get("firstName"),
+                "last_name": user["profile"].get("lastName"),
+                "department": user["profile"].get("department"),
+            }
+            for user in users
+        ]
+        cursor = max((user["lastUpdated"] for user in users), default=None)
+        return records, response.links.get("next", {}).get("url"), cursor
+
+    @staticmethod
+    def merge_cursor(cursor: str | None, page_cursor: str | None) -> str | None:
+        return max(filter(None, [cursor, page_cursor]), default=None)
+
+
+class AzureADDirectory(HTTPDirectory):
+    """Users of the Azure AD tenant through Graph delta queries, the delta link is the cursor"""
+
+    select = "id,mail,userPrincipalName,givenName,surname,displayName,department"
+
+    def __init__(self, tenant_id: str | None, *args, **kwargs):
+        self.tenant_id = tenant_id
+        self.session = requests.Session()
+        self.session.headers.update(
+            {"Prefer": f"odata.maxpagesize={settings.DIRECTORY_SYNC_PAGE_SIZE}"}
+        )
+
+    def acquire_token(self) -> str:
+        """App only Graph token of the tenant, through the client credentials flow"""
+        if not self.tenant_id:
+            raise ValueError(
+                "The Azure AD tenant is unknown, sign in with Azure AD again"
+            )
+        app = ConfidentialClientApplication(
+            settings.AZURE_AD["CLIENT_ID"],
+            authority=settings.AZURE_AD["TENANT_AUTHORITY"].format(
+                tenant_id=self.tenant_id
+            ),
+            client_credential=settings.AZURE_AD["CLIENT_SECRET"],
+        )
+        token_response = app.acquire_token_for_client(
+            scopes=settings.AZURE_AD["GRAPH_SCOPE"]
+        )
+        if "access_token" not in token_response:
+            raise ValueError(
+                token_response.get("error_description", "No Azure AD token granted")
+            )
+        return token_response["access_token"]
+
+    def pages(self, cursor: str | None):
+        self.session.headers["Authorization"] = f"Bearer {self.acquire_token()}"
+        yield from super().pages(cursor)
+
+    def first_url(self, cursor: str | None) -> str:
+        return cursor or f"{settings.GRAPH_API_URL}/users/delta?$select={self.select}"
+
+    @staticmethod
+    def to_record(user: dict) -> dict:
+        first_name, last_name = user.get("givenName"), user.get("surname")
+        if not first_name and user.get("displayName"):
+            first_name, _, last_name = user["displayName"].partition(" ")
+        return {
+            "external_id": user["id"],
+            "email": user.get("mail") or user.get("userPrincipalName"),
+            "first_name": first_name,
+            "last_name": last_name,
+            "department": user.get("department"),
+        }
+
+    def fetch(self, url: str) -> tuple[list[dict], str | None, str | None]:
+        response = self.session.get(
+            url, timeout=settings.DIRECTORY_SYNC_REQUEST_TIMEOUT
+        )
+        response.raise_for_status()
+        data = response.json()
+        records = [
+            self.to_record(user)
+            for user in data.get("value", [])
+            if "@removed" not in user
+        ]
+        return records, data.get("@odata.nextLink"), data.get("@odata.deltaLink")
+
+    @staticmethod
+    def merge_cursor(cursor: str | None, page_cursor: str | None) -> str | None:
+        return page_cursor or cursor
+
+
+class LDAPDirectory:
+    """Users of an LDAP or Active Directory server, read with simple paged results so
+    only one page of entries is held at a time
+    """
+
+    attributes = ["mail", "givenName", "sn", "department"]
+
+    def __init__(
+        self,
+        configuration: LDAPConfiguration,
+        password: str,
+        client_strategy=SYNC,
+        *args,
+        **kwargs,
+    ):
+        self.configuration = configuration
+        self.password = password
+        self.client_strategy = client_strategy
+        self.server = Server(
+            configuration.server_address,
+            port=configuration.port,
+            use_ssl=configuration.use_ssl,
+            get_info=NONE,
+            connect_timeout=settings.DIRECTORY_SYNC_REQUEST_TIMEOUT,
+        )
+
+    def connect(self) -> Connection:
+        if self.password is None:
+            raise ValueError("The LDAP bind password expired, start the import again")
+        connection = Connection(
+            self.server,
+            self.configuration.bind_dn,
+            self.password,
+            client_strategy=self.client_strategy,
+            raise_exceptions=True,
+        )
+        connection.bind()
+        return connection
+
+    @staticmethod
+    def value(attributes: dict, name: str):
+        # attributes are lists when the server schema is not read
+        value = attributes.get(name)
+        if isinstance(value, list):
+            return value[0] if value else None
+        return value
+
+    def to_record(self, entry: dict) -> dict:
+        attributes = entry["attributes"]
+        return {
+            "external_id": entry["dn"],
+            "email": self.value(attributes, "mail"),
+            "first_name": self.value(attributes, "givenName"),
+            "last_name": self.value(attributes, "sn"),
+            "department": self.value(attributes, "department"),
+        }
+
+    def pages(self, cursor: str | None):
+        page_size = self.configuration.page_size
+        connection = self.connect()
+        entries = connection.extend.standard.paged_search(
+            self.configuration.search_base,
+            self.configuration.search_filter,
+            SUBTREE,
+            attributes=self.attributes,
+            paged_size=page_size,
+            generator=True,
+        )
+        records = (
+            self.to_record(entry)
+            for entry in entries
+            if entry.get("type") == "searchResEntry"
+        )
+        try:
+            while page := list(islice(records, page_size)):
+                yield page, None
+        finally:
+            connection.unbind()
+
+    @staticmethod
+    def merge_cursor(cursor: str | None, page_cursor: str | None) -> str | None:
+        return None
+
+
+class DirectorySyncCredential:
+    """Secret a sync needs in the worker, the LDAP bind password. It is encrypted with
+    a key derived for this sync only and kept in the cache for a short time, the task
+    only receives the sync id.
+    """
+
+    @staticmethod
+    def key(directory_sync_id) -> str:
+        return f"directory-sync:credential:{directory_sync_id}"
+
+    @staticmethod
+    def fernet(directory_sync_id, salt: bytes) -> Fernet:
+        key = HKDF(
+            algorithm=hashes.SHA256(),
+            length=32,
+            salt=salt,
+            info=f"directory-sync:{directory_sync_id}".encode(),
+        ).derive(settings.SECRET_KEY.encode())
+        return Fernet(base64.urlsafe_b64encode(key))
+
+    @classmethod
+    def store(cls, directory_sync_id, secret: str):
+        salt = os.urandom(16)
+        token = cls.fernet(directory_sync_id, salt).encrypt(secret.encode())
+        cache.set(
+            cls.key(directory_sync_id),
+            (salt, token),
+            settings.DIRECTORY_SYNC_CREDENTIAL_TIMEOUT,
+        )
+
+    @classmethod
+    def pop(cls, directory_sync_id) -> str | None:
+        """The secret, once. None when it expired or was already used"""
+        stored = cache.get(cls.key(directory_sync_id))
+        if stored is None:
+            return None
+        cache.delete(cls.key(directory_sync_id))
+        salt, token = stored
+        try:
+            secret = cls.fernet(directory_sync_id, salt).decrypt(
+                token, ttl=settings.DIRECTORY_SYNC_CREDENTIAL_TIMEOUT
+            )
+        except InvalidToken:
+            return None
+        return secret.decode()
+
+
+class DirectorySyncInProgress(APIException):
+    status_code = status.HTTP_409_CONFLICT
+    default_detail = (
+        "The directory is already being synced, try again once it completes"
+    )
+    default_code = "directory_sync_in_progress"
+
+
+class DirectorySyncManager:
+    """Import the users of a directory that changed since the last sync through UserImport"""
+
+    def __init__(self, directory_sync: DirectorySync, directory, *args, **kwargs):
+        self.directory_sync = directory_sync
+        self.directory = directory
+
+    @classmethod
+    def for_sync(cls, directory_sync: DirectorySync):
+        match directory_sync.provider:
+            case DirectoryProvider.OKTA:
+                directory = OktaDirectory()
+            case DirectoryProvider.AZURE_AD:
+                directory = AzureADDirectory(directory_sync.tenant_id)
+            case DirectoryProvider.LDAP:
+                directory = LDAPDirectory(
+                    directory_sync.organization.ldap_configuration,
+                    DirectorySyncCredential.pop(directory_sync.id),
+                )
+            case _:
+                raise ValueError(
+                    f"Unknown directory provider {directory_sync.provider!r}"
+                )
+        return cls(directory_sync, directory)
+
+    @classmethod
+    def schedule(cls, organization_id, provider: str, credential: str = None, **fields):
+        """Sync the directory in the background once the current transaction commits,
+        fields such as the Azure AD tenant are saved on the sync first. The credential
+        is handed to the worker through DirectorySyncCredential, never as a task argument.
+        A running sync raises DirectorySyncInProgress, unless it made no progress within
+        the lease and its worker is taken for dead.
+        """
+        from .tasks import sync_directory_task
+
+        directory_sync, _ = DirectorySync.objects.get_or_create(
+            organization_id=organization_id, provider=provider
+        )
+        lease_start = timezone.now() - timedelta(
+            seconds=settings.DIRECTORY_SYNC_LEASE_SECONDS
+        )
+        if (
+            directory_sync.status == ImportJobStatus.PROCESSING
+            and directory_sync.updated_at > lease_start
+        ):
+            raise DirectorySyncInProgress()
+        directory_sync.status = ImportJobStatus.PENDING
+        for name, value in fields.items():
+            setattr(directory_sync, name, value)
+        directory_sync.save(update_fields=["status", "updated_at", *fields])
+        if credential is not None:
+            DirectorySyncCredential.store(directory_sync.id, credential)
+        transaction.on_commit(lambda: sync_directory_task.delay(str(directory_sync.id)))
+        return directory_sync
+
+    @staticmethod
+    def content_hash(record: dict) -> str:
+        return hashlib.sha256(
+            json.dumps(record, sort_keys=True, default=str).encode()
+        ).hexdigest()
+
+    def update(self, **fields):
+        DirectorySync.objects.filter(id=self.directory_sync.id).update(
+            updated_at=timezone.now(), **fields
+        )
+
+    def apply(self, records: list[dict]) -> list[dict]:
+        """Import the changed records, returns their errors"""
+        hashes = {
+            record["external_id"]: self.content_hash(record) for record in records
+        }
+        imported_hashes = dict(
+            DirectoryEntry.objects.filter(
+                directory_sync=self.directory_sync, external_id__in=hashes
+            ).values_list("external_id", "content_hash")
+        )
+        changed = [
+            record
+            for record in records
+            if imported_hashes.get(record["external_id"])
+            != hashes[record["external_id"]]
+        ]
+        if not changed:
+            self.update(fetched_count=F("fetched_count") + len(records))
+            return []
+
+        user_import = UserImport(
+            records=changed, organization=self.directory_sync.organization, first_row=0
+        )
+        user_import.create_records()
+        EmployeeInviteToolbox(user_import.new_employees).send()
+
+        errors = [
+            {
+                "external_id": changed[error["row"]]["external_id"],
+                "message": error["message"],
+            }
+            for error in user_import.errors
+        ]
+        failed_ids = {error["external_id"] for error in errors}
+        DirectoryEntry.objects.bulk_create(
+            [
+                DirectoryEntry(
+                    directory_sync=self.directory_sync,
+                    external_id=record["external_id"],
+                    content_hash=hashes[record["external_id"]],
+                )
+                for record in changed
+                if record["external_id"] not in failed_ids
+            ],
+            update_conflicts=True,
+            unique_fields=["directory_sync", "external_id"],
+            update_fields=["content_hash", "updated_at"],
+        )
+        self.update(
+            fetched_count=F("fetched_count") + len(records),
+            changed_count=F("changed_count") + len(changed),
+            created_count=F("created_count") + len(user_import.new_employees),
+            failed_count=F("failed_count") + len(errors),
+        )
+        return errors
+
+    def handle(self):
+        directory_sync = self.directory_sync
+        self.update(
+            status=ImportJobStatus.PROCESSING,
+            started_at=timezone.now(),
+            completed_at=None,
+            fetched_count=0,
+            changed_count=0,
+            created_count=0,
+            failed_count=0,
+            errors=[],
+        )
+        cursor, errors = directory_sync.cursor, []
+        try:
+            for records, page_cursor in self.directory.pages(directory_sync.cursor):
+                errors += self.apply(records)
+                cursor = self.directory.merge_cursor(cursor, page_cursor)
+        except Exception as error:
+            self.update(
+                status=ImportJobStatus.FAILED,
+                errors=errors + [{"external_id": None, "message": str(error)}],
+            )
+            raise
+        self.update(
+            status=ImportJobStatus.COMPLETED,
+            cursor=cursor,
+            errors=errors,
+            completed_at=timezone.now(),
+        )
+        directory_sync.refresh_from_db()
+
+
+class OrganizationDashboard:
+    """Serialized organization dashboard cached per organization. Writes bump the
+    organization's version, a stale dashboard is still served while a background
+    task recomputes it so only a cold cache waits for the queries.
+    """
+
+    @staticmethod
+    def key(organization_id) -> str:
+        return f"organization-dashboard:{organization_id}"
+
+    @staticmethod
+    def version_key(organization_id) -> str:
+        return f"organization-dashboard:version:{organization_id}"
+
+    @staticmethod
+    def refreshing_key(organization_id) -> str:
+        return f"organization-dashboard:refreshing:{organization_id}"
+
+    @classmethod
+    def version(cls, organization_id) -> int:
+        # seeded from the clock so an evicted counter never reuses an old version
+        cache.add(cls.version_key(organization_id), time.time_ns(), None)
+        return cache.get(cls.version_key(organization_id))
+
+    @classmethod
+    def bump(cls, organization_id):
+        if not organization_id:
+            return
+        try:
+            cache.incr(cls.version_key(organization_id))
+        except ValueError:
+            cache.set(cls.version_key(organization_id), time.time_ns(), None)
+
+    @staticmethod
+    def compute(organization: Organization) -> dict:
+        from users.arch.managers import OrganizationDashboardManager
+
+        return OrganizationDashboardManager(organization).data
+
+    @classmethod
+    def refresh(cls, organization: Organization) -> dict:
+        # read before computing, a write during the computation leaves the entry stale
+        version = cls.version(organization.id)
+        data = cls.compute(organization)
+        cache.set(
+            cls.key(organization.id),
+            {"version": version, "computed_at": time.time(), "data": data},
+            settings.ORGANIZATION_DASHBOARD_CACHE_TIMEOUT,
+        )
+        cache.delete(cls.refreshing_key(organization.id))
+        return data
+
+    @classmethod
+    def schedule_refresh(cls, organization_id):
+        """Queue one background refresh per organization at a time"""
+        from .tasks import refresh_organization_dashboard
+
+        if cache.add(
+            cls.refreshing_key(organization_id),
+            1,
+            settings.ORGANIZATION_DASHBOARD_REFRESH_TIMEOUT,
+        ):
+            refresh_organization_dashboard.delay(str(organization_id))
+
+    @classmethod
+    def get(cls, organization: Organization) -> dict:
+        if not settings.ORGANIZATION_DASHBOARD_CACHE_TIMEOUT:
+            return cls.compute(organization)
+        entry = cache.get(cls.key(organization.id))
+        if entry is None:
+            return cls.refresh(organization)
+        # the charts are relative to today, refresh old entries even without writes
+        if (
+            entry["version"] != cls.version(organization.id)
+            or time.time() - entry["computed_at"]
+            > settings.ORGANIZATION_DASHBOARD_MAX_AGE
+        ):
+            cls.schedule_refresh(organization.id)
+        return entry["data"]
+
+    @classmethod
+    def warm(cls, organization_ids=None):
+        """Recompute the dashboards of the given organizations, all by default"""
+        if not settings.ORGANIZATION_DASHBOARD_CACHE_TIMEOUT:
+            return
+        organizations = Organization.objects.filter(
+            org_profile__isnull=False
+        ).select_related("org_profile")
+        if organization_ids is not None:
+            organizations = organizations.filter(id__in=organization_ids)
+        for organization in organizations.iterator():
+            cls.refresh(organization)
+
+
+class TimeSeriesSnapshot:
+    """Nightly security score and completed courses snapshot of one organization.
+    Profiles are read in chunks and the completed courses of a chunk are counted
+    in one grouped query, so the memory and the query count are bounded by the
+    chunk size and organizations can be snapshotted by parallel workers. The
+    organization's own points are its security score and its employees' total
+    completed courses.
+    """
+
+    chunk_size = 2000
+
+    def __init__(self, organization_id):
+        self.organization_id = organization_id
+        self.security_scores_count = 0
+        self.completed_courses_count = 0
+        self.departments_count = 0
+        self.employees_completed_courses = 0
+
+    def completed_courses(self, user_ids: list) -> dict:
+        return dict(
+            UserCourse.objects.filter(user_id__in=user_ids, is_completed=True)
+            .values("user_id")
+            .annotate(count=Count("id"))
+            .values_list("user_id", "count")
+        )
+
+    def store_chunk(self, scores: list[tuple]) -> int:
+        """Store the snapshots of (user id, security score) pairs, returns their
+        completed courses
+        """
+        completed_courses = self.completed_courses([user_id for user_id, _ in scores])
+        # a user without a score yet has nothing to plot
+        security_scores = UserTimeSeriesSecurityScore.objects.bulk_create(
+            [
+                UserTimeSeriesSecurityScore(user_id=user_id, security_score=score)
+                for user_id, score in scores
+                if score is not None
+            ]
+        )
+        courses_completed = UserTimeSeriesCompletedCourses.objects.bulk_create(
+            [
+                UserTimeSeriesCompletedCourses(
+                    user_id=user_id,
+                    courses_completed=completed_courses.get(user_id, 0),
+                )
+                for user_id, _ in scores
+            ]
+        )
+        self.security_scores_count += len(security_scores)
+        self.completed_courses_count += len(courses_completed)
+        return sum(completed_courses.values())
+
+    def profiles(self):
+        """(employee id, security score) of the organization's employees"""
+        return (
+            EmployeeProfile.objects.filter(organization_id=self.organization_id)
+            .order_by()
+            .values_list("employee_id", "security_score")
+            .iterator(chunk_size=self.chunk_size)
+        )
+
+    def store_organization(self):
+        score = (
+            OrganizationProfile.objects.filter(organization_id=self.organization_id)
+            .values_list("security_score", flat=True)
+            .first()
+        )
+        if score is not None:
+            UserTimeSeriesSecurityScore.objects.create(
+                user_id=self.organization_id, security_score=score
+            )
+            self.security_scores_count += 1
+        UserTimeSeriesCompletedCourses.objects.create(
+            user_id=self.organization_id,
+            courses_completed=self.employees_completed_courses,
+        )
+        self.completed_courses_count += 1
+
+    def store_departments(self):
+        departments = DepartmentTimeSeriesSecurityScore.objects.bulk_create(
+            [
+                DepartmentTimeSeriesSecurityScore(
+                    department_id=department_id, security_score=score
+                )
+                for department_id, score in Department.objects.filter(
+                    organization_id=self.organization_id,
+                    security_score__isnull=False,
+                ).values_list("id", "security_score")
+            ]
+        )
+        self.departments_count = len(departments)
+
+    def handle(self) -> dict:
+        profiles = self.profiles()
+        while chunk := list(islice(profiles, self.chunk_size)):
+            with transaction.atomic():
+                self.employees_completed_courses += self.store_chunk(chunk)
+        self.store_organization()
+        self.store_departments()
+        return {
+            "security_scores": self.security_scores_count,
+            "completed_courses": self.completed_courses_count,
+            "departments": self.departments_count,
+        }
+
+
+class TimeSeries:
+    """Security score or completed courses series of a user, an organization or a
+    department. Daily points are rolled up per week, then per month, as they age.
+    A query reads the daily points and the rollups overlapping the range, two
+    queries whatever its length, and buckets them at the requested resolution.
+    """
+
+    sources = {
+        (TimeSeriesKind.SECURITY_SCORE, "user_id"): (
+            UserTimeSeriesSecurityScore,
+            "security_score",
+        ),
+        (TimeSeriesKind.COMPLETED_COURSES, "user_id"): (
+            UserTimeSeriesCompletedCourses,
+            "courses_completed",
+        ),
+        (TimeSeriesKind.SECURITY_SCORE, "department_id"): (
+            DepartmentTimeSeriesSecurityScore,
+            "security_score",
+        ),
+    }
+    truncs = {
+        TimeSeriesResolution.DAY: TruncDay,
+        TimeSeriesResolution.WEEK: TruncWeek,
+        TimeSeriesResolution.MONTH: TruncMonth,
+    }
+    rollup_chunk_size = 2000
+
+    def __init__(self, series: str, user_id=None, department_id=None):
+        self.series = series
+        self.owner_field = "department_id" if department_id else "user_id"
+        self.owner_id = department_id or user_id
+        if (series, self.owner_field) not in self.sources:
+            raise ValueError(f"Departments have no {series} series")
+        self.model, self.field = self.sources[(series, self.owner_field)]
+
+    @staticmethod
+    def pick_resolution(start: date, end: date) -> str:
+        days = (end - start).days
+        if days <= 92:
+            return TimeSeriesResolution.DAY
+        if days <= 2 * 366:
+            return TimeSeriesResolution.WEEK
+        return TimeSeriesResolution.MONTH
+
+    @staticmethod
+    def bucket_start(day: date, resolution: str) -> date:
+        match resolution:
+            case TimeSeriesResolution.WEEK:
+                return day - timedelta(days=day.weekday())
+            case TimeSeriesResolution.MONTH:
+                return day.replace(day=1)
+        return day
+
+    @staticmethod
+    def start_of(day: date) -> datetime:
+        return datetime.combine(day, day_time.min, timezone.get_current_timezone())
+
+    def value(self, total, points, highest):
+        # completed courses only grow, a period is worth its last count
+        if self.series == TimeSeriesKind.COMPLETED_COURSES:
+            return highest
+        return total / points
+
+    def points(self, start: date, end: date, resolution: str = None) -> list[dict]:
+        resolution = resolution or self.pick_resolution(start, end)
+        start = self.bucket_start(start, resolution)
+        buckets = {}
+
+        def add(bucket, total, points, highest):
+            current = buckets.get(bucket, (0, 0, highest))
+            buckets[bucket] = (
+                current[0] + total,
+                current[1] + points,
+                max(current[2], highest),
+            )
+
+        daily_points = (
+            self.model.objects.filter(
+                **{self.owner_field: self.owner_id},
+                created_at__gte=self.start_of(start),
+                created_at__lt=self.start_of(end + timedelta(days=1)),
+            )
+            .annotate(bucket=self.truncs[resolution]("created_at"))
+            .order_by()
+            .values("bucket")
+            .annotate(
+                total=Sum(self.field), points=Count("id"), highest=Max(self.field)
+            )
+        )
+        for row in daily_points:
+            add(row["bucket"].date(), row["total"], row["points"], row["highest"])
+
+        # periods are aligned to their resolution, one that ends after start
+        # began on or after start's bucket at that resolution
+        overlapping = Q()
+        for rollup_resolution in self.truncs:
+            overlapping |= Q(
+                resolution=rollup_resolution,
+                period_start__gte=self.bucket_start(start, rollup_resolution),
+            )
+        rollups = TimeSeriesRollup.objects.filter(
+            overlapping,
+            **{self.owner_field: self.owner_id},
+            series=self.series,
+            period_start__lte=end,
+        ).values_list("resolution", "period_start", "value", "points")
+        order = list(self.truncs)
+        for rollup_resolution, period_start, value, points in rollups:
+            # a rollup coarser than the resolution is kept as a single point,
+            # at the start of the range when it began before it
+            bucket = max(period_start, start)
+            if order.index(rollup_resolution) <= order.index(resolution):
+                bucket = self.bucket_start(period_start, resolution)
+            add(bucket, value * points, points, value)
+
+        return [
+            {"date": bucket, "value": self.value(*buckets[bucket])}
+            for bucket in sorted(buckets)
+        ]
+
+    @classmethod
+    def owners(cls, organization_id, owner_field: str) -> Q:
+        if owner_field == "department_id":
+            return Q(department__organization_id=organization_id)
+        return Q(user_id=organization_id) | Q(
+            user__emp_profile__organization_id=organization_id
+        )
+
+    @classmethod
+    def store_rollups(cls, rows, series, resolution, owner_field) -> int:
+        rows, stored = iter(rows), 0
+        while chunk := list(islice(rows, cls.rollup_chunk_size)):
+            stored += len(
+                TimeSeriesRollup.objects.bulk_create(
+                    [
+                        TimeSeriesRollup(
+                            series=series,
+                            resolution=resolution,
+                            period_start=row["period"],
+                            value=(
+                                row["highest"]
+                                if series == TimeSeriesKind.COMPLETED_COURSES
+                                else row["total"] / row["points"]
+                            ),
+                            points=row["points"],
+                            **{owner_field: row[owner_field]},
+                        )
+                        for row in chunk
+                    ]
+                )
+            )
+        return stored
+
+    @classmethod
+    def roll_up(cls, organization_id, today: date = None) -> dict:
+        """Roll the organization's daily points older than the daily retention up
+        per week, and its weekly rollups older than the weekly retention up per
+        month. Only whole periods are rolled up.
+        """
+        today = today or timezone.localdate()
+        week_cutoff = cls.bucket_start(
+            today - timedelta(days=settings.TIME_SERIES_DAILY_RETENTION_DAYS),
+            TimeSeriesResolution.WEEK,
+        )
+        month_cutoff = cls.bucket_start(
+            today - timedelta(days=settings.TIME_SERIES_WEEKLY_RETENTION_DAYS),
+            TimeSeriesResolution.MONTH,
+        )
+        weeks = months = 0
+        for (series, owner_field), (model, field) in cls.sources.items():
+            owners = cls.owners(organization_id, owner_field)
+            with transaction.atomic():
+                daily_points = model.objects.filter(
+                    owners, created_at__lt=cls.start_of(week_cutoff)
+                )
+                weeks += cls.store_rollups(
+                    daily_points.annotate(
+                        period=TruncWeek("created_at", output_field=DateField())
+                    )
+                    .order_by()
+                    .values(owner_field, "period")
+                    .annotate(total=Sum(field), points=Count("id"), highest=Max(field))
+                    .iterator(),
+                    series,
+                    TimeSeriesResolution.WEEK,
+                    owner_field,
+                )
+                daily_points.delete()
+
+                weekly_rollups = TimeSeriesRollup.objects.filter(
+                    owners,
+                    series=series,
+                    resolution=TimeSeriesResolution.WEEK,
+                    period_start__lt=month_cutoff,
+                )
+                months += cls.store_rollups(
+                    weekly_rollups.annotate(period=TruncMonth("period_start"))
+                    .order_by()
+                    .values(owner_field, "period")
+                    .annotate(
+                        total=Sum(F("value") * F("points")),
+                        points=Sum("points"),
+                        highest=Max("value"),
+                    )
+                    .iterator(),
+                    series,
+                    TimeSeriesResolution.MONTH,
+                    owner_field,
+                )
+                weekly_rollups.delete()
+        return {"weeks": weeks, "months": months}
@@ -1,12 +1,19 @@
-from django.db.models.signals import post_save, pre_save
+from django.db.models.signals import post_delete, post_save, pre_save
 from django.dispatch import receiver
 from django_mailbox.models import Message
 from django_mailbox.signals import message_received
 
-from campaign.enums import CampaignStatus, CampaignTypes
-from users.enums import ActivityType
+from campaign.models import Campaign
 
-from .models import ActivityLog, Employee, EmployeeProfile, User
+from .models import (
+    ActivityLog,
+    Department,
+    Employee,
+    EmployeeProfile,
+    OrganizationProfile,
+    User,
+)
+from .services import OrganizationDashboard
 
 
 @receiver(post_save, sender=EmployeeProfile)
@@ -14,21 +21,11 @@ def automatically_add_employees_to_campaigns(
     sender, instance: EmployeeProfile = None, created=False, **kwargs
 ) -> None:
     if created:
-        employee_profile = instance
-        organization = employee_profile.organization
-        campaigns = organization.org_campaigns.exclude(
-            type=CampaignTypes.PHISHING,
-            status__in=[CampaignStatus.ACTIVE, CampaignStatus.SCHEDULED],
+        from campaign.services import CampaignAutoEnrollmentManager
+
+        CampaignAutoEnrollmentManager.schedule(
+            instance.organization_id, [instance.employee_id]
         )
-        for campaign in campaigns:
-            course_campaign = campaign.course_campaign
-            if campaign.automatically_enroll_employees:
-                course_campaign.employees.add(employee_profile.employee)
-                employee_course_campaign = course_campaign.employee_records.get(
-                    employee=employee_profile.employee
-                )
-                employee_course_campaign.notify_employee_campaign_enrolled()
-                employee_course_campaign.notify_employee_campaign_started()
 
 
 @receiver(post_save, sender=User)
@@ -44,28 +41,15 @@ def convert_to_superuser(
 
 
 @receiver(post_save, sender=ActivityLog)
-def add_description_to_activity_log(
-    sender, instance: ActivityLog = None, created=False, **kwargs
-) -> None:
-    if created:
-        match instance.type:
-            case ActivityType.COURSE_CAMPAIGN_STARTED:
-                instance.description = (
-                    f"{instance.employee.first_name} started a course campaign"
-                )
-            case ActivityType.COURSE_CAMPAIGN_COMPLETED:
-                instance.description = (
-                    f"{instance.employee.first_name} completed a course campaign"
-                )
-            case ActivityType.COURSE_STARTED:
-                instance.description = (
-                    f"{instance.employee.first_name} started a course"
-                )
-            case ActivityType.COURSE_COMPLETED:
-                instance.description = (
-                    f"{instance.employee.first_name} completed a course"
-                )
-        instance.save()
+@receiver(post_save, sender=Campaign)
+@receiver(post_delete, sender=Campaign)
+@receiver(post_save, sender=Department)
+@receiver(post_delete, sender=Department)
+@receiver(post_save, sender=EmployeeProfile)
+@receiver(post_delete, sender=EmployeeProfile)
+@receiver(post_save, sender=OrganizationProfile)
+def invalidate_organization_dashboard(sender, instance=None, **kwargs) -> None:
+    OrganizationDashboard.bump(instance.organization_id)
 
 
 @receiver(message_received)
@@ -1,33 +1,31 @@
 from celery import shared_task
-from django.contrib.auth import get_user_model
 from django.db import models
 
-from Castellum.enums import Roles
-from users.services import UserImport
-
-from .models import (
-    Department,
-    DepartmentTimeSeriesSecurityScore,
-    Employee,
-    Organization,
-    UserCourse,
-    UserTimeSeriesCompletedCourses,
-    UserTimeSeriesSecurityScore,
+from users.services import (
+    DirectorySyncManager,
+    ImportJobRunner,
+    OrganizationDashboard,
+    TimeSeries,
+    TimeSeriesSnapshot,
 )
 
-User = get_user_model()
+from .models import DirectorySync, Employee, ImportJob, Organization
 
 
-@shared_task(name="Create Employee Records on import")
-def create_employee_records(records: list[str], org_id: str):
-    org = Organization.objects.get(id=org_id)
-    user_import = UserImport(organization=org, records=records)
-    user_import.create_records()
+@shared_task(name="Process employee import job")
+def process_import_job(import_job_id: str):
+    import_job = ImportJob.objects.filter(id=import_job_id).first()
+    if not import_job:
+        return
+    ImportJobRunner(import_job).handle()
 
-    for employee in user_import.new_employees:
-        employee.receive_email("employee-invite")
 
-    return user_import.new_employees
+@shared_task(name="Sync organization directory")
+def sync_directory_task(directory_sync_id: str):
+    directory_sync = DirectorySync.objects.filter(id=directory_sync_id).first()
+    if not directory_sync:
+        return
+    DirectorySyncManager.for_sync(directory_sync).handle()
 
 
 @shared_task(name="Update Employee Phishing Score")
@@ -63,39 +61,26 @@ def update_employee_security_score(employee_id: str):
 
 @shared_task(name="Store security scores and courses completed at the end of the day")
 def store_security_scores_and_courses_completed():
-    users = User.objects.all()
-    departments = Department.objects.all()
-    users_security_score_timeseries = []
-    users_courses_completed_timeseries = []
-    departments_timeseries = []
-    for user in users:
-        if user.role == Roles.ORGANIZATION:
-            profile = user.org_profile
-        elif user.role == Roles.EMPLOYEE:
-            profile = user.emp_profile
-        else:
-            continue
-        users_security_score_timeseries.append(
-            UserTimeSeriesSecurityScore(
-                user=user, security_score=profile.security_score
-            )
-        )
-        users_courses_completed_timeseries.append(
-            UserTimeSeriesCompletedCourses(
-                user=user,
-                courses_completed=UserCourse.objects.filter(
-                    user=user, is_completed=True
-                ).count(),
-            )
-        )
-    for department in departments:
-        departments_timeseries.append(
-            DepartmentTimeSeriesSecurityScore(
-                department=department, security_score=department.security_score
-            )
-        )
-    UserTimeSeriesSecurityScore.objects.bulk_create(users_security_score_timeseries)
-    UserTimeSeriesCompletedCourses.objects.bulk_create(
-        users_courses_completed_timeseries
+    # one task per organization so the snapshots run in parallel workers
+    for organization_id in Organization.objects.values_list("id", flat=True).iterator():
+        store_organization_time_series.delay(str(organization_id))
+
+
+@shared_task(name="Store organization time series")
+def store_organization_time_series(organization_id: str) -> dict:
+    stored = TimeSeriesSnapshot(organization_id).handle()
+    stored.update(TimeSeries.roll_up(organization_id))
+    OrganizationDashboard.warm([organization_id])
+    return stored
+
+
+@shared_task(name="Refresh organization dashboard")
+def refresh_organization_dashboard(organization_id: str):
+    organization = (
+        Organization.objects.select_related("org_profile")
+        .filter(id=organization_id)
+        .first()
     )
-    DepartmentTimeSeriesSecurityScore.objects.bulk_create(departments_timeseries)
+    if not organization:
+        return
+    OrganizationDashboard.refresh(organization)
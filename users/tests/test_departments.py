@@ -7,7 +7,7 @@ from abstract.base_test import BaseTestCase
 from abstract.tasks import send_email
 from Castellum.enums import Roles
 from users.enums import EmployeeStatuses
-from users.models import Department, User
+from users.models import Department, Employee, User
 
 SIGNUP_1 = "/api/users/register/"
 SIGNUP_2 = "/api/users/register-2/"
@@ -108,3 +108,38 @@ class TestUser(BaseTestCase):
         response = self.client.post(DELETE_DEPARTMENTS, data=data)
         self.assert_bad(response)
         self.assertEqual(Department.objects.count(), 1)
+
+    def test_departments_security_stats_in_one_query(self):
+        sales = Department.objects.create(name="sales", organization=self.organization)
+        for index, score in enumerate([10, 29.5, 50, 69.5, 80, None]):
+            Employee.objects.create_emp(
+                email=f"employee{index}@example.com",
+                organization=self.organization,
+                department=sales,
+                security_score=score,
+            )
+
+        with self.assertNumQueries(1):
+            stats = {
+                department["name"]: department
+                for department in self.organization.departments_security_stats
+            }
+
+        self.assertEqual(
+            stats["sales"]["employees_data"],
+            {"count": 6, "high_risk": 2, "medium_risk": 2, "low_risk": 1},
+        )
+        self.assertEqual(stats[self.department.name]["employees_data"]["count"], 1)
+
+    def test_get_department_security_stats_response(self):
+        self.employee.emp_profile.security_score = 85
+        self.employee.emp_profile.save()
+        self.client.force_authenticate(self.organization)
+
+        response = self.client.get(DEPARTMENT)
+
+        self.assert_ok(response)
+        self.assertEqual(
+            response.data["results"][0]["employees_data"],
+            {"count": 1, "high_risk": 0, "medium_risk": 0, "low_risk": 1},
+        )
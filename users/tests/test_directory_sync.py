@@ -0,0 +1,453 @@
+import json
+import threading
+from datetime import timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest.mock import patch
+from urllib.parse import parse_qs, urlparse
+
+from django.core.cache import cache
+from django.test import override_settings
+from django.utils import timezone
+from ldap3 import MOCK_SYNC, Connection
+from ldap3.core.exceptions import LDAPException
+
+from abstract.base_test import BaseTestCase
+from abstract.tasks import drain_email_outbox, expire_user_tokens
+from users.enums import DirectoryProvider, ImportJobStatus
+from users.models import DirectoryEntry, DirectorySync, Employee, LDAPConfiguration
+from users.services import (
+    AzureADDirectory,
+    DirectorySyncCredential,
+    DirectorySyncManager,
+    LDAPDirectory,
+)
+from users.tasks import sync_directory_task
+
+IMPORT_OKTA_USERS = "/api/users/import-okta-users/"
+OKTA_SYNC_STATUS = "/api/users/import-okta-users/status/"
+AZURE_AD_CALLBACK = "/api/users/azure-ad-callback/"
+IMPORT_AD_USERS = "/api/users/import-ad-users/"
+LDAP_CONFIGURATION = "/api/users/ldap-configuration/"
+
+
+class DirectoryHandler(BaseHTTPRequestHandler):
+    """Serves the pages registered on the server by path and query"""
+
+    def do_GET(self):
+        self.server.requests.append(self.path)
+        url = urlparse(self.path)
+        page = self.server.pages.get(url.path, {})
+        page = page.get(parse_qs(url.query).get("after", [None])[0], page.get(None))
+        body, headers = page
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        for name, value in headers.items():
+            self.send_header(name, value.format(base=self.server.base_url))
+        self.end_headers()
+        self.wfile.write(
+            json.dumps(body).replace("{base}", self.server.base_url).encode()
+        )
+
+    def log_message(self, *args):
+        pass
+
+
+class DirectoryServer:
+    def __init__(self, pages: dict):
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), DirectoryHandler)
+        self.server.pages = pages
+        self.server.requests = []
+        self.server.base_url = f"http://127.0.0.1:{self.server.server_port}"
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+
+    @property
+    def base_url(self):
+        return self.server.base_url
+
+    @property
+    def requests(self):
+        return self.server.requests
+
+    def __enter__(self):
+        self.thread.start()
+        return self
+
+    def __exit__(self, *args):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+def okta_user(id, email, first_name, department="Engineering", updated="2024-01-01"):
+    return {
+        "id": id,
+        "lastUpdated": f"{updated}T00:00:00.000Z",
+        "profile": {
+            "email": email,
+            "firstName": first_name,
+            "lastName": "Okta",
+            "department": department,
+        },
+    }
+
+
+@override_settings(DIRECTORY_SYNC_PAGE_SIZE=2)
+class TestDirectorySync(BaseTestCase):
+    def sync(self, directory_sync):
+        with patch.object(expire_user_tokens, "apply_async"), patch.object(
+            drain_email_outbox, "delay"
+        ):
+            sync_directory_task(str(directory_sync.id))
+        directory_sync.refresh_from_db()
+
+    def test_post_schedules_an_okta_sync(self):
+        self.client.force_authenticate(self.organization)
+        with patch.object(
+            sync_directory_task, "delay"
+        ) as delay, self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(IMPORT_OKTA_USERS)
+
+        self.assertEqual(response.status_code, 202)
+        directory_sync = DirectorySync.objects.get(
+            organization_id=self.organization.id, provider=DirectoryProvider.OKTA
+        )
+        self.assertEqual(directory_sync.status, ImportJobStatus.PENDING)
+        delay.assert_called_once_with(str(directory_sync.id))
+
+        response = self.client.get(OKTA_SYNC_STATUS)
+        self.assert_ok(response)
+        self.assertEqual(response.data["data"]["id"], str(directory_sync.id))
+
+    def test_post_conflicts_with_a_running_sync(self):
+        directory_sync = DirectorySync.objects.create(
+            organization_id=self.organization.id,
+            provider=DirectoryProvider.OKTA,
+            status=ImportJobStatus.PROCESSING,
+            updated_at=timezone.now(),
+        )
+        self.client.force_authenticate(self.organization)
+
+        with patch.object(
+            sync_directory_task, "delay"
+        ) as delay, self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(IMPORT_OKTA_USERS)
+
+        self.assertEqual(response.status_code, 409)
+        delay.assert_not_called()
+        directory_sync.refresh_from_db()
+        self.assertEqual(directory_sync.status, ImportJobStatus.PROCESSING)
+
+    def test_post_takes_over_a_stale_sync(self):
+        directory_sync = DirectorySync.objects.create(
+            organization_id=self.organization.id,
+            provider=DirectoryProvider.OKTA,
+            status=ImportJobStatus.PROCESSING,
+        )
+        DirectorySync.objects.filter(id=directory_sync.id).update(
+            updated_at=timezone.now() - timedelta(hours=2)
+        )
+        self.client.force_authenticate(self.organization)
+
+        with patch.object(
+            sync_directory_task, "delay"
+        ) as delay, self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(IMPORT_OKTA_USERS)
+
+        self.assertEqual(response.status_code, 202)
+        delay.assert_called_once_with(str(directory_sync.id))
+        directory_sync.refresh_from_db()
+        self.assertEqual(directory_sync.status, ImportJobStatus.PENDING)
+
+    def test_get_previews_the_first_page_of_okta_users(self):
+        pages = {
+            "/api/v1/users": {
+                None: (
+                    [okta_user("1", "ada@example.com", "Ada")],
+                    {"Link": '<{base}/api/v1/users?after=1>; rel="next"'},
+                ),
+                "1": ([okta_user("2", "grace@example.com", "Grace")], {}),
+            }
+        }
+        self.client.force_authenticate(self.organization)
+
+        with DirectoryServer(pages) as server, override_settings(
+            OKTA_DOMAIN=server.base_url
+        ):
+            response = self.client.get(IMPORT_OKTA_USERS)
+
+        self.assert_ok(response)
+        self.assertEqual(
+            response.data,
+            [{"email": "ada@example.com", "first_name": "Ada", "last_name": "Okta"}],
+        )
+        self.assertEqual(len(server.requests), 1)
+        self.assertFalse(DirectorySync.objects.exists())
+
+    def test_unknown_provider_is_rejected(self):
+        directory_sync = DirectorySync.objects.create(
+            organization_id=self.organization.id, provider="unknown"
+        )
+
+        with self.assertRaises(ValueError):
+            DirectorySyncManager.for_sync(directory_sync)
+
+    @patch("users.views.requests.get")
+    @patch("users.views.ConfidentialClientApplication")
+    def test_azure_ad_callback_queues_the_tenant_not_the_token(self, app, get):
+        app.return_value.acquire_token_by_authorization_code.return_value = {
+            "access_token": "user-token",
+            "id_token_claims": {"tid": "tenant"},
+        }
+        get.return_value.json.return_value = {"jobTitle": "Organization Admin"}
+        self.client.force_authenticate(self.organization)
+
+        with patch.object(
+            sync_directory_task, "delay"
+        ) as delay, self.captureOnCommitCallbacks(execute=True):
+            self.assert_ok(self.client.get(AZURE_AD_CALLBACK, {"code": "code"}))
+
+        directory_sync = DirectorySync.objects.get(
+            organization_id=self.organization.id, provider=DirectoryProvider.AZURE_AD
+        )
+        self.assertEqual(directory_sync.tenant_id, "tenant")
+        delay.assert_called_once_with(str(directory_sync.id))
+
+    def test_okta_sync_only_imports_changed_users(self):
+        first_page = [
+            okta_user("1", "ada@example.com", "Ada"),
+            okta_user("2", "grace@example.com", "Grace"),
+        ]
+        second_page = [okta_user("3", "not-an-email", "Bad", updated="2024-01-02")]
+        pages = {
+            "/api/v1/users": {
+                None: (
+                    first_page,
+                    {"Link": '<{base}/api/v1/users?after=2>; rel="next"'},
+                ),
+                "2": (second_page, {}),
+            }
+        }
+        directory_sync = DirectorySync.objects.create(
+            organization=self.organization, provider=DirectoryProvider.OKTA
+        )
+
+        with DirectoryServer(pages) as server, override_settings(
+            OKTA_DOMAIN=server.base_url
+        ):
+            self.sync(directory_sync)
+
+            self.assertEqual(directory_sync.status, ImportJobStatus.COMPLETED)
+            self.assertEqual(directory_sync.cursor, "2024-01-02T00:00:00.000Z")
+            self.assertEqual(directory_sync.fetched_count, 3)
+            self.assertEqual(directory_sync.created_count, 2)
+            self.assertEqual(directory_sync.failed_count, 1)
+            self.assertEqual(directory_sync.errors[0]["external_id"], "3")
+            self.assertEqual(
+                set(
+                    Employee.objects.filter(
+                        emp_profile__organization=self.organization
+                    ).values_list("email", flat=True)
+                ),
+                {self.employee.email, "ada@example.com", "grace@example.com"},
+            )
+
+            # grace changed department, ada is unchanged and skipped
+            first_page[1] = okta_user("2", "grace@example.com", "Grace", "Sales")
+            pages["/api/v1/users"] = {None: (first_page, {})}
+            self.sync(directory_sync)
+
+            self.assertIn(
+                "lastUpdated+ge+%222024-01-02T00%3A00%3A00.000Z%22", server.requests[-1]
+            )
+
+        self.assertEqual(directory_sync.fetched_count, 2)
+        self.assertEqual(directory_sync.changed_count, 1)
+        self.assertEqual(directory_sync.created_count, 0)
+        self.assertEqual(
+            Employee.objects.get(email="grace@example.com").emp_profile.department.name,
+            "sales",
+        )
+        self.assertEqual(directory_sync.entries.count(), 2)
+
+    def test_azure_ad_sync_follows_the_delta_link(self):
+        pages = {
+            "/users/delta": {
+                None: (
+                    {
+                        "value": [
+                            {
+                                "id": "a",
+                                "mail": "alan@example.com",
+                                "displayName": "Alan Turing",
+                            },
+                            {"id": "b", "@removed": {"reason": "deleted"}},
+                        ],
+                        "@odata.nextLink": "{base}/users/delta?after=next",
+                    },
+                    {},
+                ),
+                "next": (
+                    {
+                        "value": [
+                            {
+                                "id": "c",
+                                "userPrincipalName": "joan@example.com",
+                                "givenName": "Joan",
+                                "surname": "Clarke",
+                            }
+                        ],
+                        "@odata.deltaLink": "{base}/users/delta?after=delta",
+                    },
+                    {},
+                ),
+                "delta": (
+                    {"value": [], "@odata.deltaLink": "{base}/users/delta?after=delta"},
+                    {},
+                ),
+            }
+        }
+        directory_sync = DirectorySync.objects.create(
+            organization=self.organization,
+            provider=DirectoryProvider.AZURE_AD,
+            tenant_id="tenant",
+        )
+
+        with DirectoryServer(pages) as server, override_settings(
+            GRAPH_API_URL=server.base_url
+        ), patch.object(
+            AzureADDirectory, "acquire_token", return_value="token"
+        ) as acquire_token:
+            self.sync(directory_sync)
+            self.assertEqual(
+                directory_sync.cursor, f"{server.base_url}/users/delta?after=delta"
+            )
+            self.sync(directory_sync)
+            self.assertEqual(server.requests[-1], "/users/delta?after=delta")
+
+        self.assertEqual(acquire_token.call_count, 2)
+
+        self.assertEqual(directory_sync.status, ImportJobStatus.COMPLETED)
+        alan = Employee.objects.get(email="alan@example.com").emp_profile
+        self.assertEqual((alan.first_name, alan.last_name), ("Alan", "Turing"))
+        self.assertTrue(Employee.objects.filter(email="joan@example.com").exists())
+        self.assertEqual(
+            set(DirectoryEntry.objects.values_list("external_id", flat=True)),
+            {"a", "c"},
+        )
+
+
+class TestLDAPImport(BaseTestCase):
+    def setUp(self):
+        super().setUp()
+        self.configuration = LDAPConfiguration.objects.create(
+            organization=self.organization,
+            server_address="ldap.example.com",
+            bind_dn="cn=admin,dc=example,dc=com",
+            search_base="ou=users,dc=example,dc=com",
+            page_size=2,
+        )
+        self.directory_sync = DirectorySync.objects.create(
+            organization=self.organization, provider=DirectoryProvider.LDAP
+        )
+
+    def get_directory(self, entries: list[dict], password="secret"):
+        directory = LDAPDirectory(
+            self.configuration, password, client_strategy=MOCK_SYNC
+        )
+        # the mock server keeps its entries on the Server, shared by connections
+        seed = Connection(directory.server, client_strategy=MOCK_SYNC)
+        seed.strategy.add_entry(
+            self.configuration.bind_dn, {"userPassword": "secret", "sn": "admin"}
+        )
+        for entry in entries:
+            seed.strategy.add_entry(
+                f"cn={entry['givenName']},{self.configuration.search_base}",
+                {"objectClass": ["top", "person", "user"], **entry},
+            )
+        return directory
+
+    def sync(self, directory):
+        with patch.object(expire_user_tokens, "apply_async"), patch.object(
+            drain_email_outbox, "delay"
+        ):
+            DirectorySyncManager(self.directory_sync, directory).handle()
+        self.directory_sync.refresh_from_db()
+
+    def test_entries_are_imported_in_pages(self):
+        entries = [
+            {"mail": f"user{i}@example.com", "givenName": f"User{i}", "sn": "Ldap"}
+            for i in range(5)
+        ]
+        entries[0]["department"] = "Finance"
+        directory = self.get_directory(entries)
+
+        pages = list(directory.pages(None))
+        self.assertEqual([len(records) for records, _ in pages], [2, 2, 1])
+
+        self.sync(directory)
+
+        self.assertEqual(self.directory_sync.status, ImportJobStatus.COMPLETED)
+        self.assertEqual(self.directory_sync.created_count, 5)
+        profile = Employee.objects.get(email="user0@example.com").emp_profile
+        self.assertEqual(profile.organization_id, self.organization.id)
+        self.assertEqual(profile.department.name, "finance")
+        self.assertEqual((profile.first_name, profile.last_name), ("User0", "Ldap"))
+
+        self.sync(directory)
+        self.assertEqual(self.directory_sync.fetched_count, 5)
+        self.assertEqual(self.directory_sync.changed_count, 0)
+
+    def test_failed_bind_fails_the_sync(self):
+        directory = self.get_directory([], password="wrong")
+
+        with self.assertRaises(LDAPException):
+            self.sync(directory)
+
+        self.directory_sync.refresh_from_db()
+        self.assertEqual(self.directory_sync.status, ImportJobStatus.FAILED)
+
+    def test_import_requires_a_password(self):
+        self.client.force_authenticate(self.organization)
+        with patch.object(
+            sync_directory_task, "delay"
+        ) as delay, self.captureOnCommitCallbacks(execute=True):
+            self.assert_bad(self.client.post(IMPORT_AD_USERS, {}))
+            response = self.client.post(IMPORT_AD_USERS, {"password": "secret"})
+
+        self.assertCreated(response)
+        delay.assert_called_once_with(str(self.directory_sync.id))
+        self.assertNotIn("password", response.data["data"])
+        self.assertNotIn(
+            b"secret", cache.get(DirectorySyncCredential.key(self.directory_sync.id))[1]
+        )
+        self.assertEqual(DirectorySyncCredential.pop(self.directory_sync.id), "secret")
+        self.assertIsNone(DirectorySyncCredential.pop(self.directory_sync.id))
+
+    def test_sync_without_a_stored_password_fails(self):
+        with patch.object(expire_user_tokens, "apply_async"), patch.object(
+            drain_email_outbox, "delay"
+        ), self.assertRaises(ValueError):
+            sync_directory_task(str(self.directory_sync.id))
+
+        self.directory_sync.refresh_from_db()
+        self.assertEqual(self.directory_sync.status, ImportJobStatus.FAILED)
+        self.assertIn("expired", self.directory_sync.errors[0]["message"])
+
+    def test_configuration_is_set_per_organization(self):
+        self.configuration.delete()
+        self.client.force_authenticate(self.organization)
+        self.assert_bad(self.client.post(IMPORT_AD_USERS, {"password": "secret"}))
+
+        response = self.client.patch(
+            LDAP_CONFIGURATION,
+            {
+                "server_address": "ad.example.com",
+                "bind_dn": "cn=import,dc=example,dc=com",
+                "search_base": "dc=example,dc=com",
+            },
+        )
+
+        self.assert_ok(response)
+        configuration = LDAPConfiguration.objects.get(organization=self.organization)
+        self.assertEqual(configuration.server_address, "ad.example.com")
+        self.assertEqual(configuration.page_size, 500)
+        self.assert_ok(self.client.get(LDAP_CONFIGURATION))
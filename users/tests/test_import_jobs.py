@@ -0,0 +1,125 @@
+import shutil
+import tempfile
+from unittest.mock import patch
+
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import override_settings
+
+from abstract.base_test import BaseTestCase
+from abstract.models import OutboundEmail
+from abstract.tasks import drain_email_outbox, expire_user_tokens
+from users.enums import ImportJobStatus
+from users.factory import OrganizationFactory
+from users.models import Employee, ImportJob
+from users.tasks import process_import_job
+
+USER_FILE_IMPORT = "/api/users/user-file-import/"
+get_import_job_path = lambda id: f"{USER_FILE_IMPORT}{id}/"
+
+MEDIA_ROOT = tempfile.mkdtemp()
+
+
+@override_settings(MEDIA_ROOT=MEDIA_ROOT, IMPORT_JOB_CHUNK_SIZE=2)
+class TestImportJobs(BaseTestCase):
+    @classmethod
+    def tearDownClass(cls):
+        shutil.rmtree(MEDIA_ROOT, ignore_errors=True)
+        super().tearDownClass()
+
+    def upload(self, content: str, name="employees.csv"):
+        self.client.force_authenticate(self.organization)
+        with patch.object(
+            process_import_job, "delay"
+        ) as delay, self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(
+                USER_FILE_IMPORT,
+                {"file": SimpleUploadedFile(name, content.encode())},
+                format="multipart",
+            )
+        return response, delay
+
+    def test_upload_returns_a_pending_job(self):
+        response, delay = self.upload(
+            "First Name,Last Name,Email\nAda,Lovelace,ada@example.com\n"
+        )
+
+        self.assertCreated(response)
+        import_job = ImportJob.objects.get(id=response.data["data"]["id"])
+        self.assertEqual(import_job.status, ImportJobStatus.PENDING)
+        self.assertEqual(import_job.organization_id, self.organization.id)
+        delay.assert_called_once_with(str(import_job.id))
+        self.assertFalse(Employee.objects.filter(email="ada@example.com").exists())
+
+    def test_upload_rejects_other_file_types(self):
+        response, delay = self.upload("hello", name="employees.txt")
+        self.assert_bad(response)
+        delay.assert_not_called()
+
+    def test_job_is_processed_in_chunks(self):
+        response, _ = self.upload(
+            "First Name,Last Name,Email,Department\n"
+            "Ada,Lovelace,ada@example.com,Engineering\n"
+            "Grace,Hopper,grace@example.com,Engineering\n"
+            "Bad,Row,not-an-email,Sales\n"
+            f"Updated,Employee,{self.employee.email},Sales\n"
+            "Alan,Turing,alan@example.com,\n"
+        )
+        import_job_id = response.data["data"]["id"]
+
+        with patch.object(expire_user_tokens, "apply_async"), patch.object(
+            drain_email_outbox, "delay"
+        ):
+            process_import_job(import_job_id)
+
+        self.assertEqual(
+            OutboundEmail.objects.filter(
+                subject="You have been invited to join Castellum"
+            ).count(),
+            3,
+        )
+        response = self.client.get(get_import_job_path(import_job_id))
+        self.assert_ok(response)
+        self.assertEqual(response.data["status"], ImportJobStatus.COMPLETED)
+        self.assertEqual(response.data["progress"], 100)
+        self.assertEqual(response.data["total_rows"], 5)
+        self.assertEqual(response.data["processed_rows"], 5)
+        self.assertEqual(response.data["created_count"], 3)
+        self.assertEqual(response.data["updated_count"], 1)
+        self.assertEqual(response.data["failed_count"], 1)
+        self.assertEqual(
+            [(error["row"], error["column"]) for error in response.data["errors"]],
+            [(4, "email")],
+        )
+
+    def test_upload_rejects_missing_columns(self):
+        response, delay = self.upload("Name,Email\nAda,ada@example.com\n")
+
+        self.assert_bad(response)
+        self.assertEqual(
+            [error["column"] for error in response.data["file"]],
+            ["first_name", "last_name"],
+        )
+        delay.assert_not_called()
+        self.assertFalse(ImportJob.objects.exists())
+
+    def test_unreadable_file_fails_the_job(self):
+        import_job = ImportJob.objects.create(
+            organization=self.organization,
+            file=SimpleUploadedFile("employees.xlsx", b"not a workbook"),
+            file_name="employees.xlsx",
+        )
+
+        process_import_job(import_job.id)
+
+        import_job.refresh_from_db()
+        self.assertEqual(import_job.status, ImportJobStatus.FAILED)
+        self.assertEqual(import_job.errors[0]["message"], "The file could not be read")
+
+    def test_job_is_only_visible_to_its_organization(self):
+        response, _ = self.upload(
+            "First Name,Last Name,Email\nAda,Lovelace,ada@example.com\n"
+        )
+
+        self.client.force_authenticate(OrganizationFactory.create())
+        response = self.client.get(get_import_job_path(response.data["data"]["id"]))
+        self.assertEqual(response.status_code, 404)
@@ -0,0 +1,259 @@
+from datetime import date, datetime, timedelta
+from datetime import timezone as dt_timezone
+from unittest.mock import patch
+
+from django.utils import timezone
+
+from abstract.base_test import BaseTestCase
+from campaign.enums import CampaignStatus, CampaignTypes
+from campaign.models import Campaign
+from campaign.services import CampaignActivityChart
+from users.enums import ActivityType, EmployeeStatuses
+from users.models import ActivityLog, Department, Employee
+from users.services import OrganizationDashboard
+from users.tasks import refresh_organization_dashboard
+
+DASHBOARD = "/api/users/dashboard/"
+CAMPAIGN_ACTIVITY = "/api/users/dashboard/campaign-activity/"
+ACTIVITY_FEED = "/api/users/dashboard/activity-feed/"
+
+
+class TestOrganizationDashboard(BaseTestCase):
+    def test_employees_security_stats_in_one_query(self):
+        sales = Department.objects.create(name="sales", organization=self.organization)
+        for index, score in enumerate([0, 29.5, 30, 40, 69.5, 70, 100, None]):
+            Employee.objects.create_emp(
+                email=f"employee{index}@example.com",
+                organization=self.organization,
+                department=sales,
+                security_score=score,
+                status=EmployeeStatuses.ACTIVE,
+            )
+
+        with self.assertNumQueries(1):
+            stats = self.organization.employees_security_stats
+
+        self.assertEqual(
+            stats,
+            {
+                "employees_count": 9,
+                "active_employees_count": 8,
+                "inactive_employees_count": 1,
+                "departments_count": 2,
+                "risk_rating": {"high": 2, "medium": 3, "low": 2},
+            },
+        )
+
+    def test_campaign_stats_in_one_query(self):
+        now = timezone.now()
+        Campaign.objects.bulk_create(
+            [
+                Campaign(
+                    organization=self.organization,
+                    name=f"Campaign {index}",
+                    type=type,
+                    status=status,
+                    start_date=start_date,
+                )
+                for index, (type, status, start_date) in enumerate(
+                    [
+                        (CampaignTypes.PHISHING, CampaignStatus.ACTIVE, now),
+                        (CampaignTypes.PHISHING, CampaignStatus.ACTIVE, now),
+                        (CampaignTypes.GENERAL, CampaignStatus.ACTIVE, now),
+                        (
+                            CampaignTypes.GENERAL,
+                            CampaignStatus.ACTIVE,
+                            now - timedelta(days=30),
+                        ),
+                        (CampaignTypes.GENERAL, CampaignStatus.DRAFT, now),
+                        (
+                            CampaignTypes.GENERAL,
+                            CampaignStatus.DRAFT,
+                            now + timedelta(days=1),
+                        ),
+                    ]
+                )
+            ]
+        )
+
+        with self.assertNumQueries(1):
+            stats = self.organization.campaign_stats
+
+        self.assertEqual(
+            stats,
+            {
+                "phishing_campaigns": 2,
+                "learning_campaigns": 2,
+                "active_learning_campaigns": 2,
+            },
+        )
+
+    def create_campaigns(self, *campaigns):
+        Campaign.objects.bulk_create(
+            [
+                Campaign(
+                    organization=self.organization,
+                    name=f"Campaign {index}",
+                    type=type,
+                    start_date=start_date,
+                )
+                for index, (type, start_date) in enumerate(campaigns)
+            ]
+        )
+
+    def test_courses_phishing_campaign_stats_in_one_query(self):
+        now = timezone.now()
+        self.create_campaigns(
+            (CampaignTypes.PHISHING, now),
+            (CampaignTypes.GENERAL, now),
+            (CampaignTypes.GENERAL, now - timedelta(days=2)),
+            (CampaignTypes.GENERAL, now - timedelta(days=60)),
+        )
+        self.organization.org_profile
+
+        with self.assertNumQueries(1):
+            stats = self.organization.courses_phishing_campaign_stats
+
+        self.assertEqual(len(stats["last_7_days"]), 7)
+        self.assertEqual(
+            stats["last_7_days"][-1],
+            {"name": "Today", "learning_campaigns": 1, "phishing_campaigns": 1},
+        )
+        self.assertEqual(
+            sum(day["learning_campaigns"] for day in stats["last_7_days"]), 2
+        )
+        self.assertEqual(stats["last_30_days"][0]["name"], "Week 1")
+        self.assertEqual(stats["last_30_days"][-1]["name"], "This Week")
+        self.assertEqual(
+            sum(week["learning_campaigns"] for week in stats["last_30_days"][:-1]), 2
+        )
+
+    def test_campaign_activity_uses_the_organization_timezone(self):
+        self.create_campaigns(
+            (CampaignTypes.PHISHING, datetime(2024, 1, 1, 20, tzinfo=dt_timezone.utc)),
+        )
+        self.organization.org_profile.timezone = "Pacific/Auckland"
+        self.organization.org_profile.save()
+
+        buckets = CampaignActivityChart(
+            self.organization, start=date(2024, 1, 1), end=date(2024, 1, 3)
+        ).buckets()
+
+        self.assertEqual(
+            [bucket["phishing_campaigns"] for bucket in buckets], [0, 1, 0]
+        )
+
+    def test_get_campaign_activity_response(self):
+        self.create_campaigns(
+            (CampaignTypes.GENERAL, datetime(2024, 1, 10, 12, tzinfo=dt_timezone.utc)),
+            (CampaignTypes.GENERAL, datetime(2024, 3, 5, 12, tzinfo=dt_timezone.utc)),
+        )
+        self.client.force_authenticate(self.organization)
+
+        response = self.client.get(
+            CAMPAIGN_ACTIVITY,
+            {"start": "2024-01-15", "end": "2024-03-31", "resolution": "month"},
+        )
+
+        self.assert_ok(response)
+        self.assertEqual(
+            [
+                (bucket["date"], bucket["learning_campaigns"])
+                for bucket in response.data["data"]
+            ],
+            [(date(2024, 1, 1), 1), (date(2024, 2, 1), 0), (date(2024, 3, 1), 1)],
+        )
+
+        response = self.client.get(
+            CAMPAIGN_ACTIVITY, {"start": "2000-01-01", "end": "2024-01-01"}
+        )
+        self.assert_bad(response)
+
+    def get_departments_count(self):
+        response = self.client.get(DASHBOARD)
+        self.assert_ok(response)
+        return response.data["data"]["employees_security_stats"]["departments_count"]
+
+    def test_dashboard_is_served_from_the_cache(self):
+        self.client.force_authenticate(self.organization)
+        self.assertEqual(self.get_departments_count(), 1)
+
+        with self.assertNumQueries(0):
+            self.assertEqual(self.get_departments_count(), 1)
+
+        # a write bumps the version, the stale dashboard is served while it refreshes
+        Department.objects.create(name="sales", organization=self.organization)
+        with patch.object(refresh_organization_dashboard, "delay") as delay:
+            self.assertEqual(self.get_departments_count(), 1)
+            self.assertEqual(self.get_departments_count(), 1)
+        delay.assert_called_once_with(str(self.organization.id))
+
+        refresh_organization_dashboard(str(self.organization.id))
+        with patch.object(refresh_organization_dashboard, "delay") as delay:
+            self.assertEqual(self.get_departments_count(), 2)
+        delay.assert_not_called()
+
+    def test_warmed_dashboard_needs_no_queries(self):
+        OrganizationDashboard.warm()
+        self.client.force_authenticate(self.organization)
+
+        with self.assertNumQueries(0):
+            self.assertEqual(self.get_departments_count(), 1)
+
+
+class TestActivityFeed(BaseTestCase):
+    def test_activity_is_logged_with_one_insert(self):
+        self.employee.emp_profile
+
+        with self.assertNumQueries(1):
+            self.employee.perform_activity(ActivityType.COURSE_STARTED)
+
+        activity_log = ActivityLog.objects.get(employee=self.employee)
+        self.assertEqual(activity_log.organization_id, self.organization.id)
+        self.assertEqual(
+            activity_log.description,
+            f"{self.employee.emp_profile.first_name} started a course",
+        )
+
+    def log_activities(self, count):
+        employee = Employee.objects.select_related("emp_profile").get(
+            id=self.employee.id
+        )
+        with self.assertNumQueries(1):
+            activity_logs = ActivityLog.objects.log_many(
+                [(employee, ActivityType.COURSE_COMPLETED)] * count
+            )
+        # distinct timestamps, oldest first
+        now = timezone.now()
+        for index, activity_log in enumerate(activity_logs):
+            ActivityLog.objects.filter(id=activity_log.id).update(
+                created_at=now - timedelta(minutes=count - index)
+            )
+        return activity_logs
+
+    def test_feed_is_paginated_newest_first(self):
+        activity_logs = self.log_activities(15)
+        self.client.force_authenticate(self.organization)
+
+        response = self.client.get(ACTIVITY_FEED, {"page_size": 10})
+        self.assert_ok(response)
+        self.assertEqual(len(response.data["results"]), 10)
+        self.assertIsNone(response.data["previous"])
+
+        response = self.client.get(response.data["next"])
+        self.assert_ok(response)
+        self.assertEqual(len(response.data["results"]), 5)
+        self.assertIsNone(response.data["next"])
+        self.assertEqual(
+            datetime.fromisoformat(response.data["results"][-1]["created_at"]),
+            ActivityLog.objects.get(id=activity_logs[0].id).created_at,
+        )
+
+    def test_dashboard_embeds_the_latest_activity(self):
+        self.log_activities(15)
+        self.client.force_authenticate(self.organization)
+
+        response = self.client.get(DASHBOARD)
+
+        self.assert_ok(response)
+        self.assertEqual(len(response.data["data"]["activity_logs"]), 10)
@@ -0,0 +1,219 @@
+from datetime import date, datetime, timedelta
+from datetime import timezone as dt_timezone
+from unittest.mock import call, patch
+
+from django.test import override_settings
+
+from abstract.base_test import BaseTestCase
+from courses.models import Course
+from users.factory import EmployeeFactory
+from users.models import (
+    Department,
+    DepartmentTimeSeriesSecurityScore,
+    Employee,
+    Organization,
+    TimeSeriesRollup,
+    UserCourse,
+    UserTimeSeriesCompletedCourses,
+    UserTimeSeriesSecurityScore,
+)
+from users.services import TimeSeries, TimeSeriesSnapshot
+from users.tasks import (
+    store_organization_time_series,
+    store_security_scores_and_courses_completed,
+)
+
+TIME_SERIES = "/api/users/dashboard/time-series/"
+
+
+class TestTimeSeriesSnapshot(BaseTestCase):
+    def setUp(self):
+        super().setUp()
+        self.employee.emp_profile.security_score = 80
+        self.employee.emp_profile.save()
+        self.organization.org_profile.security_score = 60
+        self.organization.org_profile.save()
+        for index, score in enumerate([10, 40, None, 90]):
+            Employee.objects.create_emp(
+                email=f"employee{index}@example.com",
+                organization=self.organization,
+                department=self.department,
+                security_score=score,
+            )
+        self.department.security_score = 50
+        self.department.save()
+        Department.objects.create(name="sales", organization=self.organization)
+        for index, course in enumerate(Course.objects.all()[:3]):
+            UserCourse.objects.create(
+                user=self.employee, course=course, is_completed=index < 2
+            )
+        # another organization is left out of this snapshot
+        EmployeeFactory.create()
+
+    def test_snapshot_is_stored_in_chunks(self):
+        with patch.object(TimeSeriesSnapshot, "chunk_size", 2):
+            stored = TimeSeriesSnapshot(self.organization.id).handle()
+
+        self.assertEqual(
+            stored, {"security_scores": 5, "completed_courses": 6, "departments": 1}
+        )
+        self.assertEqual(
+            sorted(
+                UserTimeSeriesSecurityScore.objects.values_list(
+                    "security_score", flat=True
+                )
+            ),
+            [10, 40, 60, 80, 90],
+        )
+        self.assertEqual(
+            UserTimeSeriesCompletedCourses.objects.get(
+                user=self.employee
+            ).courses_completed,
+            2,
+        )
+        self.assertEqual(
+            UserTimeSeriesCompletedCourses.objects.get(
+                user_id=self.organization.id
+            ).courses_completed,
+            2,
+        )
+        self.assertEqual(
+            DepartmentTimeSeriesSecurityScore.objects.get().department_id,
+            self.department.id,
+        )
+
+    def test_nightly_task_runs_one_task_per_organization(self):
+        with patch.object(store_organization_time_series, "delay") as delay:
+            store_security_scores_and_courses_completed()
+
+        self.assertCountEqual(
+            delay.call_args_list,
+            [
+                call(str(organization_id))
+                for organization_id in Organization.objects.values_list("id", flat=True)
+            ],
+        )
+
+
+class TestTimeSeries(BaseTestCase):
+    def add_points(self, model, field, values: dict, **owner):
+        """One daily point per date, created at noon"""
+        points = model.objects.bulk_create(
+            [model(**owner, **{field: value}) for value in values.values()]
+        )
+        for point, day in zip(points, values):
+            model.objects.filter(id=point.id).update(
+                created_at=datetime(
+                    day.year, day.month, day.day, 12, tzinfo=dt_timezone.utc
+                )
+            )
+
+    def setUp(self):
+        super().setUp()
+        first_weeks = [date(2024, 1, 1) + timedelta(days=day) for day in range(14)]
+        self.add_points(
+            UserTimeSeriesSecurityScore,
+            "security_score",
+            {
+                **{day: 10 if day.day < 8 else 20 for day in first_weeks},
+                date(2024, 6, 3): 50,
+            },
+            user=self.employee,
+        )
+        self.add_points(
+            UserTimeSeriesCompletedCourses,
+            "courses_completed",
+            {day: day.day for day in first_weeks},
+            user=self.employee,
+        )
+        self.scores = TimeSeries("security_score", user_id=self.employee.id)
+        self.completed_courses = TimeSeries(
+            "completed_courses", user_id=self.employee.id
+        )
+
+    def test_old_points_are_rolled_up_per_week_then_month(self):
+        rolled_up = TimeSeries.roll_up(self.organization.id, today=date(2024, 6, 30))
+
+        self.assertEqual(rolled_up, {"weeks": 4, "months": 0})
+        self.assertEqual(
+            UserTimeSeriesSecurityScore.objects.get().created_at.date(),
+            date(2024, 6, 3),
+        )
+        self.assertEqual(
+            self.scores.points(date(2024, 1, 1), date(2024, 1, 14)),
+            [
+                {"date": date(2024, 1, 1), "value": 10},
+                {"date": date(2024, 1, 8), "value": 20},
+            ],
+        )
+        self.assertEqual(
+            self.completed_courses.points(date(2024, 1, 1), date(2024, 1, 14)),
+            [
+                {"date": date(2024, 1, 1), "value": 7},
+                {"date": date(2024, 1, 8), "value": 14},
+            ],
+        )
+
+        with override_settings(TIME_SERIES_WEEKLY_RETENTION_DAYS=30):
+            rolled_up = TimeSeries.roll_up(
+                self.organization.id, today=date(2024, 6, 30)
+            )
+
+        self.assertEqual(rolled_up, {"weeks": 0, "months": 2})
+        self.assertEqual(
+            TimeSeriesRollup.objects.get(series="security_score").points, 14
+        )
+        self.assertEqual(
+            self.scores.points(date(2024, 1, 1), date(2024, 6, 30), "month"),
+            [
+                {"date": date(2024, 1, 1), "value": 15},
+                {"date": date(2024, 6, 1), "value": 50},
+            ],
+        )
+        # the January rollup overlaps a range that starts within the month
+        self.assertEqual(
+            self.scores.points(date(2024, 1, 10), date(2024, 1, 20), "week"),
+            [{"date": date(2024, 1, 8), "value": 15}],
+        )
+
+    def test_points_are_bucketed_at_the_resolution(self):
+        self.assertEqual(
+            self.scores.points(date(2024, 1, 3), date(2024, 1, 14), "week"),
+            [
+                {"date": date(2024, 1, 1), "value": 10},
+                {"date": date(2024, 1, 8), "value": 20},
+            ],
+        )
+        self.assertEqual(
+            len(self.scores.points(date(2024, 1, 1), date(2024, 1, 31))), 14
+        )
+        self.assertEqual(
+            TimeSeries.pick_resolution(date(2024, 1, 1), date(2025, 1, 1)), "week"
+        )
+
+    def test_get_organization_time_series(self):
+        self.add_points(
+            UserTimeSeriesSecurityScore,
+            "security_score",
+            {date(2024, 1, 1): 30, date(2024, 1, 2): 40},
+            user_id=self.organization.id,
+        )
+        self.client.force_authenticate(self.organization)
+
+        response = self.client.get(
+            TIME_SERIES,
+            {"series": "security_score", "start": "2024-01-01", "end": "2024-01-31"},
+        )
+
+        self.assert_ok(response)
+        self.assertEqual([point["value"] for point in response.data["data"]], [30, 40])
+        response = self.client.get(
+            TIME_SERIES,
+            {
+                "series": "completed_courses",
+                "start": "2024-01-01",
+                "end": "2024-01-31",
+                "department": str(self.department.id),
+            },
+        )
+        self.assert_bad(response)
@@ -0,0 +1,139 @@
+from io import BytesIO
+
+import openpyxl
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import SimpleTestCase
+
+from users.utils import UserFileImport
+
+
+class TestUserFileImport(SimpleTestCase):
+    def csv_file(self, content: str):
+        return SimpleUploadedFile("employees.csv", content.encode())
+
+    def xlsx_file(self, rows: list):
+        workbook = openpyxl.Workbook()
+        for row in rows:
+            workbook.active.append(row)
+        content = BytesIO()
+        workbook.save(content)
+        return SimpleUploadedFile("employees.xlsx", content.getvalue())
+
+    def test_csv_is_read_in_batches(self):
+        user_file = UserFileImport(
+            self.csv_file(
+                "First Name,Last Name,Email,Department,Phone\n"
+                + "".join(
+                    f"Ada,Lovelace,ada{index}@example.com,,123\n" for index in range(5)
+                )
+            )
+        )
+
+        self.assertTrue(user_file.is_valid())
+        batches = list(user_file.batches(2))
+
+        self.assertEqual([len(batch) for batch in batches], [2, 2, 1])
+        self.assertEqual(
+            sorted(batches[0][0]),
+            ["department", "email", "first_name", "last_name"],
+        )
+        self.assertEqual(batches[2][0]["email"], "ada4@example.com")
+        self.assertEqual(user_file.count_rows(), 5)
+
+    def test_xlsx_is_read_in_batches(self):
+        user_file = UserFileImport(
+            self.xlsx_file(
+                [
+                    ["Email", "First Name", "Last Name"],
+                    ["ada@example.com", "Ada", "Lovelace"],
+                    ["grace@example.com", "Grace", None],
+                    [None, None, None],
+                ]
+            )
+        )
+
+        self.assertTrue(user_file.is_valid())
+        self.assertEqual(
+            list(user_file.batches(10)),
+            [
+                [
+                    {
+                        "first_name": "Ada",
+                        "last_name": "Lovelace",
+                        "email": "ada@example.com",
+                    },
+                    {
+                        "first_name": "Grace",
+                        "last_name": None,
+                        "email": "grace@example.com",
+                    },
+                ]
+            ],
+        )
+
+    def test_header_is_validated(self):
+        user_file = UserFileImport(self.csv_file("Name,Email\nAda,ada@example.com\n"))
+
+        self.assertFalse(user_file.is_valid())
+        self.assertEqual(
+            [error["column"] for error in user_file.errors],
+            ["first_name", "last_name"],
+        )
+
+    def test_empty_file_is_invalid(self):
+        user_file = UserFileImport(self.csv_file(""))
+
+        self.assertFalse(user_file.is_valid())
+        self.assertEqual(user_file.errors[0]["row"], 1)
+
+    def test_blank_rows_are_skipped_and_not_counted(self):
+        user_file = UserFileImport(
+            self.csv_file(
+                "First Name,Last Name,Email,Department\n"
+                "Ada,Lovelace,ada@example.com,\n"
+                ",,,\n"
+                "\n"
+                "Grace,,grace@example.com,\n"
+            )
+        )
+
+        self.assertTrue(user_file.is_valid())
+        self.assertEqual(user_file.count_rows(), 2)
+        self.assertEqual(
+            list(user_file.iter_numbered_records()),
+            [
+                (
+                    2,
+                    {
+                        "first_name": "Ada",
+                        "last_name": "Lovelace",
+                        "email": "ada@example.com",
+                        "department": None,
+                    },
+                ),
+                (
+                    5,
+                    {
+                        "first_name": "Grace",
+                        "last_name": None,
+                        "email": "grace@example.com",
+                        "department": None,
+                    },
+                ),
+            ],
+        )
+
+    def test_trailing_blank_xlsx_rows_are_not_counted(self):
+        user_file = UserFileImport(
+            self.xlsx_file(
+                [
+                    ["Email", "First Name", "Last Name"],
+                    ["ada@example.com", "Ada", "Lovelace"],
+                    [None, None, None],
+                    [None, " ", None],
+                ]
+            )
+        )
+
+        self.assertTrue(user_file.is_valid())
+        self.assertEqual(user_file.count_rows(), 1)
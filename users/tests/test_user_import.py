@@ -0,0 +1,91 @@
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from abstract.base_test import BaseTestCase
+from users.factory import EmployeeFactory
+from users.models import Department, Employee
+from users.services import UserImport
+
+
+class TestUserImport(BaseTestCase):
+    def record(self, email, department="Engineering", **kwargs) -> dict:
+        return {
+            "email": email,
+            "first_name": "Ada",
+            "last_name": "Lovelace",
+            "department": department,
+            **kwargs,
+        }
+
+    def test_creates_and_updates_employees(self):
+        user_import = UserImport(
+            records=[
+                self.record("new1@example.com"),
+                self.record("new2@example.com", department=float("nan")),
+                self.record(
+                    self.employee.email, department="Sales", first_name="Grace"
+                ),
+            ],
+            organization=self.organization,
+        )
+        user_import.create_records()
+
+        self.assertEqual(user_import.errors, [])
+        self.assertCountEqual(
+            [employee.email for employee in user_import.new_employees],
+            ["new1@example.com", "new2@example.com"],
+        )
+        new1 = Employee.objects.get(email="new1@example.com")
+        self.assertEqual(new1.emp_profile.organization, self.organization)
+        self.assertEqual(new1.emp_profile.department.name, "engineering")
+        self.assertFalse(new1.has_usable_password())
+        self.assertIsNone(
+            Employee.objects.get(email="new2@example.com").emp_profile.department
+        )
+
+        self.employee.emp_profile.refresh_from_db()
+        self.assertEqual(self.employee.emp_profile.first_name, "Grace")
+        self.assertEqual(self.employee.emp_profile.department.name, "sales")
+        self.assertEqual(
+            Department.objects.filter(
+                organization=self.organization, name="engineering"
+            ).count(),
+            1,
+        )
+
+    def test_reports_rows_that_cannot_be_imported(self):
+        other_employee = EmployeeFactory.create()
+        user_import = UserImport(
+            records=[
+                self.record("valid@example.com"),
+                self.record("not-an-email"),
+                self.record(float("nan")),
+                self.record("valid@example.com"),
+                self.record(other_employee.email),
+                self.record(self.organization.email),
+            ],
+            organization=self.organization,
+        )
+        user_import.create_records()
+
+        self.assertEqual(len(user_import.new_employees), 1)
+        self.assertEqual(
+            [(error["row"], error["column"]) for error in user_import.errors],
+            [(3, "email"), (4, "email"), (5, "email"), (6, "email"), (7, "email")],
+        )
+        other_employee.emp_profile.refresh_from_db()
+        self.assertNotEqual(other_employee.emp_profile.organization, self.organization)
+
+    def test_query_count_does_not_grow_with_rows(self):
+        def import_queries(prefix, count):
+            records = [
+                self.record(f"{prefix}{index}@example.com", department=f"team {index}")
+                for index in range(count)
+            ]
+            with CaptureQueriesContext(connection) as queries:
+                UserImport(
+                    records=records, organization=self.organization
+                ).create_records()
+            return len(queries)
+
+        self.assertEqual(import_queries("small", 3), import_queries("large", 60))
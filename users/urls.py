@@ -19,10 +19,17 @@ from .views import (
     EmployeeUpdateView,
     EnrollmentAndNotificationsSettingsView,
     ForgotPasswordTriggerView,
+    ImportADUsersView,
+    ImportJobDetailView,
     ImportOktaUsers,
+    LDAPConfigurationView,
     LoginView,
+    OktaSyncStatusView,
+    OrganizationActivityFeedView,
+    OrganizationCampaignActivityView,
     OrganizationDashboardView,
     OrganizationProfileView,
+    OrganizationTimeSeriesView,
     PhishingPermissionCheckView,
     PhishingReportEmailView,
     ResendActivationLinkOrgView,
@@ -56,6 +63,11 @@ urlpatterns = [
     ),
     path("login/", LoginView.as_view(), name="login"),
     path("user-file-import/", UserFileImportView.as_view(), name="user-file-import"),
+    path(
+        "user-file-import/<uuid:id>/",
+        ImportJobDetailView.as_view(),
+        name="user-file-import-job",
+    ),
     path(
         "forgot-password/", ForgotPasswordTriggerView.as_view(), name="forgot-password"
     ),
@@ -81,6 +93,17 @@ urlpatterns = [
         "azure-ad-callback/", AzureADCallbackAPIView.as_view(), name="azure_ad_callback"
     ),
     path("import-okta-users/", ImportOktaUsers.as_view(), name="import-okta-users"),
+    path(
+        "import-okta-users/status/",
+        OktaSyncStatusView.as_view(),
+        name="okta-sync-status",
+    ),
+    path(
+        "ldap-configuration/",
+        LDAPConfigurationView.as_view(),
+        name="ldap-configuration",
+    ),
+    path("import-ad-users/", ImportADUsersView.as_view(), name="import-ad-users"),
     path("departments/", DepartmentView.as_view(), name="departments"),
     path(
         "departments/delete/",
@@ -148,4 +171,19 @@ urlpatterns = [
     path(
         "dashboard/", OrganizationDashboardView.as_view(), name="organization-dashboard"
     ),
+    path(
+        "dashboard/campaign-activity/",
+        OrganizationCampaignActivityView.as_view(),
+        name="organization-campaign-activity",
+    ),
+    path(
+        "dashboard/activity-feed/",
+        OrganizationActivityFeedView.as_view(),
+        name="organization-activity-feed",
+    ),
+    path(
+        "dashboard/time-series/",
+        OrganizationTimeSeriesView.as_view(),
+        name="organization-time-series",
+    ),
 ]
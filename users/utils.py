@@ -1,9 +1,16 @@
+import math
 from abc import ABC
+from itertools import islice
 
+import openpyxl
 import pandas as pd
 
 
 class UserFileImport(ABC):
+    """Read an employee file row by row so large files never sit in memory at once"""
+
+    file_type = None
+
     def __init__(self, file, valid_columns=None):
         if valid_columns is None:
             valid_columns = ["first_name", "last_name", "email"]
@@ -11,46 +18,71 @@ class UserFileImport(ABC):
         self.file = file
         self.valid_columns = valid_columns
         self.columns = None
-        self.df = None
         self.missing_columns = []
         self.errors = []
 
-    def generate_df(self):
-        file = self.file
-        if file.name.endswith(".csv"):
-            df: pd.DataFrame = pd.read_csv(file)
-            self.df = df
-        elif file.name.endswith(".xlsx"):
-            df: pd.DataFrame = pd.read_excel(file)
-            self.df = df
-
-    def handle_file(self):
-        valid_columns = self.valid_columns
-        df = self.df
-        original_columns: list[str] = df.columns
-
-        columns: list = [
-            column.strip().replace(" ", "_").lower() for column in original_columns
-        ]
-
-        df.rename(
-            columns={
-                original_columns[i]: columns[i] for i in range(len(original_columns))
-            },
-            inplace=True,
-        )
-
-        columns = df.columns
-
-        missing_columns = [column for column in valid_columns if not column in columns]
+    @staticmethod
+    def normalize_column(column) -> str:
+        return str(column).strip().replace(" ", "_").lower()
+
+    def get_file_type(self) -> str | None:
+        if self.file_type:
+            return self.file_type
+        if self.file.name.endswith(".csv"):
+            return "csv"
+        elif self.file.name.endswith(".xlsx"):
+            return "xlsx"
+        return None
+
+    def iter_rows(self, chunk_size=1000):
+        """Yield the header then every row as a list of values"""
+        self.file.seek(0)
+        match self.get_file_type():
+            case "csv":
+                # blank lines are kept so the row numbers match the file's lines
+                chunks = pd.read_csv(
+                    self.file,
+                    header=None,
+                    dtype=str,
+                    chunksize=chunk_size,
+                    skip_blank_lines=False,
+                )
+                for chunk in chunks:
+                    yield from chunk.itertuples(index=False, name=None)
+            case "xlsx":
+                workbook = openpyxl.load_workbook(
+                    self.file, read_only=True, data_only=True
+                )
+                try:
+                    yield from workbook.active.iter_rows(values_only=True)
+                finally:
+                    workbook.close()
 
+    def handle_header(self, header):
+        columns = [self.normalize_column(column) for column in header]
         self.columns = columns
-        self.df = df
-        self.missing_columns = missing_columns
+        self.missing_columns = [
+            column for column in self.valid_columns if column not in columns
+        ]
 
     def is_valid(self):
-        self.generate_df()
-        self.handle_file()
+        """Check the header row only, the rows are validated while importing"""
+        rows = self.iter_rows(chunk_size=1)
+        try:
+            header = next(rows, None)
+        except Exception:
+            self.errors = [
+                {"row": 1, "column": None, "message": "The file could not be read"}
+            ]
+            return False
+        finally:
+            rows.close()
+        if header is None:
+            self.errors = [
+                {"row": 1, "column": None, "message": "The file has no header row"}
+            ]
+            return False
+        self.handle_header(header)
         missing_columns = self.missing_columns
 
         if missing_columns:
@@ -67,10 +99,57 @@ class UserFileImport(ABC):
 
         return True
 
+    @staticmethod
+    def clean_value(value):
+        # pandas gives NaN for the empty cells of a csv
+        if isinstance(value, float) and math.isnan(value):
+            return None
+        if isinstance(value, str) and not value.strip():
+            return None
+        return value
+
+    def iter_numbered_records(self):
+        """Yield the file row number and record of every row that is not blank,
+        the header is row 1
+        """
+        columns = self.valid_columns + self.variable_columns
+        positions = {
+            column: self.columns.index(column)
+            for column in columns
+            if column in self.columns
+        }
+        for row_number, row in enumerate(islice(self.iter_rows(), 1, None), start=2):
+            row = [self.clean_value(value) for value in row]
+            if all(value is None for value in row):
+                # e.g. trailing rows of a spreadsheet or csv lines of commas
+                continue
+            yield row_number, {
+                column: row[position] if position < len(row) else None
+                for column, position in positions.items()
+            }
+
+    def iter_records(self):
+        """Yield every row as a record of the known columns"""
+        for _, record in self.iter_numbered_records():
+            yield record
+
+    def numbered_batches(self, batch_size: int):
+        """Yield (row number, record) pairs in lists of at most batch_size"""
+        records = self.iter_numbered_records()
+        while batch := list(islice(records, batch_size)):
+            yield batch
+
+    def batches(self, batch_size: int):
+        """Yield the records in lists of at most batch_size"""
+        for batch in self.numbered_batches(batch_size):
+            yield [record for _, record in batch]
+
+    def count_rows(self) -> int:
+        """Rows that will be imported, blank rows are skipped like iter_records does"""
+        return sum(1 for _ in self.iter_numbered_records())
+
     def get_records(self):
-        df = self.df
-        records = df.to_dict("records")
-        return records
+        return list(self.iter_records())
 
     @property
     def records(self):
@@ -78,16 +157,8 @@ class UserFileImport(ABC):
 
 
 class UserCSVImport(UserFileImport):
-    def generate_df(self):
-        file = self.file
-        df: pd.DataFrame = pd.read_csv(file)
-
-        self.df = df
+    file_type = "csv"
 
 
 class UserXLSXImport(UserFileImport):
-    def generate_df(self):
-        file = self.file
-        df: pd.DataFrame = pd.read_excel(file)
-
-        self.df = df
+    file_type = "xlsx"
@@ -4,17 +4,15 @@ import requests
 from django.conf import settings
 from django.contrib.sessions.models import Session
 from django.db import models
-from django.http import Http404, JsonResponse
+from django.http import Http404
 from django.shortcuts import get_object_or_404, redirect
 from django.urls import reverse
-from django.utils.decorators import method_decorator
-from django.views.decorators.csrf import csrf_exempt
 from dotenv import load_dotenv
 from drf_spectacular.utils import OpenApiParameter, extend_schema, extend_schema_view
-from ldap3 import ALL, SUBTREE, Connection, Server
 from msal import ConfidentialClientApplication
 from rest_framework import generics, status
 from rest_framework.exceptions import AuthenticationFailed
+from rest_framework.pagination import CursorPagination
 from rest_framework.parsers import FormParser, MultiPartParser
 from rest_framework.permissions import AllowAny, IsAuthenticated
 from rest_framework.response import Response
@@ -30,7 +28,9 @@ from abstract.views import (
     SimplePostGenericView,
     SimpleUpdateGenericView,
 )
+from Castellum.enums import Roles
 from Castellum.permissions import IsOrganization
+from users.enums import DirectoryProvider
 from users.models import AuthorizedDomain, Employee, Organization, User
 from users.models.organization import DeliverabilityTest
 
@@ -38,6 +38,7 @@ from .arch.managers import (
     AddEmployeeManager,
     AllowlistingManager,
     AuthorizedDomainManager,
+    CampaignActivityManager,
     ChangePasswordManager,
     DeactivateDepartmentsManager,
     DeactivateEmployeesManager,
@@ -45,7 +46,10 @@ from .arch.managers import (
     EmployeeUpdateManager,
     EnrollmentAndNotificationsSettingsManager,
     ForgotPasswordTriggerManager,
+    LDAPConfigurationManager,
+    LDAPImportManager,
     OrganizationDashboardManager,
+    OrganizationTimeSeriesManager,
     PhishingPermissionCheckManager,
     PhishingReportEmailManager,
     ResendActivationLinkOrgManager,
@@ -56,13 +60,24 @@ from .arch.managers import (
     UserFileImportManager,
     VerifyRegisterTokenOrgManager,
 )
-from .models import Department, Employee, EmployeeProfile
+from .models import (
+    ActivityLog,
+    Department,
+    DirectorySync,
+    Employee,
+    ImportJob,
+    LDAPConfiguration,
+)
 from .serializers import (
+    ActivityLogSerializer,
     DeliverabilityTestSerializer,
+    DirectorySyncSerializer,
     EmployeeSerializer,
+    ImportJobSerializer,
     OrganizationSerializer,
     UserLoginSerializer,
 )
+from .services import DirectorySyncManager, OktaDirectory, OrganizationDashboard
 
 load_dotenv()
 
@@ -150,6 +165,21 @@ class UserFileImportView(SimpleCreateGenericView):
     parser_classes = [MultiPartParser, FormParser]
 
 
+@extend_schema_view(
+    get=extend_schema(
+        summary="User File Import Progress",
+        description="Get the progress, counts and row errors of a user file import",
+    ),
+)
+class ImportJobDetailView(SimpleGetDetailGenericView):
+    serializer_class = ImportJobSerializer
+    permission_classes = [IsOrganization]
+    queryset = ImportJob.objects.all()
+
+    def get_queryset(self):
+        return self.queryset.filter(organization=self.request.user)
+
+
 @extend_schema_view(
     post=extend_schema(
         summary="Add Employee",
@@ -298,7 +328,7 @@ class DepartmentView(generics.ListCreateAPIView):
         return queryset
 
     def get_queryset(self):
-        return self.request.user.departments.all()
+        return self.request.user.departments.with_security_stats()
 
 
 @extend_schema_view(
@@ -325,7 +355,9 @@ class DetailDepartmentView(
     queryset = Department.objects.all()
 
     def get_queryset(self):
-        return self.queryset.filter(organization=self.request.user)
+        return self.queryset.filter(
+            organization=self.request.user
+        ).with_security_stats()
 
 
 @extend_schema_view(
@@ -618,6 +650,97 @@ class OrganizationDashboardView(SimpleGetDetailGenericView):
     def get_object(self):
         return self.request.user
 
+    def get(self, request, *args, **kwargs):
+        return Response(
+            OrganizationDashboard.get(self.get_object()), status=status.HTTP_200_OK
+        )
+
+
+@extend_schema_view(
+    get=extend_schema(
+        summary="Organization Campaign Activity",
+        description="Get the learning and phishing campaigns started per day, week or "
+        "month between start and end, in the organization's timezone",
+        parameters=[
+            OpenApiParameter(name="start", type=str, required=True),
+            OpenApiParameter(name="end", type=str, required=True),
+            OpenApiParameter(
+                name="resolution", type=str, enum=["day", "week", "month"]
+            ),
+            OpenApiParameter(name="timezone", type=str),
+        ],
+    ),
+)
+class OrganizationCampaignActivityView(APIView):
+    permission_classes = [IsOrganization]
+
+    def get(self, request, *args, **kwargs):
+        serializer = CampaignActivityManager(
+            data=request.query_params, context=dict(request=request)
+        )
+        if serializer.is_valid():
+            return Response(
+                serializer.to_representation(serializer.validated_data["chart"])
+            )
+        return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+
+@extend_schema_view(
+    get=extend_schema(
+        summary="Organization Time Series",
+        description="Get the security score or completed courses series of the "
+        "organization, or the security score of one of its departments, between start "
+        "and end. Without a resolution one is picked from the length of the range",
+        parameters=[
+            OpenApiParameter(
+                name="series",
+                type=str,
+                required=True,
+                enum=["security_score", "completed_courses"],
+            ),
+            OpenApiParameter(name="start", type=str, required=True),
+            OpenApiParameter(name="end", type=str, required=True),
+            OpenApiParameter(
+                name="resolution", type=str, enum=["day", "week", "month"]
+            ),
+            OpenApiParameter(name="department", type=str),
+        ],
+    ),
+)
+class OrganizationTimeSeriesView(APIView):
+    permission_classes = [IsOrganization]
+
+    def get(self, request, *args, **kwargs):
+        serializer = OrganizationTimeSeriesManager(
+            data=request.query_params, context=dict(request=request)
+        )
+        if serializer.is_valid():
+            return Response(serializer.to_representation(serializer.validated_data))
+        return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+
+class ActivityFeedPagination(CursorPagination):
+    ordering = "-created_at"
+    page_size = settings.ACTIVITY_FEED_PAGE_SIZE
+    page_size_query_param = "page_size"
+    max_page_size = settings.ACTIVITY_FEED_MAX_PAGE_SIZE
+
+
+@extend_schema_view(
+    get=extend_schema(
+        summary="Organization Activity Feed",
+        description="Get the activity logs of the authenticated organization, newest "
+        "first. Follow the next link for older entries",
+    ),
+)
+class OrganizationActivityFeedView(generics.ListAPIView):
+    serializer_class = ActivityLogSerializer
+    permission_classes = [IsOrganization]
+    pagination_class = ActivityFeedPagination
+
+    def get_queryset(self):
+        return ActivityLog.objects.filter(organization_id=self.request.user.id).feed()
+
 
 @extend_schema_view(
     get=extend_schema(
@@ -633,62 +756,39 @@ class PhishingPermissionCheckView(SimpleGetDetailGenericView):
         return self.request.user
 
 
-@method_decorator(csrf_exempt, name="dispatch")
-class ImportADUsersView(APIView):
-    def post(self, request, *args, **kwargs):
-        server_address = "192.168.1.4"
-        admin_bind_dn = "ethnosng.com"
-        password = "th3nextLEVEL."
-        search_base = "dc= ethnosng, dc= com"
-
-        if not all([server_address, admin_bind_dn, password, search_base]):
-            return JsonResponse(
-                {"error": "Missing required AD server details"}, status=400
-            )
-
-        return self.import_users(server_address, admin_bind_dn, password, search_base)
-
-    def get_ldap_connection(self, server_address, admin_bind_dn, password):
-        server = Server(server_address, get_info=ALL)
-        connection = Connection(server, admin_bind_dn, password, auto_bind=True)
-        return connection
-
-    def import_users(self, server_address, admin_bind_dn, password, search_base):
-        connection = self.get_ldap_connection(server_address, admin_bind_dn, password)
-        if not connection.bind():
-            return JsonResponse({"error": "Failed to bind to AD server"}, status=400)
-
-        search_filter = "(objectClass=user)"
-        attributes = ["givenName", "sn", "mail"]
-
-        connection.search(search_base, search_filter, SUBTREE, attributes=attributes)
-
-        default_organization = "NIL"
-        default_department = "NIL"
+@extend_schema_view(
+    get=extend_schema(
+        summary="LDAP Configuration",
+        description="Get the LDAP server the organization's employees are imported from",
+    ),
+    patch=extend_schema(
+        summary="Set LDAP Configuration",
+        description="Set the LDAP server the organization's employees are imported from",
+    ),
+)
+class LDAPConfigurationView(SimpleUpdateGenericView, SimpleGetDetailGenericView):
+    permission_classes = [IsOrganization]
+    serializer_class = LDAPConfigurationManager
+    lookup_field = None
+    lookup_url_kwarg = None
 
-        for entry in connection.entries:
-            email = entry.mail.value if entry.mail else None
-            if email:
-                employee, created = Employee.objects.update_or_create(
-                    email=email,
-                    defaults={
-                        "first_name": entry.givenName.value if entry.givenName else "",
-                        "last_name": entry.sn.value if entry.sn else "",
-                        "is_active": True,
-                    },
-                )
+    def get_object(self):
+        configuration = LDAPConfiguration.objects.filter(
+            organization_id=self.request.user.id
+        ).first()
+        return configuration or LDAPConfiguration(organization_id=self.request.user.id)
 
-                EmployeeProfile.objects.update_or_create(
-                    employee=employee,
-                    defaults={
-                        "first_name": entry.givenName.value if entry.givenName else "",
-                        "last_name": entry.sn.value if entry.sn else "",
-                        "organization": default_organization,
-                        "department": default_department,
-                    },
-                )
 
-        return Response({"status": "completed", "imported": len(connection.entries)})
+@extend_schema_view(
+    post=extend_schema(
+        summary="Import LDAP Users",
+        description="Import the users of the organization's LDAP server in the background, "
+        "the bind password is not stored",
+    ),
+)
+class ImportADUsersView(SimpleCreateGenericView):
+    permission_classes = [IsOrganization]
+    serializer_class = LDAPImportManager
 
 
 redirect_url = os.environ.get("REDIRECT_PATH")
@@ -740,109 +840,90 @@ class AzureADCallbackAPIView(APIView):
         )
         user_profile_data = user_profile_response.json()
 
-        if user_profile_data.get("jobTitle") == "Organization Admin":
-            users_response = requests.get(
-                "https://graph.microsoft.com/v1.0/users", headers=headers
+        if (
+            user_profile_data.get("jobTitle") == "Organization Admin"
+            and request.user.is_authenticated
+            and request.user.role == Roles.ORGANIZATION
+        ):
+            # the worker requests its own tenant token, the user's token is never queued
+            directory_sync = DirectorySyncManager.schedule(
+                request.user.id,
+                DirectoryProvider.AZURE_AD,
+                tenant_id=token_response.get("id_token_claims", {}).get("tid"),
             )
-            users_data = users_response.json().get("value", [])
-
-            for user in users_data:
-                first_name, last_name = user.get("displayName").split(" ", 1)
-                email = user.get("mail") or user.get("userPrincipalName")
-                department = "Nil"
-                user_data = {
-                    "first_name": first_name,
-                    "last_name": last_name,
-                    "email": email,
-                    "department": department,
+            return Response(
+                {
+                    "message": "Users import started",
+                    "data": DirectorySyncSerializer(directory_sync).data,
                 }
-
-                serializer = AddEmployeeManager(
-                    data=user_data, context={"request": request}
-                )
-                if serializer.is_valid():
-                    serializer.save()
-                else:
-                    print("Failed to add user:", serializer.errors)
-
-            return Response({"message": "Users imported successfully"})
+            )
         else:
             return Response(
                 {"message": "User authenticated successfully", "token": token_response}
             )
 
 
+@extend_schema_view(
+    get=extend_schema(
+        summary="Preview Okta Users",
+        description="List the email and names of the first page of the Okta org users",
+    ),
+    post=extend_schema(
+        summary="Sync Okta Users",
+        description="Import the Okta users added or changed since the last sync",
+    ),
+)
 class ImportOktaUsers(APIView):
     permission_classes = [IsOrganization]
 
-    def get_all_okta_users(self, url, headers):
-        users = []
-        while url:
-            response = requests.get(url, headers=headers)
-            response.raise_for_status()  # Ensure to handle HTTP errors appropriately
-            page_users = response.json()
-            users.extend(page_users)
-            links = response.links
-            url = links["next"]["url"] if "next" in links else None
-        return users
-
     def get(self, request, *args, **kwargs):
-        url = f"{settings.OKTA_DOMAIN}/api/v1/users"
-        headers = {
-            "Authorization": f"SSWS {settings.OKTA_API_TOKEN}",
-            "Content-Type": "application/json",
-            "Accept": "application/json",
-        }
+        directory = OktaDirectory()
         try:
-            users = self.get_all_okta_users(url, headers)
-            simplified_users = [
+            # a single page, the sync is what walks the whole directory
+            records, _, _ = directory.fetch(directory.first_url(None))
+            users = [
                 {
-                    "email": user["profile"]["email"],
-                    "first_name": user["profile"]["firstName"],
-                    "last_name": user["profile"]["lastName"],
+                    "email": record["email"],
+                    "first_name": record["first_name"],
+                    "last_name": record["last_name"],
                 }
-                for user in users
+                for record in records
             ]
-            # Store in session for subsequent import
-            request.session["okta_users"] = simplified_users
-            return Response(simplified_users)
         except requests.exceptions.RequestException as e:
             return Response(
                 {"error": str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR
             )
+        return Response(users)
 
     def post(self, request, *args, **kwargs):
-        users = request.session.get("okta_users", [])
-        if not users:
-            return Response(
-                {"error": "No users to import. Please preview users first."},
-                status=status.HTTP_400_BAD_REQUEST,
-            )
-
-        imported_users = []
-        errors = []
-        for user_data in users:
-            serializer = AddEmployeeManager(
-                data=user_data, context={"request": request}
-            )
-            if serializer.is_valid():
-                serializer.save()
-                imported_users.append(serializer.validated_data)
-            else:
-                errors.append(serializer.errors)
+        directory_sync = DirectorySyncManager.schedule(
+            request.user.id, DirectoryProvider.OKTA
+        )
+        return Response(
+            {
+                "message": "Okta sync started",
+                "data": DirectorySyncSerializer(directory_sync).data,
+            },
+            status=status.HTTP_202_ACCEPTED,
+        )
 
-        del request.session["okta_users"]
 
-        if errors:
-            return Response(
-                {"imported_users": imported_users, "errors": errors},
-                status=status.HTTP_400_BAD_REQUEST,
-            )
+@extend_schema_view(
+    get=extend_schema(
+        summary="Okta Users Sync Status",
+        description="Get the status and counts of the last Okta directory sync",
+    )
+)
+class OktaSyncStatusView(APIView):
+    permission_classes = [IsOrganization]
 
+    def get(self, request, *args, **kwargs):
+        directory_sync = get_object_or_404(
+            DirectorySync, organization=request.user, provider=DirectoryProvider.OKTA
+        )
         return Response(
             {
-                "message": "Users imported successfully",
-                "imported_users": imported_users,
-            },
-            status=status.HTTP_200_OK,
+                "message": "Okta sync status",
+                "data": DirectorySyncSerializer(directory_sync).data,
+            }
         )